@@ -0,0 +1,66 @@
+"""
+Benchmark: alarm evaluation for 10 000 monitored points.
+
+Every tick a share of the points receives a new value; the AlarmTable
+evaluates all of them (plus points waiting out a delay) in one vectorised
+pass. For comparison, the old per-widget get_warning_color logic is run once
+per changed value in a Python loop.
+
+Usage:
+    python benchmarks/bench_alarms.py [points] [changed per tick] [ticks]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from widgets.alarms import AlarmTable, NORMAL
+
+
+def legacy_warning(value, low, high):
+    """ResizableWidget.get_warning_color before the alarm engine (minus the config lookups)."""
+    if value <= low or value >= high: return 'critical'
+    elif value <= low * 1.2 or value >= high * 0.8: return 'warning'
+    return None
+
+
+def main():
+    points = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    per_tick = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    ticks = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+    rng = np.random.default_rng(1)
+
+    table = AlarmTable()
+    for i in range(points):
+        table.add(i, low=20.0, high=80.0, hysteresis=1.0, delay_on=0.2 if i % 2 else 0.0, delay_off=0.5)
+    table.evaluate(0.0)
+
+    batches = [(rng.choice(points, per_tick, replace=False), rng.uniform(0, 100, per_tick)) for _ in range(ticks)]
+
+    start = time.perf_counter()
+    changes = 0
+    for tick, (keys, values) in enumerate(batches):
+        for key, value in zip(keys.tolist(), values.tolist()):
+            table.set_value(key, value)
+        changed, _ = table.evaluate(tick * 0.1)
+        changes += changed.size
+    engine_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for keys, values in batches:
+        for value in values.tolist():
+            legacy_warning(value, 20.0, 80.0)
+    legacy_time = time.perf_counter() - start
+
+    active = int(np.count_nonzero(table.active & (table.state != NORMAL)))
+    print(f"{points} points, {per_tick} new values per tick, {ticks} ticks")
+    print(f"alarm table: {engine_time / ticks * 1000:.2f} ms per tick incl. set_value "
+          f"({changes} state changes, {active} active alarms at the end)")
+    print(f"legacy per-value check (no hysteresis/delays/ack): {legacy_time / ticks * 1000:.2f} ms per tick")
+
+
+if __name__ == "__main__":
+    main()
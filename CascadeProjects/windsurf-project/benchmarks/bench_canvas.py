@@ -0,0 +1,103 @@
+"""
+Benchmark: presentation-mode frame time, widgets painting themselves against
+the canvas backend, at 100, 500 and 1000 widgets.
+
+Half the widgets are labels, half are gauges (arc, circular, linear), in
+presentation mode on one container. Every frame gives each widget a new
+value and then paints the whole page once:
+
+  widgets  - the normal path: every widget repaints through the raster engine
+  raster   - DashboardCanvas: state collection + one batched pass (QPainter on a QWidget)
+  opengl   - the same pass on a QOpenGLWidget, if an OpenGL context can be created
+
+On a machine without a GPU, run the OpenGL case under software OpenGL:
+    LIBGL_ALWAYS_SOFTWARE=1 QT_QPA_PLATFORM=xcb xvfb-run python benchmarks/bench_canvas.py
+
+Usage:
+    python benchmarks/bench_canvas.py [frames] [widget counts...]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CELL_WIDTH, CELL_HEIGHT = 160, 120
+GAUGE_TYPES = ('gauge', 'gauge_circular', 'gauge_linear')
+
+
+def make_page(count):
+    from PyQt6.QtWidgets import QWidget
+    from widgets.label_widget import LabelWidget
+    from widgets.gauge_widget import GaugeWidget
+
+    columns = 40
+    container = QWidget()
+    container.resize(columns * CELL_WIDTH, ((count - 1) // columns + 1) * CELL_HEIGHT)
+    widgets = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(count):
+            topic = f"bench/{i}"
+            if i % 2:
+                widget = GaugeWidget(topic, None, container, {'type': GAUGE_TYPES[i // 2 % 3]})
+            else:
+                widget = LabelWidget(topic, None, container, {})
+            widget.setGeometry((i % columns) * CELL_WIDTH, (i // columns) * CELL_HEIGHT, CELL_WIDTH - 8, CELL_HEIGHT - 8)
+            widget.set_presentation_mode(True)
+            widgets.append(widget)
+    container.show()
+    return container, widgets
+
+
+def run(app, count, backend, frames):
+    """Median milliseconds per frame, or None if the backend is not available"""
+    from widgets.canvas import create_canvas, opengl_available
+    if backend == 'opengl' and not opengl_available():
+        return None
+    container, widgets = make_page(count)
+    canvas = create_canvas(backend, widgets, container)
+    if canvas is not None:
+        for widget in widgets:
+            widget.hide()
+        canvas.setGeometry(container.rect())
+        canvas.show()
+    app.processEvents()
+
+    times = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for frame in range(frames + 1):
+            for i, widget in enumerate(widgets):
+                widget.on_message_received(widget.topic, str((frame * 7 + i) % 100))
+            start = time.perf_counter()
+            if canvas is None:
+                container.repaint()
+            else:
+                canvas.refresh()
+                canvas.repaint()
+            app.processEvents()
+            if frame:  # the first frame fills caches
+                times.append(time.perf_counter() - start)
+    container.deleteLater()
+    app.processEvents()
+    times.sort()
+    return times[len(times) // 2] * 1000
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    counts = [int(arg) for arg in sys.argv[2:]] or [100, 500, 1000]
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication(sys.argv[:1])
+
+    print(f"median ms per frame ({frames} frames, every widget changes each frame)")
+    print(f"{'widgets':>8} {'widgets':>10} {'raster':>10} {'opengl':>10}")
+    for count in counts:
+        row = [run(app, count, backend, frames) for backend in ('widgets', 'raster', 'opengl')]
+        print(f"{count:>8} " + " ".join(f"{t:>10.1f}" if t is not None else f"{'n/a':>10}" for t in row))
+
+
+if __name__ == "__main__":
+    main()
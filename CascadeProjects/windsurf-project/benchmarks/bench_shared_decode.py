@@ -0,0 +1,113 @@
+"""
+Benchmark: per-message decode work for a layout with many widgets per topic.
+
+TestLayout.json has eight widgets on total_effekt and eight on total_kwh.
+Every widget receives every message on its topic. This compares the old
+per-widget work (float() and format_value for each widget) against the
+shared path in widgets.payload (one float() per topic and message, with the
+formatted string shared between widgets that have the same settings).
+Pure Python, no QApplication needed.
+
+Usage:
+    python benchmarks/bench_shared_decode.py [messages per topic] [layout.json]
+"""
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from widgets.payload import PayloadCache, format_number
+
+DEFAULT_LAYOUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "TestLayout.json")
+
+
+def legacy_format_value(config, value):
+    """ResizableWidget.format_value before the shared cache."""
+    try:
+        factor, offset = float(config.get('conversion_factor', 1.0)), float(config.get('conversion_offset', 0.0))
+        converted_value = float(value) * factor + offset
+        decimal_places = int(config.get('decimal_places', 1))
+        formatted = f"{converted_value:.{decimal_places}f}"
+        unit = config.get('unit', '')
+        if unit: formatted += f" {unit}"
+        return formatted
+    except (ValueError, TypeError):
+        unit = config.get('unit', '')
+        if unit: return f"{value} {unit}"
+        return str(value)
+
+
+def shared_format_value(config, value):
+    """ResizableWidget.format_value now."""
+    unit = config.get('unit', '')
+    try:
+        factor, offset = float(config.get('conversion_factor', 1.0)), float(config.get('conversion_offset', 0.0))
+        decimal_places = int(config.get('decimal_places', 1))
+    except (ValueError, TypeError):
+        if unit: return f"{value} {unit}"
+        return str(value)
+    return format_number(value, factor, offset, decimal_places, unit)
+
+
+def make_messages(topics, count, seed=1):
+    rng = random.Random(seed)
+    messages = []
+    for _ in range(count):
+        for topic in topics:
+            messages.append((topic, f"{rng.uniform(0, 10000):.2f}"))
+    return messages
+
+
+def run_legacy(widgets, messages):
+    for topic, message in messages:
+        for widget in widgets:
+            if widget['topic'] != topic:
+                continue
+            config = widget['config']
+            if widget['type'].startswith('gauge'):
+                value = float(message)
+                legacy_format_value(config, value)
+            elif widget['type'] == 'label':
+                legacy_format_value(config, message)
+
+
+def run_shared(widgets, messages):
+    cache = PayloadCache()
+    for topic, message in messages:
+        for widget in widgets:
+            if widget['topic'] != topic:
+                continue
+            config = widget['config']
+            if widget['type'].startswith('gauge'):
+                value = cache.number((topic, ''), message)
+                shared_format_value(config, value)
+            elif widget['type'] == 'label':
+                shared_format_value(config, message)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    layout_path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_LAYOUT
+    with open(layout_path, 'r') as f:
+        widgets = json.load(f)['widgets']
+    topics = sorted({w['topic'] for w in widgets})
+    per_topic = {t: sum(1 for w in widgets if w['topic'] == t) for t in topics}
+    messages = make_messages(topics, count)
+    print(f"{len(widgets)} widgets, widgets per topic: {per_topic}, {len(messages)} messages")
+
+    results = {}
+    for name, run in (('per-widget decode', run_legacy), ('shared decode', run_shared)):
+        format_number.cache_clear()
+        start = time.perf_counter()
+        run(widgets, messages)
+        elapsed = time.perf_counter() - start
+        results[name] = elapsed
+        print(f"{name:18s} {elapsed * 1000:8.1f} ms  ({elapsed / len(messages) * 1e6:.2f} µs per message)")
+    print(f"speedup: {results['per-widget decode'] / results['shared decode']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: place 2 000 widgets on the dashboard grid.
+
+Compares the spatial index free-slot search against the old approach of
+stepping a probe across the canvas and checking every widget geometry at
+each step. Pure Python, no QApplication needed.
+
+Usage:
+    python benchmarks/bench_spatial_index.py [count]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from widgets.spatial_index import SpatialIndex, rects_intersect
+
+CANVAS_WIDTH = 1920
+GRID = 20
+STEP = GRID * 2
+
+
+def naive_find_next_position(rects, width, height):
+    """The previous Dashboard._find_next_position algorithm, sized to the widget."""
+    x, y = 20, 20
+    while any(rects_intersect(r, (x, y, width, height)) for r in rects):
+        x += STEP
+        if x > CANVAS_WIDTH - width:
+            x = 20
+            y += STEP
+    return x, y
+
+
+def random_sizes(count, seed=1):
+    rng = random.Random(seed)
+    return [(rng.choice((120, 160, 200, 280)), rng.choice((80, 120, 160, 240))) for _ in range(count)]
+
+
+def bench_index(sizes):
+    index = SpatialIndex(cell_size=GRID * 10)
+    start = time.perf_counter()
+    for i, (w, h) in enumerate(sizes):
+        x, y = index.find_free_slot(w, h, CANVAS_WIDTH, origin=(20, 20), step=STEP)
+        index.insert(i, (x, y, w, h))
+    placed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i, (x, y, w, h) in list(index.rects.items()):
+        index.intersects((x + 10, y + 10, w, h), exclude=i)
+        index.hit_test(x + 1, y + 1)
+    queried = time.perf_counter() - start
+    return placed, queried, index
+
+
+def bench_naive(sizes):
+    rects = []
+    start = time.perf_counter()
+    for w, h in sizes:
+        x, y = naive_find_next_position(rects, w, h)
+        rects.append((x, y, w, h))
+    return time.perf_counter() - start, rects
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    sizes = random_sizes(count)
+
+    placed, queried, index = bench_index(sizes)
+    overlaps = sum(1 for key, rect in index.rects.items() if index.intersects(rect, exclude=key))
+    print(f"spatial index: placed {count} widgets in {placed * 1000:.1f} ms, "
+          f"{count} collision+hit queries in {queried * 1000:.1f} ms, overlaps={overlaps}")
+
+    naive_count = min(count, 200)
+    naive_time, _ = bench_naive(sizes[:naive_count])
+    print(f"naive scan:    placed {naive_count} widgets in {naive_time * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Startup-time budget check.
+
+1. Runs `python -X importtime -c "import main"` and reports the slowest imports
+   plus the cumulative import time of main.py.
+2. Verifies that modules kept off the startup path (paho, widget types that
+   aren't needed until a layout uses them) are not imported by `import main`.
+3. Starts the real application offscreen with a throwaway HOME pointing at a
+   startup layout, using --exit-after-startup, and measures wall-clock time
+   until the layout is loaded.
+
+Exits non-zero if any budget is exceeded, so it can run in CI:
+    python benchmarks/bench_startup.py [--import-budget MS] [--startup-budget MS]
+"""
+import argparse
+import ast
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_LAYOUT = os.path.join(PROJECT_DIR, "..", "..", "TestLayout.json")
+
+# Modules that must not be imported just by starting the app
+LAZY_MODULES = [
+    'paho',
+    'yaml',
+    'widgets.gauge_widget',
+    'widgets.label_widget',
+    'widgets.button_widget',
+    'widgets.slider_widget',
+    'widgets.toggle_widget',
+    'widgets.widget_customization',
+    'widgets.canvas',
+    'widgets.lite_tile',
+    'widgets.zoom_view',
+]
+
+
+def run_importtime():
+    """Return (main cumulative ms, [(cumulative ms, module), ...] for main's direct imports)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=PROJECT_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import main failed:\n{result.stderr[-2000:]}")
+    entries = []
+    # Nested imports are indented by two spaces per level after the last "|"
+    pattern = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\| (.*)$")
+    for line in result.stderr.splitlines():
+        match = pattern.match(line)
+        if match:
+            name = match.group(3)
+            depth = (len(name) - len(name.lstrip())) // 2
+            entries.append((int(match.group(2)) / 1000.0, name.strip(), depth))
+
+    # Children are printed before their parent: main's direct imports are the
+    # depth-1 entries between the previous top-level line and main's own line
+    main_index = next(i for i, (_, name, depth) in enumerate(entries) if name == 'main' and depth == 0)
+    first = main_index
+    while first > 0 and entries[first - 1][2] > 0:
+        first -= 1
+    children = sorted(((ms, name) for ms, name, depth in entries[first:main_index] if depth == 1), reverse=True)
+    return entries[main_index][0], children
+
+
+def check_lazy_modules():
+    code = (
+        "import sys, main\n"
+        f"print([m for m in {LAZY_MODULES!r} if m in sys.modules])"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"import main failed:\n{result.stderr[-2000:]}")
+    return ast.literal_eval(result.stdout.strip().splitlines()[-1])
+
+
+def run_startup(layout_path):
+    """Start the app offscreen and return (wall ms, ms reported by the app)."""
+    with tempfile.TemporaryDirectory() as home:
+        config_dir = os.path.join(home, ".config", "mqtt-dashboard")
+        os.makedirs(config_dir)
+        with open(os.path.join(config_dir, "settings.json"), "w") as f:
+            json.dump({'auto_connect': False, 'startup_layout': os.path.abspath(layout_path)}, f)
+        env = dict(os.environ, HOME=home, USERPROFILE=home, QT_QPA_PLATFORM="offscreen")
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "main.py", "--exit-after-startup"],
+            cwd=PROJECT_DIR, env=env, capture_output=True, text=True, timeout=60
+        )
+        wall_ms = (time.perf_counter() - start) * 1000
+    match = re.search(r"\[STARTUP\] Ready after (\d+) ms", result.stdout)
+    if not match:
+        raise RuntimeError(f"App did not report readiness:\n{result.stdout[-2000:]}\n{result.stderr[-2000:]}")
+    return wall_ms, float(match.group(1))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--import-budget', type=float, default=800.0, help="Max cumulative ms for `import main`")
+    parser.add_argument('--startup-budget', type=float, default=1500.0, help="Max ms from process start to layout loaded")
+    parser.add_argument('--layout', default=DEFAULT_LAYOUT)
+    args = parser.parse_args()
+
+    failures = []
+
+    main_ms, children = run_importtime()
+    print(f"import main: {main_ms:.1f} ms cumulative (budget {args.import_budget:.0f} ms)")
+    for ms, name in children[:10]:
+        print(f"  {ms:8.1f} ms  {name}")
+    if main_ms > args.import_budget:
+        failures.append(f"import time {main_ms:.1f} ms > {args.import_budget:.0f} ms")
+
+    eager = check_lazy_modules()
+    if eager:
+        failures.append(f"modules imported eagerly at startup: {', '.join(eager)}")
+
+    wall_ms, ready_ms = run_startup(args.layout)
+    print(f"startup: layout ready after {ready_ms:.0f} ms (process wall time {wall_ms:.0f} ms, "
+          f"budget {args.startup_budget:.0f} ms)")
+    if ready_ms > args.startup_budget:
+        failures.append(f"startup {ready_ms:.0f} ms > {args.startup_budget:.0f} ms")
+
+    if failures:
+        print("FAILED: " + "; ".join(failures))
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
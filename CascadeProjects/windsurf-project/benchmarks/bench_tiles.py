@@ -0,0 +1,112 @@
+"""
+Benchmark: memory and object count of a large dashboard, full widgets
+against lite tiles (the 'tile_mode' setting).
+
+A layout of N tiles (labels and the three gauge kinds, alternating) is
+written to a temporary file and loaded by a Dashboard in a fresh process
+per mode, so the resident memory of one mode doesn't hide in the other's.
+Reported per mode: layout load time, time to the first full paint, QObjects
+under the page (and per tile), resident memory added by the layout, and the
+dispatch cost of one message to every tile.
+
+Usage:
+    python benchmarks/bench_tiles.py [tiles]
+"""
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+MODES = ('full', 'lite')
+TYPES = ('label', 'gauge', 'label', 'gauge_circular', 'label', 'gauge_linear')
+COLUMNS = 40
+
+
+def write_layout(path, count):
+    widgets = [{
+        'type': TYPES[i % len(TYPES)], 'topic': f"bench/tile/{i}",
+        'x': (i % COLUMNS) * 160, 'y': (i // COLUMNS) * 120, 'width': 160, 'height': 120,
+        'config': {'display_name': f"Tile {i}", 'unit': "kW"},
+    } for i in range(count)]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'widgets': widgets}, f)
+
+
+def measure(mode, path):
+    """Runs in the child process; returns the numbers for one mode"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import QObject
+    app = QApplication(sys.argv[:1])
+    from diagnostics.exporter import read_rss_bytes
+    from main import ConnectionPool
+    from widgets.dashboard import Dashboard
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        connections = ConnectionPool()
+        dashboard = Dashboard(connections)
+        dashboard.tile_mode = mode
+        dashboard.resize(1600, 1000)
+        dashboard.show()
+        app.processEvents()
+        baseline_objects = len(dashboard.container.findChildren(QObject))
+        rss_before = read_rss_bytes()
+
+        start = time.perf_counter()
+        dashboard.load_layout(path)
+        load = time.perf_counter() - start
+        start = time.perf_counter()
+        dashboard.container.grab()  # paints every tile, visible or not
+        paint = time.perf_counter() - start
+        app.processEvents()
+        rss_after = read_rss_bytes()
+
+        client = connections.default
+        topics = [widget.topic for widget in dashboard.widgets]
+        start = time.perf_counter()
+        for i, topic in enumerate(topics):
+            client._on_dispatched(topic, str(i % 100))
+        dispatch = time.perf_counter() - start
+
+    tiles = len(dashboard.widgets)
+    return {
+        'tiles': tiles,
+        'load_ms': load * 1000,
+        'paint_ms': paint * 1000,
+        'objects': len(dashboard.container.findChildren(QObject)) - baseline_objects,
+        'rss_mb': (rss_after - rss_before) / 1e6 if rss_before and rss_after else None,
+        'dispatch_us': dispatch / max(1, tiles) * 1e6,
+    }
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == '--child':
+        print(json.dumps(measure(sys.argv[2], sys.argv[3])))
+        return
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tiles.json")
+        write_layout(path, count)
+        results = {}
+        for mode in MODES:
+            output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', mode, path],
+                                    capture_output=True, text=True, cwd=PROJECT_DIR, check=True).stdout
+            results[mode] = json.loads(output.strip().splitlines()[-1])
+
+    print(f"{count} tiles (labels and gauges)")
+    print(f"{'mode':>6} {'load ms':>9} {'paint ms':>9} {'QObjects':>9} {'per tile':>9} {'RSS MB':>8} {'us/msg':>7}")
+    for mode, r in results.items():
+        rss = f"{r['rss_mb']:.1f}" if r['rss_mb'] is not None else "n/a"
+        print(f"{mode:>6} {r['load_ms']:>9.0f} {r['paint_ms']:>9.0f} {r['objects']:>9} "
+              f"{r['objects'] / max(1, r['tiles']):>9.1f} {rss:>8} {r['dispatch_us']:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark: a topic table widget under a steady stream of updates.
+
+A TopicTableWidget listens to a wildcard filter with a few thousand
+matching topics and is shown in an offscreen window. Messages are fed
+through MQTTClient's listener dispatch (the path a broker message takes),
+in rounds of one flush interval; after each round the model is flushed
+and the event loop paints. Reported: dispatch cost per message and the
+flush + paint time per round, against the 100 ms flush interval.
+
+Usage:
+    python benchmarks/bench_topic_table.py [topics] [messages per second] [seconds]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FILTER = "site/+/meters/#"
+
+
+def main():
+    topics = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rate = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 5
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication(sys.argv[:1])
+
+    from main import MQTTClient
+    from widgets.topic_table_widget import TopicTableWidget, FLUSH_INTERVAL
+
+    client = MQTTClient()
+    with contextlib.redirect_stdout(io.StringIO()):
+        widget = TopicTableWidget(FILTER, client)
+    widget.resize(600, 800)
+    widget.show()
+
+    names = [f"site/{i % 50}/meters/m{i}/power" for i in range(topics)]
+    for i, topic in enumerate(names):
+        client._on_dispatched(topic, str(i))
+    widget.model.flush()
+    app.processEvents()
+
+    per_round = max(1, rate * FLUSH_INTERVAL // 1000)
+    rounds = int(seconds * 1000 / FLUSH_INTERVAL)
+    dispatch, refresh = [], []
+    n = 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(per_round):
+            client._on_dispatched(names[n % topics], str(n))
+            n += 1
+        middle = time.perf_counter()
+        widget.model.flush()
+        app.processEvents()
+        dispatch.append(middle - start)
+        refresh.append(time.perf_counter() - middle)
+
+    refresh.sort()
+    print(f"{topics} topics, {per_round} messages per {FLUSH_INTERVAL} ms round ({rate}/s), {rounds} rounds")
+    print(f"dispatch: {sum(dispatch) / n * 1e6:.1f} us/message")
+    print(f"flush + paint: p50 {refresh[len(refresh) // 2] * 1000:.1f} ms, "
+          f"max {refresh[-1] * 1000:.1f} ms per round")
+    busy = (sum(dispatch) + sum(refresh)) / (rounds * FLUSH_INTERVAL / 1000)
+    print(f"GUI thread busy {busy * 100:.0f}% of the time")
+
+
+if __name__ == "__main__":
+    main()
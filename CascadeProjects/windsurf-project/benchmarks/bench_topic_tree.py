@@ -0,0 +1,69 @@
+"""
+Benchmark: the topic explorer's tree with 50 000 distinct topics.
+
+Topics look like site/s<N>/meters/m<M>/power. Reported: the memory the
+tree takes (tracemalloc, so Python objects only), the cost of counting a
+message on a new and on a known topic, and the time to flush the changes
+to a QTreeView with a few branches expanded.
+
+Usage:
+    python benchmarks/bench_topic_tree.py [topics] [sites]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    topics = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    sites = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication, QTreeView
+    app = QApplication(sys.argv[:1])
+    from widgets.topic_explorer import TopicTreeModel
+
+    # Topic strings come from the network and are freed after dispatch; build them outside the measurement
+    names = [f"site/s{i % sites}/meters/m{i}/power" for i in range(topics)]
+
+    model = TopicTreeModel()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    for topic in names:
+        model.add(topic)
+    first = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    view = QTreeView()
+    view.setUniformRowHeights(True)
+    view.setModel(model)
+    view.resize(400, 800)
+    view.show()
+    model.flush()
+    app.processEvents()
+    site = model.index(0, 0)
+    view.expand(site)
+    for row in range(min(3, model.rowCount(site))):
+        view.expand(model.index(row, 0, site))
+    app.processEvents()
+
+    start = time.perf_counter()
+    for topic in names:
+        model.add(topic)
+    again = time.perf_counter() - start
+    start = time.perf_counter()
+    model.flush()
+    app.processEvents()
+    flush = time.perf_counter() - start
+
+    print(f"{topics} topics, {model.node_count} nodes: {size / 1e6:.1f} MB ({size / model.node_count:.0f} B per node)")
+    print(f"new topic: {first / topics * 1e6:.1f} us/message, known topic: {again / topics * 1e6:.1f} us/message")
+    print(f"flush + paint after {topics} messages: {flush * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
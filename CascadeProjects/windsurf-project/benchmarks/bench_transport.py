@@ -0,0 +1,188 @@
+"""
+Benchmark: message latency and CPU of the two MQTTClient transports.
+
+A minimal MQTT 3.1.1 broker stand-in (CONNECT, SUBSCRIBE, PINGREQ,
+DISCONNECT; QoS 0 only) runs in a separate process on localhost. Once the
+client subscribes it streams timestamped PUBLISH packets at a fixed rate,
+in small bursts, followed by an end marker. The client is the real
+MQTTClient, once with the paho loop_start() thread ("thread") and once with
+the Qt event loop transport ("qt"); latency is measured from the broker's
+send time to the message_received handler on the GUI thread.
+
+CPU is the client process's CPU time (process_time) per message, so the
+broker's own work is not counted.
+
+Usage:
+    python benchmarks/bench_transport.py [messages] [messages per second]
+"""
+import contextlib
+import io
+import multiprocessing
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TOPIC = "bench/transport"
+BURST = 20
+
+
+# --- broker stand-in ----------------------------------------------------
+
+def _encode_length(length):
+    encoded = bytearray()
+    while True:
+        byte, length = length % 128, length // 128
+        encoded.append(byte | 0x80 if length else byte)
+        if not length:
+            return bytes(encoded)
+
+
+def _read_packet(conn):
+    header = conn.recv(1)
+    if not header:
+        return None, b""
+    multiplier, length = 1, 0
+    while True:
+        byte = conn.recv(1)[0]
+        length += (byte & 0x7F) * multiplier
+        multiplier *= 128
+        if not byte & 0x80:
+            break
+    body = b""
+    while len(body) < length:
+        chunk = conn.recv(length - len(body))
+        if not chunk:
+            return None, b""
+        body += chunk
+    return header[0], body
+
+
+def _publish_packet(topic, payload):
+    topic = topic.encode()
+    body = struct.pack("!H", len(topic)) + topic + payload
+    return b"\x30" + _encode_length(len(body)) + body
+
+
+def _stream(conn, lock, count, rate):
+    interval = BURST / rate
+    next_burst = time.perf_counter()
+    sent = 0
+    while sent < count:
+        n = min(BURST, count - sent)
+        packets = b"".join(_publish_packet(TOPIC, struct.pack("!Q", time.perf_counter_ns())) for _ in range(n))
+        with lock:
+            conn.sendall(packets)
+        sent += n
+        next_burst += interval
+        delay = next_burst - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    with lock:
+        conn.sendall(_publish_packet(TOPIC, b"end"))
+
+
+def _serve(conn, count, rate):
+    lock = threading.Lock()
+    with conn:
+        while True:
+            kind, body = _read_packet(conn)
+            if kind is None:
+                return
+            kind &= 0xF0
+            if kind == 0x10:    # CONNECT
+                conn.sendall(b"\x20\x02\x00\x00")
+            elif kind == 0x80:  # SUBSCRIBE: grant QoS 0 to every filter
+                packet_id, pos, filters = body[:2], 2, 0
+                while pos < len(body):
+                    (length,) = struct.unpack_from("!H", body, pos)
+                    pos += 2 + length + 1
+                    filters += 1
+                payload = packet_id + b"\x00" * filters
+                with lock:
+                    conn.sendall(b"\x90" + _encode_length(len(payload)) + payload)
+                threading.Thread(target=_stream, args=(conn, lock, count, rate), daemon=True).start()
+            elif kind == 0xC0:  # PINGREQ
+                with lock:
+                    conn.sendall(b"\xd0\x00")
+            elif kind == 0xE0:  # DISCONNECT
+                return
+
+
+def run_broker(port_queue, count, rate, runs):
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+    port_queue.put(server.getsockname()[1])
+    for _ in range(runs):
+        conn, _ = server.accept()
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        _serve(conn, count, rate)
+    server.close()
+
+
+# --- client side --------------------------------------------------------
+
+def measure(app, port, transport, count):
+    from main import MQTTClient
+
+    client = MQTTClient()
+    client.transport = transport
+    latencies = []
+    cpu = {}
+
+    def on_message(topic, message):
+        received = time.perf_counter_ns()
+        data = bytes(message)
+        if data == b"end":
+            cpu['end'] = time.process_time()
+            app.quit()
+            return
+        sent = struct.unpack("!Q", data)[0]
+        if not latencies:
+            cpu['start'] = time.process_time()
+        latencies.append((received - sent) / 1000)
+
+    # Raw payloads: the timestamp is 8 binary bytes
+    client.codecs.set_rules([{"pattern": TOPIC, "codec": "raw"}])
+    client.add_listener(TOPIC, on_message)
+    client.subscribe(TOPIC)
+    # MQTTClient logs every message; keep that out of the measurement
+    with contextlib.redirect_stdout(io.StringIO()):
+        client.connect("127.0.0.1", port)
+        app.exec()
+        client.disconnect()
+    latencies.sort()
+    per_message_cpu = (cpu['end'] - cpu['start']) / max(len(latencies), 1) * 1e6
+    return latencies, per_message_cpu
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    rate = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtCore import QCoreApplication
+    app = QCoreApplication(sys.argv[:1])
+
+    transports = ("thread", "qt")
+    port_queue = multiprocessing.Queue()
+    broker = multiprocessing.Process(target=run_broker, args=(port_queue, count, rate, len(transports)), daemon=True)
+    broker.start()
+    port = port_queue.get(timeout=10)
+
+    print(f"{count} messages at {rate}/s in bursts of {BURST}, broker stand-in on 127.0.0.1:{port}")
+    for transport in transports:
+        latencies, per_message_cpu = measure(app, port, transport, count)
+        n = len(latencies)
+        p = lambda q: latencies[min(n - 1, int(q * n))]
+        print(f"{transport:>6}: {n} received, latency p50 {p(0.5):.0f} us, p99 {p(0.99):.0f} us, "
+              f"max {latencies[-1]:.0f} us, CPU {per_message_cpu:.1f} us/message")
+    broker.join(timeout=5)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: the config reads on the message and paint paths, and how many
+config objects a large layout holds (see widgets/widget_config.py).
+
+A layout of N tiles (bench_tiles.py) is loaded; reported are the time per
+call of the methods that read the config on every message or frame, and
+the number of distinct WidgetConfig instances against the number of tiles
+(identical configs share one instance).
+
+Usage:
+    python benchmarks/bench_widget_config.py [tiles] [calls]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def per_call_us(function, calls):
+    return min(timeit.repeat(function, number=calls, repeat=5)) / calls * 1e6
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    calls = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication(sys.argv[:1])
+    from main import ConnectionPool
+    from widgets.dashboard import Dashboard
+    from bench_tiles import write_layout
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tiles.json")
+        write_layout(path, count)
+        with contextlib.redirect_stdout(io.StringIO()):
+            dashboard = Dashboard(ConnectionPool())
+            dashboard.tile_mode = 'lite'
+            dashboard.load_layout(path)
+            app.processEvents()
+
+    widgets = dashboard.widgets
+    label = next(w for w in widgets if w.widget_type == 'label')
+    gauge = next(w for w in widgets if w.widget_type == 'gauge')
+    print(f"us per call ({calls} calls, best of 5)")
+    for name, function in [
+        ("format_value", lambda: gauge.format_value(42.5)),
+        ("get_warning_color", gauge.get_warning_color),
+        ("background_color", gauge.background_color),
+        ("canvas_content label", label.canvas_content),
+        ("canvas_content gauge", gauge.canvas_content),
+    ]:
+        print(f"{name:>22} {per_call_us(function, calls):>7.2f}")
+    distinct = len({id(widget.options) for widget in widgets})
+    print(f"{len(widgets)} tiles, {distinct} distinct config objects")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: zoom view frame time against layout size.
+
+Layouts of growing size (lite tiles, see bench_tiles.py) are opened in the
+zoom view at 1:1 and fitted to the window. Each frame, every tile gets a
+new value, then the view polls the visible tiles and Qt repaints the ones
+that were invalidated. At 1:1 the frame time should stay flat however big
+the layout is (only the visible tiles are polled and painted). Fitted,
+every tile is visible and drawn as a block; with the value text while the
+scale is above BLOCK_LOD, as a plain block (unchanged by new values)
+below it.
+
+Usage:
+    python benchmarks/bench_zoom_view.py [frames] [tile counts...]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def frame_time(app, view, client, topics, frames):
+    times = []
+    for frame in range(frames + 1):
+        for i, topic in enumerate(topics):
+            client._on_dispatched(topic, str((frame + i) % 100))
+        start = time.perf_counter()
+        view.refresh()
+        app.processEvents()  # repaints what refresh() invalidated
+        if frame:  # the first frame fills the item caches
+            times.append(time.perf_counter() - start)
+    times.sort()
+    return times[len(times) // 2] * 1000
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    counts = [int(arg) for arg in sys.argv[2:]] or [500, 2000, 8000]
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import QEvent
+    app = QApplication(sys.argv[:1])
+    from main import ConnectionPool
+    from widgets.dashboard import Dashboard
+    from bench_tiles import write_layout
+
+    print(f"median ms per frame ({frames} frames, 1200x800 view, every tile changes each frame)")
+    print(f"{'tiles':>6} {'1:1':>8} {'fitted':>8} {'scale':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in counts:
+            path = os.path.join(tmp, f"zoom_{count}.json")
+            write_layout(path, count)
+            with contextlib.redirect_stdout(io.StringIO()):
+                connections = ConnectionPool()
+                dashboard = Dashboard(connections)
+                dashboard.tile_mode = 'lite'
+                dashboard.resize(1200, 800)
+                dashboard.show()
+                dashboard.load_layout(path)
+                dashboard.set_zoom_view(True)
+                app.processEvents()
+                view = dashboard.zoom_view
+                topics = [widget.topic for widget in dashboard.widgets]
+
+                view.resetTransform()
+                view.centerOn(600, 400)
+                one = frame_time(app, view, connections.default, topics, frames)
+                view.fit()
+                scale = view.transform().m11()
+                fitted = frame_time(app, view, connections.default, topics, frames)
+            print(f"{count:>6} {one:>8.1f} {fitted:>8.1f} {scale:>7.3f}")
+            # Free this layout before the next (deleteLater alone waits for an event loop)
+            dashboard.hide()
+            dashboard.deleteLater()
+            app.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Crash-safe file writing helpers.
+
+atomic_write_text() writes to a temp file in the target directory, fsyncs it
+and renames it over the target, so readers see either the old or the new file
+and never a truncated one. BackgroundWriter runs those writes on a single
+daemon thread and coalesces pending writes per path (latest wins), so callers
+on the GUI thread never wait for the disk.
+"""
+import os
+import tempfile
+import threading
+
+
+def rotate_backups(path, keep):
+    """Shift path.1 .. path.(keep-1) up by one and copy the current file to path.1."""
+    if keep <= 0 or not os.path.exists(path):
+        return
+    for index in range(keep - 1, 0, -1):
+        older = f"{path}.{index}"
+        if os.path.exists(older):
+            os.replace(older, f"{path}.{index + 1}")
+    # Hard link is instant and leaves `path` in place until the new file replaces it
+    backup = f"{path}.1"
+    try:
+        os.link(path, backup)
+    except OSError:
+        with open(path, 'rb') as src, open(backup, 'wb') as dst:
+            dst.write(src.read())
+
+
+def _fsync_dir(directory):
+    """Persist the rename itself (POSIX only; a no-op on Windows)."""
+    if os.name != 'posix':
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write_text(path, text, keep=0, encoding='utf-8'):
+    """Atomically replace path with text, optionally keeping `keep` rotated versions."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding=encoding) as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        rotate_backups(path, keep)
+        os.replace(tmp_path, path)
+        _fsync_dir(directory)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class BackgroundWriter:
+    """Single worker thread that performs atomic writes off the calling thread."""
+
+    def __init__(self, name="atomic-writer"):
+        self._pending = {}  # path -> (produce, keep, on_done)
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._busy = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, path, produce, keep=0, on_done=None):
+        """
+        Queue a write of produce() to path. produce is called on the worker thread,
+        so serialization cost stays off the caller too. A newer submit for the same
+        path replaces one that hasn't started yet. on_done(path, error) is called
+        on the worker thread afterwards (error is None on success).
+        """
+        with self._cond:
+            if self._stopping:
+                return
+            self._pending[path] = (produce, keep, on_done)
+            self._cond.notify()
+
+    def wait_idle(self, timeout=None):
+        """Block until everything queued so far has been written (or timeout expires)."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def shutdown(self, timeout=5.0):
+        """Write whatever is pending, then stop the worker thread."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._stopping)
+                if not self._pending:
+                    return
+                path, (produce, keep, on_done) = self._pending.popitem()
+                self._busy = True
+            error = None
+            try:
+                atomic_write_text(path, produce(), keep=keep)
+            except Exception as e:
+                error = e
+                print(f"[ERROR] Background write to {path} failed: {e}")
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+            if on_done:
+                try:
+                    on_done(path, error)
+                except Exception as e:
+                    print(f"[ERROR] Write callback for {path} failed: {e}")
@@ -1,44 +1,182 @@
 import os
 import json
+import copy
+import atexit
+import threading
 from pathlib import Path
+from config.atomic_io import BackgroundWriter
+
+DEFAULT_SETTINGS = {
+    'broker': 'localhost',
+    'port': 1883,
+    'username': '',
+    'password': '',
+    'use_ssl': False,
+    'auto_connect': False,
+    'dashboard': {
+        'theme': 'light',
+        'font_size': 12,
+        'recent_files': []
+    }
+}
+
+# Delay before a burst of set/save calls is written to disk
+FLUSH_DELAY = 1.0
+
+_config_path = None
 
 def get_config_path():
     """Get the path to the config directory"""
-    config_dir = os.path.join(str(Path.home()), ".config", "mqtt-dashboard")
-    os.makedirs(config_dir, exist_ok=True)
-    return os.path.join(config_dir, "settings.json")
+    global _config_path
+    if _config_path is None:
+        config_dir = os.path.join(str(Path.home()), ".config", "mqtt-dashboard")
+        os.makedirs(config_dir, exist_ok=True)
+        _config_path = os.path.join(config_dir, "settings.json")
+    return _config_path
+
+
+class SettingsStore:
+    """
+    Process-wide settings cache.
+
+    settings.json is read once; reads are served from memory. Writes update the
+    in-memory copy immediately, notify listeners, and are coalesced into a single
+    atomic write on a background thread FLUSH_DELAY seconds after the last change.
+    """
+
+    def __init__(self, path=None, flush_delay=FLUSH_DELAY):
+        self.path = path
+        self.flush_delay = flush_delay
+        self._data = None
+        self._lock = threading.RLock()
+        self._timer = None
+        self._writer = None
+        self._listeners = []
+
+    def _ensure_loaded(self):
+        if self._data is not None:
+            return
+        path = self.path or get_config_path()
+        if not os.path.exists(path):
+            self._data = copy.deepcopy(DEFAULT_SETTINGS)
+            return
+        try:
+            with open(path, 'r') as f:
+                self._data = json.load(f)
+        except Exception as e:
+            print(f"Error loading settings: {e}")
+            self._data = {}
+
+    def snapshot(self):
+        """Return a private deep copy of all settings."""
+        with self._lock:
+            self._ensure_loaded()
+            return copy.deepcopy(self._data)
+
+    def get(self, key, default=None):
+        """Return a setting from memory (treat nested values as read-only)."""
+        with self._lock:
+            self._ensure_loaded()
+            return self._data.get(key, default)
+
+    def set(self, key, value):
+        self.update({key: value})
+
+    def update(self, values):
+        """Merge values into the settings and schedule a flush."""
+        with self._lock:
+            self._ensure_loaded()
+            changed = {k: v for k, v in values.items() if k not in self._data or self._data[k] != v}
+            if not changed:
+                return
+            self._data.update(copy.deepcopy(changed))
+            self._schedule_flush()
+        self._notify(changed, ())
+
+    def replace(self, settings):
+        """Replace all settings (what save_settings() does) and schedule a flush."""
+        with self._lock:
+            self._ensure_loaded()
+            old = self._data
+            changed = {k: v for k, v in settings.items() if k not in old or old[k] != v}
+            removed = [k for k in old if k not in settings]
+            self._data = copy.deepcopy(settings)
+            if not changed and not removed:
+                return
+            self._schedule_flush()
+        self._notify(changed, removed)
+
+    def delete(self, key):
+        with self._lock:
+            self._ensure_loaded()
+            if key not in self._data:
+                return
+            del self._data[key]
+            self._schedule_flush()
+        self._notify({}, [key])
+
+    def add_listener(self, callback):
+        """Register callback(changed: dict, removed: list of keys), called on the changing thread
+        after every change. Keys that were deleted are only in removed, so a setting whose
+        value is None (JSON null) is still a change."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, changed, removed):
+        for callback in list(self._listeners):
+            try:
+                callback(changed, removed)
+            except Exception as e:
+                print(f"Settings listener failed: {e}")
+
+    def _schedule_flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.flush_delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self, wait=False):
+        """Queue the current settings for writing; with wait=True block until written."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._data is None:
+                return
+            text = json.dumps(self._data, indent=2)
+            if self._writer is None:
+                self._writer = BackgroundWriter(name="settings-writer")
+        self._writer.submit(self.path or get_config_path(), lambda: text)
+        if wait:
+            self._writer.wait_idle(timeout=5.0)
+
+    def close(self):
+        """Write out a pending change and wait for in-flight writes (called at exit)."""
+        if self._timer is not None:
+            self.flush()
+        if self._writer is not None:
+            self._writer.shutdown()
+
+
+_store = SettingsStore()
+atexit.register(_store.close)
+
+def get_store():
+    """Return the shared SettingsStore"""
+    return _store
 
 def load_settings():
-    """Load settings from config file"""
-    config_file = get_config_path()
-    if not os.path.exists(config_file):
-        return {
-            'broker': 'localhost',
-            'port': 1883,
-            'username': '',
-            'password': '',
-            'use_ssl': False,
-            'auto_connect': False,
-            'dashboard': {
-                'theme': 'light',
-                'font_size': 12,
-                'recent_files': []
-            }
-        }
-    
-    try:
-        with open(config_file, 'r') as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"Error loading settings: {e}")
-        return {}
+    """Load settings (a private copy, served from memory after the first read)"""
+    return _store.snapshot()
 
 def save_settings(settings):
-    """Save settings to config file"""
+    """Save settings; the file is written in the background shortly after"""
     try:
-        config_file = get_config_path()
-        with open(config_file, 'w') as f:
-            json.dump(settings, f, indent=2)
+        _store.replace(settings)
         return True
     except Exception as e:
         print(f"Error saving settings: {e}")
@@ -46,11 +184,9 @@ def save_settings(settings):
 
 def get_setting(key, default=None):
     """Get a specific setting value"""
-    settings = load_settings()
-    return settings.get(key, default)
+    return _store.get(key, default)
 
 def set_setting(key, value):
     """Set a specific setting value"""
-    settings = load_settings()
-    settings[key] = value
-    return save_settings(settings)
+    _store.set(key, value)
+    return True
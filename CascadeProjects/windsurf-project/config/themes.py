@@ -124,29 +124,27 @@ THEMES = PREDEFINED_THEMES.copy()
 
 def load_custom_themes():
     """Load custom themes from settings"""
-    from config.settings import load_settings
-    settings = load_settings()
-    custom_themes = settings.get('custom_themes', {})
+    from config.settings import get_setting
+    custom_themes = get_setting('custom_themes', {})
     THEMES.update(custom_themes)
     return custom_themes
 
 def save_custom_theme(theme_key, theme_data):
     """Save a custom theme to settings"""
-    from config.settings import load_settings, save_settings
-    settings = load_settings()
-    if 'custom_themes' not in settings:
-        settings['custom_themes'] = {}
-    settings['custom_themes'][theme_key] = theme_data
-    save_settings(settings)
+    from config.settings import get_setting, set_setting
+    custom_themes = dict(get_setting('custom_themes', {}))
+    custom_themes[theme_key] = theme_data
+    set_setting('custom_themes', custom_themes)
     THEMES[theme_key] = theme_data
 
 def delete_custom_theme(theme_key):
     """Delete a custom theme"""
-    from config.settings import load_settings, save_settings
-    settings = load_settings()
-    if 'custom_themes' in settings and theme_key in settings['custom_themes']:
-        del settings['custom_themes'][theme_key]
-        save_settings(settings)
+    from config.settings import get_setting, set_setting
+    custom_themes = get_setting('custom_themes', {})
+    if theme_key in custom_themes:
+        custom_themes = dict(custom_themes)
+        del custom_themes[theme_key]
+        set_setting('custom_themes', custom_themes)
         if theme_key in THEMES:
             del THEMES[theme_key]
 
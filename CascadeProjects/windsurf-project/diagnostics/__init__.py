@@ -0,0 +1 @@
+# Diagnostics package: tracing, runtime metrics and profiling helpers
@@ -0,0 +1,184 @@
+"""
+Optional localhost HTTP endpoint exposing the runtime counters for scraping.
+
+    GET /metrics       Prometheus text exposition format
+    GET /metrics.json  the same values as JSON
+
+The server runs on its own daemon thread and never touches Qt: each request
+takes a snapshot of the counters in diagnostics.metrics (reading them takes no
+lock), so a scrape cannot stall the GUI thread. Extra gauges (e.g. the widget count) are supplied
+as callables that must be safe to call from a non-GUI thread.
+"""
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from diagnostics.metrics import metrics
+
+PREFIX = "mqtt_dashboard_"
+
+
+def read_rss_bytes():
+    """Resident set size of this process in bytes, or None if it can't be determined."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except Exception:
+        pass
+    if sys.platform.startswith('linux'):
+        try:
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except Exception:
+            return None
+    if sys.platform == 'win32':
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                            ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                            ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                            ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                            ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                return counters.WorkingSetSize
+        except Exception:
+            return None
+        return None
+    try:
+        import resource
+        # Peak rather than current RSS; kilobytes on most platforms, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except Exception:
+        return None
+
+
+def collect(gauges=None):
+    """Build a plain dict of everything the endpoint exports."""
+    snap = metrics.snapshot()
+    values = {
+        'messages_received_total': snap['received'],
+        'messages_dispatched_total': snap['dispatched'],
+        'messages_dropped_total': snap['dropped'],
+        'parse_failures_total': sum(s[2] for s in snap['topics'].values()),
+        'connects_total': snap['connects'],
+        'reconnects_total': snap['reconnects'],
+        'disconnects_total': snap['disconnects'],
+        'queue_depth': snap['queue_depth'],
+        'event_loop_lag_ms': snap['loop_lag_ms'],
+        'event_loop_lag_max_ms': snap['loop_lag_max_ms'],
+        'topics': len(snap['topics']),
+        'rss_bytes': read_rss_bytes(),
+        'publish_latency_seconds': snap['publish_latency'],
+        'frame_time_seconds': snap['frame_times'],
+    }
+    for name, provider in (gauges or {}).items():
+        try:
+            values[name] = provider()
+        except Exception:
+            values[name] = None
+    return values
+
+
+# name -> (type, help); anything not listed is exported as an untyped gauge
+_METRIC_INFO = {
+    'messages_received_total': ('counter', "MQTT messages received from the broker"),
+    'messages_dispatched_total': ('counter', "Messages delivered to widgets on the GUI thread"),
+    'messages_dropped_total': ('counter', "Messages discarded because they could not be decoded"),
+    'parse_failures_total': ('counter', "Payloads that could not be decoded or parsed, dropped ones included"),
+    'connects_total': ('counter', "Successful broker connections"),
+    'reconnects_total': ('counter', "Successful connections after the first one"),
+    'disconnects_total': ('counter', "Broker disconnections"),
+    'queue_depth': ('gauge', "Messages received but not yet dispatched to widgets"),
+    'event_loop_lag_ms': ('gauge', "Latest GUI event-loop lag sample"),
+    'event_loop_lag_max_ms': ('gauge', "Worst GUI event-loop lag since start"),
+    'topics': ('gauge', "Distinct topics seen"),
+    'rss_bytes': ('gauge', "Resident memory of the dashboard process"),
+    'widgets': ('gauge', "Widgets on the dashboard"),
+    'publish_latency_seconds': ('histogram', "Time from publish() until paho reports the message sent"),
+    'frame_time_seconds': ('histogram', "Widget paintEvent durations"),
+}
+
+
+def render_prometheus(values):
+    lines = []
+    for name, value in values.items():
+        if value is None:
+            continue
+        kind, help_text = _METRIC_INFO.get(name, ('gauge', name))
+        full = PREFIX + name
+        lines.append(f"# HELP {full} {help_text}")
+        lines.append(f"# TYPE {full} {kind}")
+        if kind == 'histogram':
+            cumulative = 0
+            for bound, count in zip(value['bounds'], value['counts']):
+                cumulative += count
+                lines.append(f'{full}_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f'{full}_bucket{{le="+Inf"}} {value["count"]}')
+            lines.append(f"{full}_sum {value['sum']}")
+            lines.append(f"{full}_count {value['count']}")
+        else:
+            lines.append(f"{full} {value}")
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path == '/metrics':
+            body = render_prometheus(collect(self.server.gauges)).encode('utf-8')
+            content_type = 'text/plain; version=0.0.4; charset=utf-8'
+        elif path == '/metrics.json':
+            body = json.dumps(collect(self.server.gauges)).encode('utf-8')
+            content_type = 'application/json'
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would flood stdout
+        pass
+
+
+class MetricsExporter:
+    """Serves /metrics and /metrics.json on host:port from a background thread."""
+
+    def __init__(self, port, host='127.0.0.1', gauges=None):
+        self.host = host
+        self.port = port
+        self.gauges = dict(gauges or {})
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        if self._server is not None:
+            return
+        self._server = ThreadingHTTPServer((self.host, self.port), _MetricsHandler)
+        self._server.daemon_threads = True
+        self._server.gauges = self.gauges
+        self.port = self._server.server_address[1]  # resolves port 0
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-exporter", daemon=True)
+        self._thread.start()
+        print(f"[DEBUG] Metrics endpoint on http://{self.host}:{self.port}/metrics")
+
+    def stop(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        self._thread = None
@@ -0,0 +1,295 @@
+"""
+Low-overhead runtime counters for the diagnostics page.
+
+The hot paths only do dict lookups and integer additions; rates are derived
+by the reader from the difference between two snapshots, so nothing here
+runs on a timer. Messages are counted on several threads (one paho network
+thread per broker connection, the virtual-topics worker), so every thread
+counts into its own _MessageCounters and readers sum them: the hot path
+takes no lock. Each connect() starts a new paho thread, so readers fold the
+counters of threads that have exited into one retired aggregate. The rarer counters written from more than one thread
+(parse failures, drops, connects, publish latency) hold _lock. Dispatch,
+paint and loop lag are only written by the GUI thread. Readers don't lock
+and tolerate slightly stale values.
+"""
+import bisect
+import functools
+import threading
+import time
+from diagnostics.profiler import profiler
+
+_now_ns = time.perf_counter_ns
+
+
+class TopicStats:
+    __slots__ = ('messages', 'bytes', 'parse_failures', 'last_seen')
+
+    def __init__(self):
+        self.messages = 0
+        self.bytes = 0
+        self.parse_failures = 0
+        self.last_seen = 0.0
+
+
+class _MessageCounters:
+    """Message counts of one writer thread"""
+    __slots__ = ('received', 'topics', 'thread')
+
+    def __init__(self, thread=None):
+        self.received = 0
+        self.topics = {}  # topic -> TopicStats (messages, bytes, last_seen)
+        self.thread = thread  # None for the aggregate of exited threads
+
+    def merged(self, other):
+        """A new _MessageCounters holding the counts of both"""
+        result = _MessageCounters()
+        result.received = self.received + other.received
+        for counters in (self, other):
+            for topic, s in counters.topics.items():
+                stats = result.topics.get(topic)
+                if stats is None:
+                    stats = result.topics[topic] = TopicStats()
+                stats.messages += s.messages
+                stats.bytes += s.bytes
+                stats.last_seen = max(stats.last_seen, s.last_seen)
+        return result
+
+
+class TimingStats:
+    __slots__ = ('count', 'total_ns', 'max_ns')
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def add(self, ns):
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+
+class Histogram:
+    """Fixed-bucket histogram (upper bounds in seconds), Prometheus style."""
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def snapshot(self):
+        return {'bounds': self.bounds, 'counts': tuple(self.counts), 'sum': self.sum, 'count': self.count}
+
+
+# Bucket bounds (seconds) for paint/frame times and publish latency
+FRAME_BUCKETS = (0.001, 0.002, 0.004, 0.008, 0.016, 0.033, 0.066, 0.1, 0.25)
+PUBLISH_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class RuntimeMetrics:
+    def __init__(self):
+        self.topics = {}    # topic -> TopicStats (parse failures; messages are per thread)
+        self.dispatch = {}  # widget type -> TimingStats (message handler calls)
+        self.paint = {}     # widget type -> TimingStats (paintEvent calls)
+        self.dispatched = 0 # messages delivered on the GUI thread
+        self.loop_lag_ms = 0.0
+        self.loop_lag_max_ms = 0.0
+        self.dropped = 0    # messages that could not be decoded and were discarded
+        self.connects = 0
+        self.reconnects = 0
+        self.disconnects = 0
+        self.frame_times = Histogram(FRAME_BUCKETS)
+        self.publish_latency = Histogram(PUBLISH_BUCKETS)
+        self._lock = threading.Lock()  # for the rarer counters written from more than one thread
+        self._local = threading.local()
+        self._message_counters = []  # _MessageCounters of every live thread that counted messages
+        self._retired = _MessageCounters()  # counts of threads that have exited
+
+    # --- hot path -------------------------------------------------------
+
+    def record_message(self, topic, nbytes):
+        counters = getattr(self._local, 'counters', None)
+        if counters is None:
+            counters = self._thread_counters()
+        stats = counters.topics.get(topic)
+        if stats is None:
+            stats = counters.topics[topic] = TopicStats()
+        stats.messages += 1
+        stats.bytes += nbytes
+        stats.last_seen = time.time()
+        counters.received += 1
+
+    def _thread_counters(self):
+        counters = self._local.counters = _MessageCounters(threading.current_thread())
+        with self._lock:
+            self._message_counters.append(counters)
+        return counters
+
+    def record_dispatched(self):
+        self.dispatched += 1
+
+    def record_parse_failure(self, topic, dropped=False):
+        with self._lock:
+            stats = self.topics.get(topic)
+            if stats is None:
+                stats = self.topics[topic] = TopicStats()
+            stats.parse_failures += 1
+            if dropped:
+                self.dropped += 1
+
+    def record_dispatch(self, kind, ns):
+        stats = self.dispatch.get(kind)
+        if stats is None:
+            stats = self.dispatch[kind] = TimingStats()
+        stats.add(ns)
+
+    def record_paint(self, kind, ns):
+        stats = self.paint.get(kind)
+        if stats is None:
+            stats = self.paint[kind] = TimingStats()
+        stats.add(ns)
+        self.frame_times.observe(ns / 1e9)
+
+    def record_dropped(self, topic):
+        self.record_parse_failure(topic, dropped=True)
+
+    def record_connect(self):
+        with self._lock:
+            if self.connects:
+                self.reconnects += 1
+            self.connects += 1
+
+    def record_disconnect(self):
+        with self._lock:
+            self.disconnects += 1
+
+    def record_publish_latency(self, seconds):
+        with self._lock:
+            self.publish_latency.observe(seconds)
+
+    def record_loop_lag(self, lag_ms):
+        self.loop_lag_ms = lag_ms
+        if lag_ms > self.loop_lag_max_ms:
+            self.loop_lag_max_ms = lag_ms
+
+    # --- readers --------------------------------------------------------
+
+    def _all_counters(self):
+        """The retired aggregate and the counters of the live threads"""
+        with self._lock:
+            # An exited thread no longer writes, so its counts can be folded;
+            # _retired is replaced, never mutated, so earlier readers stay consistent
+            if any(not counters.thread.is_alive() for counters in self._message_counters):
+                live = []
+                for counters in self._message_counters:
+                    if counters.thread.is_alive():
+                        live.append(counters)
+                    else:
+                        self._retired = self._retired.merged(counters)
+                self._message_counters = live
+            return [self._retired] + self._message_counters
+
+    @property
+    def received(self):
+        """Messages handed over by the network threads"""
+        return sum(counters.received for counters in self._all_counters())
+
+    def topic_totals(self):
+        """{topic: (messages, bytes, parse failures, last seen)} over all threads"""
+        totals = {}
+        for counters in self._all_counters():
+            for topic, s in list(counters.topics.items()):
+                messages, nbytes, failures, last_seen = totals.get(topic, (0, 0, 0, 0.0))
+                totals[topic] = (messages + s.messages, nbytes + s.bytes, failures, max(last_seen, s.last_seen))
+        for topic, s in list(self.topics.items()):
+            messages, nbytes, failures, last_seen = totals.get(topic, (0, 0, 0, 0.0))
+            totals[topic] = (messages, nbytes, failures + s.parse_failures, last_seen)
+        return totals
+
+    @property
+    def queue_depth(self):
+        """Messages received on the network threads but not yet delivered to widgets."""
+        return max(0, self.received - self.dispatched)
+
+    def snapshot(self):
+        """Copy all counters into plain dicts/tuples (safe to diff against a later snapshot)."""
+        received, dispatched = self.received, self.dispatched
+        return {
+            'time': time.perf_counter(),
+            'topics': self.topic_totals(),
+            'dispatch': {k: (s.count, s.total_ns, s.max_ns) for k, s in list(self.dispatch.items())},
+            'paint': {k: (s.count, s.total_ns, s.max_ns) for k, s in list(self.paint.items())},
+            'received': received,
+            'dispatched': dispatched,
+            'queue_depth': max(0, received - dispatched),
+            'loop_lag_ms': self.loop_lag_ms,
+            'loop_lag_max_ms': self.loop_lag_max_ms,
+            'dropped': self.dropped,
+            'connects': self.connects,
+            'reconnects': self.reconnects,
+            'disconnects': self.disconnects,
+            'frame_times': self.frame_times.snapshot(),
+            'publish_latency': self.publish_latency.snapshot(),
+        }
+
+    def reset(self):
+        self.__init__()
+
+
+metrics = RuntimeMetrics()
+
+
+def _metrics_kind(obj):
+    kind = getattr(obj, 'widget_type', None)
+    if kind is None:
+        parent_widget = getattr(obj, 'parent_widget', None)
+        kind = getattr(parent_widget, 'widget_type', None)
+    return kind or type(obj).__name__
+
+
+def timed_dispatch(method):
+    """Decorator for widget on_message_received handlers: time each call per widget type."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        start = _now_ns()
+        try:
+            if profiler.active:
+                return profiler.call(_metrics_kind(self), 'dispatch', method, self, *args, **kwargs)
+            return method(self, *args, **kwargs)
+        finally:
+            metrics.record_dispatch(_metrics_kind(self), _now_ns() - start)
+    return wrapper
+
+
+def timed_paint(method):
+    """Decorator for paintEvent: time each paint per widget type."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        start = _now_ns()
+        try:
+            if profiler.active:
+                return profiler.call(_metrics_kind(self), 'paintEvent', method, self, *args, **kwargs)
+            return method(self, *args, **kwargs)
+        finally:
+            metrics.record_paint(_metrics_kind(self), _now_ns() - start)
+    return wrapper
+
+
+def profiled(hot_path):
+    """Decorator for other hot-path methods (format_value, apply_config): profiled only, not timed."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if profiler.active:
+                return profiler.call(_metrics_kind(self), hot_path, method, self, *args, **kwargs)
+            return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
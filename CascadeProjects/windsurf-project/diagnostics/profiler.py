@@ -0,0 +1,162 @@
+"""
+On-demand profiler for the GUI hot paths (message dispatch, format_value,
+apply_config and paintEvent).
+
+While a profiling window is open, every hot-path call made on the GUI thread
+runs under a cProfile.Profile kept per widget type, and a sampler thread
+records the GUI thread's Python stack about once per millisecond whenever it
+is inside one of those calls. stop() writes:
+
+    <type>.pstats          cProfile data for one widget type
+    all.pstats             all widget types merged (open with pstats/snakeviz)
+    flamegraph.collapsed   "type;hot path;frame;frame... count" lines for
+                           flamegraph.pl / speedscope / inferno
+    summary.txt            calls and time per widget type and hot path,
+                           plus the top functions of each type
+
+Outside a profiling window the only cost is one attribute check per call.
+Nested hot-path calls (format_value inside a dispatch) are attributed to the
+outermost one.
+"""
+import cProfile
+import io
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Length of a profiling window started from the tray menu
+DEFAULT_DURATION = 30
+SAMPLE_INTERVAL = 0.001
+
+
+def get_profile_dir():
+    """Directory profiling runs are written to (one subdirectory per run)"""
+    return os.path.join(str(Path.home()), ".config", "mqtt-dashboard", "profiles")
+
+
+def _frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class HotPathProfiler:
+    def __init__(self):
+        self.active = False
+        self.output_dir = None
+        self._thread_id = None
+        self._current = None   # (widget type, hot path) of the call in progress
+        self._profiles = {}    # widget type -> cProfile.Profile
+        self._calls = {}       # (widget type, hot path) -> [calls, total ns]
+        self._samples = {}     # collapsed stack -> sample count
+        self._sampler = None
+        self._started = 0.0
+
+    def start(self, output_dir=None, sample_interval=SAMPLE_INTERVAL):
+        """Open a profiling window; hot paths called from this thread are profiled."""
+        if self.active:
+            return
+        self.output_dir = output_dir or os.path.join(
+            get_profile_dir(), time.strftime("profile-%Y%m%d-%H%M%S"))
+        self._thread_id = threading.get_ident()
+        self._profiles = {}
+        self._calls = {}
+        self._samples = {}
+        self._current = None
+        self._started = time.perf_counter()
+        self.active = True
+        self._sampler = threading.Thread(target=self._sample_loop, args=(sample_interval,),
+                                         name="hot-path-sampler", daemon=True)
+        self._sampler.start()
+        print(f"[DEBUG] Profiling hot paths, output in {self.output_dir}")
+
+    def call(self, kind, hot_path, func, *args, **kwargs):
+        """Run func under the widget type's profile (used by the hot-path decorators)."""
+        if not self.active or self._current is not None or threading.get_ident() != self._thread_id:
+            return func(*args, **kwargs)
+        profile = self._profiles.get(kind)
+        if profile is None:
+            profile = self._profiles[kind] = cProfile.Profile()
+        key = (kind, hot_path)
+        start = time.perf_counter_ns()
+        self._current = key
+        try:
+            return profile.runcall(func, *args, **kwargs)
+        finally:
+            self._current = None
+            stats = self._calls.get(key)
+            if stats is None:
+                stats = self._calls[key] = [0, 0]
+            stats[0] += 1
+            stats[1] += time.perf_counter_ns() - start
+
+    def _sample_loop(self, interval):
+        stop_code = HotPathProfiler.call.__code__
+        while self.active:
+            time.sleep(interval)
+            key = self._current
+            if key is None:
+                continue
+            frame = sys._current_frames().get(self._thread_id)
+            codes = []
+            while frame is not None:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            # Keep the frames below the outermost call() (nested hot paths pass through it too)
+            outer = max((i for i, code in enumerate(codes) if code is stop_code), default=None)
+            if outer is None or self._current != key:
+                continue  # the call finished while we were walking the stack
+            stack = [_frame_label(code) for code in reversed(codes[:outer])
+                     if code is not stop_code and code.co_filename != cProfile.__file__]
+            collapsed = ";".join(list(key) + stack)
+            self._samples[collapsed] = self._samples.get(collapsed, 0) + 1
+
+    def stop(self):
+        """Close the window and write the result files. Returns the output directory."""
+        if not self.active:
+            return None
+        self.active = False
+        if self._sampler is not None:
+            self._sampler.join(timeout=1.0)
+            self._sampler = None
+        try:
+            self._write_results(time.perf_counter() - self._started)
+        except Exception as e:
+            print(f"[ERROR] Failed to write profile: {e}")
+            return None
+        print(f"[DEBUG] Profile written to {self.output_dir}")
+        return self.output_dir
+
+    def _write_results(self, duration):
+        os.makedirs(self.output_dir, exist_ok=True)
+        merged = None
+        for kind, profile in self._profiles.items():
+            profile.dump_stats(os.path.join(self.output_dir, f"{re.sub(r'[^A-Za-z0-9_.-]', '_', kind)}.pstats"))
+            if merged is None:
+                merged = pstats.Stats(profile)
+            else:
+                merged.add(profile)
+        if merged is not None:
+            merged.dump_stats(os.path.join(self.output_dir, "all.pstats"))
+
+        with open(os.path.join(self.output_dir, "flamegraph.collapsed"), "w") as f:
+            for stack, count in sorted(self._samples.items()):
+                f.write(f"{stack} {count}\n")
+
+        with open(os.path.join(self.output_dir, "summary.txt"), "w", encoding="utf-8") as f:
+            f.write(f"Profiling window: {duration:.1f} s, {sum(self._samples.values())} stack samples\n\n")
+            f.write(f"{'Widget type':<16} {'Hot path':<16} {'Calls':>8} {'Total ms':>10} {'Avg µs':>10}\n")
+            for (kind, hot_path), (calls, total_ns) in sorted(self._calls.items(), key=lambda item: -item[1][1]):
+                f.write(f"{kind:<16} {hot_path:<16} {calls:>8} {total_ns / 1e6:>10.1f} "
+                        f"{total_ns / calls / 1000:>10.1f}\n")
+            for kind, profile in sorted(self._profiles.items()):
+                stream = io.StringIO()
+                stats = pstats.Stats(profile, stream=stream)
+                stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(15)
+                f.write(f"\n===== {kind} =====\n{stream.getvalue()}")
+
+
+profiler = HotPathProfiler()
+
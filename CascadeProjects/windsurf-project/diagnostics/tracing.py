@@ -0,0 +1,149 @@
+"""
+Lightweight span tracing with monotonic timestamps.
+
+    from diagnostics.tracing import tracer
+
+    with tracer.span("layout.parse", file=path):
+        ...
+    tracer.instant("mqtt.first_message", topic=topic)
+
+Events go into a bounded deque (appends are thread-safe, so the paho network
+thread can record too) and can be exported in Chrome trace-event format for
+chrome://tracing or https://ui.perfetto.dev. When the tracer is disabled,
+span() returns a shared no-op context manager.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# Everything is relative to the moment this module was first imported;
+# main.py imports it first thing so this is effectively process start.
+_ORIGIN_NS = time.perf_counter_ns()
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'args', 'start')
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args = dict(self.args, error=exc_type.__name__)
+        self.tracer._record('X', self.name, self.start, end - self.start, self.args)
+        return False
+
+
+class Tracer:
+    def __init__(self, max_events=20000, enabled=True):
+        self.enabled = enabled
+        self.events = deque(maxlen=max_events)
+        self._marks = set()
+
+    def span(self, name, **args):
+        """Context manager recording a complete event around the block."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def instant(self, name, **args):
+        """Record a point-in-time event."""
+        if self.enabled:
+            self._record('i', name, time.perf_counter_ns(), 0, args)
+
+    def mark_once(self, key, name, **args):
+        """Record an instant event only the first time key is seen (e.g. the first MQTT message).
+        Keys are kept until clear(); per-object events belong on the object instead
+        (ResizableWidget.trace_once)."""
+        if not self.enabled or key in self._marks:
+            return
+        self._marks.add(key)
+        self._record('i', name, time.perf_counter_ns(), 0, args)
+
+    def _record(self, phase, name, start_ns, duration_ns, args):
+        self.events.append((phase, name, start_ns, duration_ns, threading.get_ident(), args))
+
+    def clear(self):
+        self.events.clear()
+        self._marks.clear()
+
+    def elapsed_ms(self):
+        """Milliseconds since the trace origin."""
+        return (time.perf_counter_ns() - _ORIGIN_NS) / 1e6
+
+    def snapshot(self):
+        """Return the recorded events as dicts with times in ms relative to the origin."""
+        rows = []
+        for phase, name, start_ns, duration_ns, thread_id, args in list(self.events):
+            rows.append({
+                'phase': phase,
+                'name': name,
+                'start_ms': (start_ns - _ORIGIN_NS) / 1e6,
+                'duration_ms': duration_ns / 1e6,
+                'thread': thread_id,
+                'args': args,
+            })
+        return rows
+
+    def to_chrome_trace(self):
+        """Return the trace as a Chrome trace-event JSON object."""
+        pid = os.getpid()
+        main_thread = threading.main_thread().ident
+        trace_events = [
+            {'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0, 'args': {'name': 'MQTT Dashboard'}},
+        ]
+        thread_names = {main_thread: 'GUI'}
+        for thread in threading.enumerate():
+            thread_names.setdefault(thread.ident, thread.name)
+        seen_threads = set()
+        for phase, name, start_ns, duration_ns, thread_id, args in list(self.events):
+            seen_threads.add(thread_id)
+            event = {
+                'name': name,
+                'ph': phase,
+                'ts': (start_ns - _ORIGIN_NS) / 1000.0,
+                'pid': pid,
+                'tid': thread_id,
+                'args': {k: str(v) if not isinstance(v, (int, float, bool)) else v for k, v in args.items()},
+            }
+            if phase == 'X':
+                event['dur'] = duration_ns / 1000.0
+            else:
+                event['s'] = 't'
+            trace_events.append(event)
+        for thread_id in seen_threads:
+            trace_events.append({
+                'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': thread_id,
+                'args': {'name': thread_names.get(thread_id, str(thread_id))},
+            })
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def export_chrome_trace(self, path):
+        """Write the trace to path as Chrome trace-event JSON."""
+        from config.atomic_io import atomic_write_text
+        atomic_write_text(path, json.dumps(self.to_chrome_trace()))
+        return path
+
+
+tracer = Tracer()
@@ -1,6 +1,10 @@
+# Imported first so trace timestamps start at process start
+from diagnostics.tracing import tracer
+
 import sys
-import json
-import yaml
+import time
+import argparse
+import threading
 from pathlib import Path
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout,
                            QWidget, QPushButton, QStackedWidget, QLabel, QMessageBox, QSystemTrayIcon, QMenu)
@@ -8,22 +12,39 @@ from PyQt6.QtCore import Qt, pyqtSignal, QObject, QSize
 from PyQt6.QtGui import QIcon, QAction
 from widgets.connection_panel import ConnectionPanel
 from widgets.dashboard import Dashboard
-from config.settings import load_settings, save_settings
-
-import paho.mqtt.client as mqtt
-import ssl
+from config.settings import load_settings, save_settings, get_store
+from widgets.trace_panel import TracePanel
+from widgets.diagnostics_panel import DiagnosticsPanel, EventLoopLagMonitor
+from diagnostics.metrics import metrics
+from widgets.payload_codecs import CodecRegistry, topic_matches
+from widgets import mqtt5
+from widgets.virtual_topics import VirtualTopicEngine
+from widgets.alarms import get_alarm_engine, CRITICAL, SEVERITY_NAMES
+from diagnostics.profiler import profiler, DEFAULT_DURATION as PROFILE_DURATION
+
+# paho-mqtt is imported on first connect so it stays off the startup path
+mqtt = None
+
+def _load_paho():
+    global mqtt
+    if mqtt is None:
+        import paho.mqtt.client as paho_client
+        mqtt = paho_client
+    return mqtt
+
+DEFAULT_BROKER = "default"  # the connection configured on the Settings page
 
 class MQTTClient(QObject):
-    message_received = pyqtSignal(str, str)  # topic, message
+    # topic, decoded payload (str unless a codec says otherwise), and the subscribed filters this
+    # delivery is for when the broker names them (MQTT 5 subscription ids), else None
+    message_received = pyqtSignal(str, object, object)
     connection_status = pyqtSignal(bool, str)  # connected, message
 
-    def __init__(self):
+    def __init__(self, name=DEFAULT_BROKER):
         super().__init__()
-        # Create MQTT client with MQTT v5 protocol
-        self.client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
-        self.client.on_connect = self.on_connect
-        self.client.on_message = self.on_message
-        self.client.on_disconnect = self.on_disconnect
+        self.name = name
+        # The paho client is created in connect()
+        self.client = None
         self.connected = False
         self.broker = ""
         self.port = 1883
@@ -31,6 +52,35 @@ class MQTTClient(QObject):
         self.password = ""
         self.ssl_enabled = False
         self.subscribed_topics = set()  # Initialize subscribed_topics set
+        self._subscription_refs = {}  # topic -> subscribe() calls not yet undone by unsubscribe()
+        # topic filter -> {callback: None}; messages are only handed to the listeners of their topic
+        # and of the wildcard filters it matches
+        self._listeners = {}
+        self._wildcard_filters = set()
+        self._filters_for_topic = {}  # topic -> matching wildcard filters (deliveries without subscription ids)
+        # Reconnect policy: paho's loop thread retries with a backoff between these (seconds)
+        self.reconnect_delay = (1, 120)
+        # "thread": paho's loop_start() thread; "qt": sockets driven by the Qt event loop
+        self.transport = "thread"
+        self._qt_loop = None
+        # MQTT 5 (see widgets.mqtt5): our limits, the broker's from the CONNACK, aliases and subscription ids
+        self.mqtt_version = 4
+        self.receive_maximum = 0
+        self.maximum_packet_size = 0
+        self.negotiated = {}
+        self._inflight_limits = {}  # (broker, port) -> in-flight QoS 1/2 limit from its last CONNACK
+        self._topic_aliases = mqtt5.TopicAliases()
+        self._subscription_ids = None
+        self.codecs = CodecRegistry()
+        # Topics computed from other topics; results arrive as ordinary messages
+        self.virtual_topics = VirtualTopicEngine(self._publish_virtual)
+        self._connect_started = None
+        # mid -> perf_counter() at publish(), for the publish latency histogram
+        self._pending_publishes = {}
+        self._early_publishes = {}  # mid -> completion time, when on_publish won the race
+        self._publish_lock = threading.Lock()
+        # Connected first, so it runs on the GUI thread before any widget handler
+        self.message_received.connect(self._on_dispatched)
 
     def on_connect(self, client, userdata, flags, reason_code, properties):
         rc_messages = {
@@ -43,32 +93,40 @@ class MQTTClient(QObject):
         }
         
         # Convert reason_code to int if it's not already
+        reason_name = str(reason_code)
         if hasattr(reason_code, 'value'):
             reason_code = reason_code.value
-            
+
+        connect_ms = (time.perf_counter() - self._connect_started) * 1000 if self._connect_started else 0
+        tracer.instant("mqtt.on_connect", reason_code=reason_code, since_connect_ms=round(connect_ms, 1))
         print(f"Connection result: {reason_code} - {rc_messages.get(reason_code, 'Unknown error')}")
         
         if reason_code == 0:
+            if self.mqtt_version == 5:
+                self._apply_negotiated_limits(properties)
             self.connected = True
+            metrics.record_connect()
             status_msg = f"Connected to {self.broker}:{self.port}"
             if self.ssl_enabled:
                 status_msg += " (SSL/TLS)"
             self.connection_status.emit(True, status_msg)
             
-            # Resubscribe to any topics if needed
-            for topic in self.subscribed_topics:
+            # Resubscribe to any topics if needed (plus the inputs of virtual topics)
+            for topic in self.subscribed_topics | self.virtual_topics.input_patterns():
                 print(f"Resubscribing to topic: {topic}")
-                result, mid = self.client.subscribe(topic)
+                result, mid = self._subscribe_on_broker(topic)
                 if result != 0:
                     print(f"Failed to resubscribe to {topic}: {result}")
         else:
             self.connected = False
-            error_msg = rc_messages.get(reason_code, f"Connection failed with code {reason_code}")
+            error_msg = rc_messages.get(reason_code) if reason_code < 128 else reason_name
+            error_msg = error_msg or f"Connection failed with code {reason_code}"
             self.connection_status.emit(False, f"Error: {error_msg}")
             print(f"MQTT Connection Error: {error_msg} (Code: {reason_code})")
 
     def on_disconnect(self, client, userdata, disconnect_flags, reason_code, properties=None):
         self.connected = False
+        metrics.record_disconnect()
         # Convert reason_code to int if it's an enum
         if hasattr(reason_code, 'value'):
             reason_code = reason_code.value
@@ -86,14 +144,113 @@ class MQTTClient(QObject):
     def on_message(self, client, userdata, msg):
         try:
             topic = msg.topic
-            payload = msg.payload.decode()
+            metrics.record_message(topic, len(msg.payload))
+            payload = self.codecs.decode(topic, msg.payload)
+            filters = None
+            if self._subscription_ids is not None and msg.properties:
+                subscription_ids = getattr(msg.properties, 'SubscriptionIdentifier', None)
+                if subscription_ids:
+                    # Brokers may send one copy per matching subscription, each with its own ids:
+                    # this copy is only for the filters it names (not for everything the topic matches)
+                    filters = self._subscription_ids.filters_for(subscription_ids)
+            tracer.mark_once("mqtt.first_message", "mqtt.first_message", topic=topic)
             print(f"[DEBUG] Received message - Topic: {topic}, Payload: {payload}")
-            self.message_received.emit(topic, payload)
+            self.message_received.emit(topic, payload, filters)
+            if filters is None or self.virtual_topics.reads_any(filters):
+                self.virtual_topics.push(topic, payload)
         except Exception as e:
+            metrics.record_dropped(msg.topic)
             print(f"[ERROR] Error in on_message: {str(e)}")
             print(f"[DEBUG] Message details - Topic: {msg.topic}, Payload: {msg.payload}")
 
+    def _publish_virtual(self, topic, value):
+        # Called on the virtual-topics worker thread; the signal is queued to the GUI thread
+        metrics.record_message(topic, 0)
+        self.message_received.emit(topic, value, None)
+
+    def set_virtual_topics(self, definitions):
+        """Replace the virtual topic definitions ({topic: expression}); returns {topic: error}"""
+        old_inputs = self.virtual_topics.input_patterns()
+        errors = self.virtual_topics.set_definitions(definitions)
+        if self.connected:
+            new_inputs = self.virtual_topics.input_patterns()
+            for topic in new_inputs - old_inputs - self.subscribed_topics:
+                self._subscribe_on_broker(topic)
+            # Inputs of removed or replaced definitions that no widget subscribes to
+            for topic in old_inputs - new_inputs - self.subscribed_topics:
+                try:
+                    self.client.unsubscribe(topic)
+                except Exception as e:
+                    print(f"Unsubscribe error: {e}")
+        return errors
+
+    def _on_dispatched(self, topic, message, filters=None):
+        metrics.record_dispatched()
+        if filters is not None:
+            # The listeners of the subscriptions named by the delivery's ids, exact topics included
+            if len(filters) == 1:
+                listeners = self._listeners.get(filters[0])
+            else:
+                listeners = {}
+                for topic_filter in filters:
+                    listeners.update(self._listeners.get(topic_filter, {}))
+        else:
+            # No ids (MQTT 3.1.1, or a subscription without one): the topic's own listeners and
+            # those of every wildcard filter it matches
+            listeners = self._listeners.get(topic)
+            if self._wildcard_filters:
+                filters = self._filters_for_topic.get(topic)
+                if filters is None:
+                    filters = self._filters_for_topic[topic] = tuple(
+                        f for f in self._wildcard_filters if topic_matches(f, topic))
+                if filters:
+                    listeners = dict(listeners or {})
+                    for topic_filter in filters:
+                        listeners.update(self._listeners.get(topic_filter, {}))
+        if not listeners:
+            return
+        for callback in tuple(listeners):
+            try:
+                callback(topic, message)
+            except Exception as e:
+                print(f"[ERROR] Message handler for {topic} failed: {e}")
+
+    def add_listener(self, topic, callback):
+        """Call callback(topic, message) on the GUI thread for every message on topic
+        (a topic filter: + and # wildcards are allowed)"""
+        self._listeners.setdefault(topic, {})[callback] = None
+        if ('+' in topic or '#' in topic) and topic not in self._wildcard_filters:
+            self._wildcard_filters.add(topic)
+            self._filters_for_topic = {}
+
+    def remove_listener(self, callback, topic=None):
+        """Stop calling callback, for one topic or for all of them"""
+        for key in [topic] if topic is not None else list(self._listeners):
+            listeners = self._listeners.get(key)
+            if listeners is not None:
+                listeners.pop(callback, None)
+                if not listeners:
+                    del self._listeners[key]
+                    if key in self._wildcard_filters:
+                        self._wildcard_filters.discard(key)
+                        self._filters_for_topic = {}
+
+    def on_publish(self, client, userdata, mid, reason_code=None, properties=None):
+        # Runs on the network thread; it can beat publish() to the bookkeeping
+        now = time.perf_counter()
+        with self._publish_lock:
+            started = self._pending_publishes.pop(mid, None)
+            if started is None:
+                self._early_publishes[mid] = now
+                return
+        metrics.record_publish_latency(now - started)
+
     def connect(self, broker, port, username="", password="", use_ssl=False):
+        self._connect_started = time.perf_counter()
+        with tracer.span("MQTTClient.connect", broker=broker, port=port):
+            self._connect(broker, port, username, password, use_ssl)
+
+    def _connect(self, broker, port, username, password, use_ssl):
         try:
             print("\n" + "="*50)
             print(f"[DEBUG] Starting MQTT connection to {broker}:{port}")
@@ -108,10 +265,28 @@ class MQTTClient(QObject):
             
             # Reset client to clear any previous state
             print("[DEBUG] Initializing new MQTT client...")
-            self.client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
+            _load_paho()
+            if self.client is not None:
+                try:
+                    self._stop_network_loop()
+                except Exception:
+                    pass
+            if self.mqtt_version == 5:
+                self.client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2, protocol=mqtt.MQTTv5)
+                self.client.max_inflight_messages_set(self._inflight_limits.get((broker, port), mqtt5.DEFAULT_INFLIGHT))
+            else:
+                self.client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
+            self.negotiated = {}
+            connect_properties = (mqtt5.connect_properties(self.receive_maximum, self.maximum_packet_size)
+                                  if self.mqtt_version == 5 else None)
             self.client.on_connect = self.on_connect
             self.client.on_message = self.on_message
             self.client.on_disconnect = self.on_disconnect
+            self.client.on_publish = self.on_publish
+            self.client.reconnect_delay_set(*self.reconnect_delay)
+            with self._publish_lock:
+                self._pending_publishes.clear()
+                self._early_publishes.clear()
             
             # Enable debug logging
             self.client.enable_logger()
@@ -125,6 +300,7 @@ class MQTTClient(QObject):
             if use_ssl:
                 print("[DEBUG] Configuring SSL/TLS...")
                 try:
+                    import ssl
                     self.client.tls_set(cert_reqs=ssl.CERT_NONE)  # For self-signed certificates
                     self.client.tls_insecure_set(True)  # Only for testing with self-signed certs
                     print("[DEBUG] SSL/TLS configured")
@@ -141,24 +317,21 @@ class MQTTClient(QObject):
             print(f"[DEBUG] Initiating connection to {broker}:{port}...")
             try:
                 print(f"[DEBUG] Using MQTT protocol version: {mqtt.CallbackAPIVersion.VERSION2}")
-                self.client.connect_async(broker, int(port), 60)
-                print("[DEBUG] Starting network loop...")
-                self.client.loop_start()
-                print("[DEBUG] Connection attempt initiated")
-                
-                # Keep the connection alive
-                import time
-                time.sleep(1)  # Give it a moment to connect
-                
-                if not hasattr(self, 'connected') or not self.connected:
-                    print("[DEBUG] Connection not yet established, waiting...")
-                    time.sleep(2)  # Wait a bit longer
-                
-                if hasattr(self, 'connected') and self.connected:
-                    print("[DEBUG] Successfully connected to MQTT broker")
+                if self.transport == "qt":
+                    from widgets.mqtt_transport import QtSocketLoop
+                    print("[DEBUG] Using the Qt event loop transport...")
+                    self._qt_loop = QtSocketLoop(self.client, self.reconnect_delay,
+                                                 on_error=lambda message: self.connection_status.emit(False, message),
+                                                 parent=self)
+                    self._qt_loop.connect(broker, int(port), 60, properties=connect_properties)
                 else:
-                    print("[WARNING] Connection may not have been established successfully")
-                    
+                    self.client.connect_async(broker, int(port), 60, properties=connect_properties)
+                    print("[DEBUG] Starting network loop...")
+                    self.client.loop_start()
+                # Don't block the GUI thread waiting for the broker: on_connect reports
+                # the outcome through connection_status and resubscribes all topics.
+                print("[DEBUG] Connection attempt initiated")
+
             except ValueError as ve:
                 error_msg = f"[ERROR] Invalid port number: {port} - {str(ve)}"
                 print(error_msg)
@@ -186,38 +359,246 @@ class MQTTClient(QObject):
 
     def disconnect(self):
         try:
-            self.client.loop_stop()
-            self.client.disconnect()
+            if self.client is None:
+                self.connected = False
+                self.connection_status.emit(False, "Disconnected")
+                return
+            if self._qt_loop is not None:
+                self._stop_network_loop()  # also sends DISCONNECT
+            else:
+                self.client.loop_stop()
+                self.client.disconnect()
             self.connected = False
             self.connection_status.emit(False, "Disconnected")
         except Exception as e:
             self.connection_status.emit(False, f"Error disconnecting: {str(e)}")
 
+    def _stop_network_loop(self):
+        if self._qt_loop is not None:
+            self._qt_loop.stop()
+            self._qt_loop.deleteLater()
+            self._qt_loop = None
+        else:
+            self.client.loop_stop()
+
     def publish(self, topic, message, qos=0, retain=False):
         if not self.connected:
             return False
         try:
-            result = self.client.publish(topic, message, qos=qos, retain=retain)
+            started = time.perf_counter()
+            if self.negotiated:
+                result = self._publish_v5(topic, message, qos, retain)
+                if result is None:
+                    return False
+            else:
+                result = self.client.publish(topic, message, qos=qos, retain=retain)
+            if result.rc == mqtt.MQTT_ERR_SUCCESS:
+                with self._publish_lock:
+                    finished = self._early_publishes.pop(result.mid, None)
+                    if finished is None:
+                        self._pending_publishes[result.mid] = started
+                if finished is not None:
+                    metrics.record_publish_latency(finished - started)
             return result.rc == mqtt.MQTT_ERR_SUCCESS
         except Exception as e:
             print(f"Publish error: {e}")
             return False
 
     def subscribe(self, topic, qos=0):
+        # Remember the topic even while offline; on_connect subscribes everything
+        # in subscribed_topics, so widgets created before the connection is up
+        # start receiving values as soon as it is.
+        if self.virtual_topics.is_virtual(topic):
+            # Nothing to subscribe at the broker; hand the widget the current value
+            value = self.virtual_topics.current(topic)
+            if value is not None:
+                from PyQt6.QtCore import QTimer
+                QTimer.singleShot(0, lambda: self._publish_virtual(topic, value))
+            return True
+        self._subscription_refs[topic] = self._subscription_refs.get(topic, 0) + 1
+        self.subscribed_topics.add(topic)
         if not self.connected:
             return False
         try:
-            result, mid = self.client.subscribe(topic, qos)
+            result, mid = self._subscribe_on_broker(topic, qos)
             if result == mqtt.MQTT_ERR_SUCCESS:
-                if not hasattr(self, 'subscribed_topics'):
-                    self.subscribed_topics = set()
-                self.subscribed_topics.add(topic)
                 return True
             return False
         except Exception as e:
             print(f"Subscribe error: {e}")
             return False
 
+    def unsubscribe(self, topic):
+        """Undo one subscribe(topic); the broker subscription ends with the last one"""
+        count = self._subscription_refs.get(topic, 0) - 1
+        if count > 0:
+            self._subscription_refs[topic] = count
+            return
+        self._subscription_refs.pop(topic, None)
+        if topic not in self.subscribed_topics:
+            return
+        self.subscribed_topics.discard(topic)
+        if topic in self.virtual_topics.input_patterns() or not self.connected:
+            return
+        try:
+            self.client.unsubscribe(topic)
+        except Exception as e:
+            print(f"Unsubscribe error: {e}")
+
+    # --- MQTT 5 -----------------------------------------------------------
+
+    def set_protocol(self, options):
+        """Protocol options from a settings dict (Settings page or a 'brokers' entry); used from the next connect"""
+        self.mqtt_version = 5 if int(options.get('mqtt_version', 4)) == 5 else 4
+        self.receive_maximum = int(options.get('receive_maximum', 0) or 0)
+        self.maximum_packet_size = int(options.get('maximum_packet_size', 0) or 0)
+
+    def _apply_negotiated_limits(self, properties):
+        # Network thread, before connected is set and connection_status is emitted
+        limits = mqtt5.negotiated_limits(properties)
+        # Never have more QoS 1/2 publishes in flight than the broker accepts. paho only takes
+        # the limit before connecting, so a lower one applies from the next client on.
+        inflight = min(mqtt5.DEFAULT_INFLIGHT, limits['ReceiveMaximum'])
+        if inflight < self.client.max_inflight_messages:
+            print(f"[DEBUG] Broker receive maximum is {inflight}; in-flight QoS 1/2 publishes are capped from the next connect")
+        self._inflight_limits[(self.broker, self.port)] = inflight
+        self._topic_aliases = mqtt5.TopicAliases(limits['TopicAliasMaximum'])
+        self._subscription_ids = mqtt5.SubscriptionIds() if limits['SubscriptionIdentifierAvailable'] else None
+        self._filters_for_topic = {}
+        self.negotiated = limits
+        print(f"[DEBUG] {mqtt5.describe_limits(limits, self.receive_maximum, self.maximum_packet_size)}")
+
+    def _subscribe_on_broker(self, topic, qos=0):
+        if self._subscription_ids is not None and self.negotiated:
+            subscription_id = self._subscription_ids.id_for(topic)
+            if subscription_id is not None:
+                return self.client.subscribe(topic, qos, properties=mqtt5.subscribe_properties(subscription_id))
+        return self.client.subscribe(topic, qos)
+
+    def _publish_v5(self, topic, message, qos, retain):
+        """Publish with the broker's limits applied; None if the message can't be sent"""
+        if isinstance(message, (int, float)):
+            message = str(message)
+        payload = message.encode('utf-8') if isinstance(message, str) else message
+        payload = b"" if payload is None else payload
+        limit = self.negotiated['MaximumPacketSize']
+        if limit and mqtt5.packet_size(topic, payload, qos) > limit:
+            print(f"[ERROR] Not publishing to {topic}: {len(payload)} bytes is over the broker's maximum packet size ({limit})")
+            return None
+        qos = min(qos, self.negotiated['MaximumQoS'])
+        if qos or retain:
+            # Aliases are only used for QoS 0, non-retained traffic (the frequent, disposable kind)
+            return self.client.publish(topic, payload, qos=qos, retain=retain)
+        send_topic, alias = self._topic_aliases.resolve(topic)
+        if alias is None:
+            return self.client.publish(topic, payload)
+        result = self.client.publish(send_topic, payload, properties=mqtt5.publish_properties(alias))
+        if result.rc != mqtt.MQTT_ERR_SUCCESS and send_topic:
+            self._topic_aliases.forget(topic)
+        return result
+
+class ConnectionPool(QObject):
+    """
+    Named broker connections, each an MQTTClient with its own paho network thread.
+
+    "default" is the connection configured on the Settings page; more come from
+    the 'brokers' setting:
+
+        "brokers": [
+            {"name": "energy", "broker": "10.0.0.5", "port": 1883, "username": "", "password": "",
+             "use_ssl": false, "auto_connect": true, "reconnect_min": 1, "reconnect_max": 60,
+             "transport": "qt", "mqtt_version": 5, "receive_maximum": 100, "maximum_packet_size": 1048576}
+        ]
+
+    Layout entries pick a connection with "broker": "<name>".
+    """
+    status_changed = pyqtSignal(str, bool, str)  # connection name, connected, message
+
+    def __init__(self):
+        super().__init__()
+        self.connections = {}
+        self.configs = {}  # name -> 'brokers' entry, for the connections from settings
+        self.codec_rules = []
+        self.default = self._create(DEFAULT_BROKER)
+
+    def _create(self, name):
+        client = MQTTClient(name)
+        client.codecs.set_rules(self.codec_rules)
+        client.connection_status.connect(lambda connected, message, name=name: self.status_changed.emit(name, connected, message))
+        self.connections[name] = client
+        return client
+
+    def __iter__(self):
+        return iter(list(self.connections.values()))
+
+    def get(self, name=None):
+        """The connection called name (the default one for None or "")"""
+        if not name or name == DEFAULT_BROKER:
+            return self.default
+        client = self.connections.get(name)
+        if client is None:
+            # Widgets bound to it stay idle until a broker of that name is configured
+            print(f"[ERROR] Unknown broker '{name}', add it to the 'brokers' setting")
+            client = self._create(name)
+        return client
+
+    def configure(self, entries):
+        """Apply the 'brokers' setting. Returns the names whose entry is new or changed."""
+        wanted = {}
+        for entry in entries or []:
+            name = entry.get('name')
+            if not name or name == DEFAULT_BROKER or not entry.get('broker'):
+                print(f"[ERROR] Ignoring broker entry {entry}: needs a broker and a name other than '{DEFAULT_BROKER}'")
+                continue
+            wanted[name] = entry
+        for name in [name for name in self.configs if name not in wanted]:
+            print(f"[DEBUG] Broker '{name}' was removed from the settings, disconnecting")
+            del self.configs[name]
+            self.connections[name].disconnect()
+        changed = []
+        for name, entry in wanted.items():
+            client = self.connections.get(name) or self._create(name)
+            client.reconnect_delay = (int(entry.get('reconnect_min', 1)), int(entry.get('reconnect_max', 120)))
+            client.transport = entry.get('transport', 'thread')
+            client.set_protocol(entry)
+            if self.configs.get(name) != entry:
+                changed.append(name)
+            self.configs[name] = dict(entry)
+        return changed
+
+    def connect(self, name):
+        """(Re)connect a connection from the 'brokers' setting"""
+        entry = self.configs[name]
+        try:
+            self.connections[name].connect(entry['broker'], int(entry.get('port', 1883)),
+                                           entry.get('username', ''), entry.get('password', ''),
+                                           entry.get('use_ssl', False))
+        except (ValueError, TypeError) as e:
+            print(f"[ERROR] Invalid settings for broker '{name}': {e}")
+
+    def auto_connect(self, names=None):
+        for name in self.configs if names is None else names:
+            if self.configs[name].get('auto_connect', True):
+                self.connect(name)
+
+    def set_codec_rules(self, rules):
+        self.codec_rules = rules
+        for client in self:
+            client.codecs.set_rules(rules)
+
+    def health(self):
+        """(connected, total) over the connections in use"""
+        in_use = [client for name, client in self.connections.items()
+                  if name in self.configs or (name == DEFAULT_BROKER and client.broker)]
+        return sum(1 for client in in_use if client.connected), len(in_use)
+
+    def disconnect_all(self):
+        for client in self:
+            client.virtual_topics.stop()
+            if client.connected:
+                print(f"Disconnecting {client.name} normally")
+                client.disconnect()
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -233,23 +614,157 @@ class MainWindow(QMainWindow):
         if os.path.exists(icon_path):
             self.setWindowIcon(QIcon(icon_path))
 
-        self.mqtt = MQTTClient()
-        self.settings = load_settings()
+        # One connection per broker; self.mqtt is the default one (Settings page)
+        self.connections = ConnectionPool()
+        self.mqtt = self.connections.default
+        with tracer.span("settings.load"):
+            self.settings = load_settings()
         print(f"[DEBUG] Initial settings loaded: {self.settings}")
-        self.init_ui()
+        self.mqtt.transport = self.settings.get('mqtt_transport', 'thread')
+        self.mqtt.set_protocol(self.settings)
+        self.connections.configure(self.settings.get('brokers', []))
+        self.connections.set_codec_rules(self.settings.get('payload_codecs', []))
+        self.mqtt.set_virtual_topics(self.settings.get('virtual_topics', {}))
+        self.alarms = get_alarm_engine()
+        self._alarm_subscriptions = set()  # (broker, topic) subscribed by load_alarm_points
+        self.load_alarm_points(self.settings.get('alarms', []))
+        # Keep our copy in step with changes made elsewhere (e.g. custom themes)
+        get_store().add_listener(self.on_settings_changed)
+        with tracer.span("MainWindow.init_ui"):
+            self.init_ui()
         self.setup_connections()
-        self.setup_system_tray()
+        with tracer.span("MainWindow.setup_system_tray"):
+            self.setup_system_tray()
+        self._startup_done = False
+        self.exit_after_startup = False
+        self.metrics_exporter = None
+        if self.settings.get('metrics_port'):
+            self.start_metrics_exporter(int(self.settings['metrics_port']))
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self._startup_done:
+            self._startup_done = True
+            # Run right after the first paint instead of on fixed timers: the layout
+            # doesn't depend on the connection (subscriptions are replayed on connect),
+            # so widgets appear immediately and values stream in once the broker is up.
+            from PyQt6.QtCore import QTimer
+            QTimer.singleShot(0, self._on_first_show)
+
+    def _on_first_show(self):
+        """Start the connection and load the startup layout once the window is visible"""
         self.attempt_auto_connect()
-        # Delay startup layout loading more to ensure everything is ready
-        from PyQt6.QtCore import QTimer
-        QTimer.singleShot(2000, self.load_startup_layout)
-        
+        with tracer.span("startup.load_layout"):
+            self.load_startup_layout()
+        tracer.instant("startup.ready")
+        print(f"[STARTUP] Ready after {tracer.elapsed_ms():.0f} ms")
+        if self.exit_after_startup:
+            QApplication.quit()
+
+    def on_settings_changed(self, changed, removed):
+        """Merge settings changed (or removed) through the shared store into self.settings"""
+        for key in removed:
+            self.settings.pop(key, None)
+        self.settings.update(changed)
+        keys = changed.keys() | set(removed)
+        if 'mqtt_transport' in keys:
+            # Used from the next (re)connect on
+            self.mqtt.transport = self.settings.get('mqtt_transport', 'thread')
+        if 'brokers' in keys:
+            self.connections.auto_connect(self.connections.configure(self.settings.get('brokers', [])))
+        if 'payload_codecs' in keys:
+            self.connections.set_codec_rules(self.settings.get('payload_codecs', []))
+        if 'virtual_topics' in keys:
+            self.mqtt.set_virtual_topics(self.settings.get('virtual_topics', {}))
+        if 'alarms' in keys:
+            self.load_alarm_points(self.settings.get('alarms', []))
+        if 'max_live_pages' in keys:
+            self.dashboard.max_live_pages = int(self.settings.get('max_live_pages', 3))
+        if 'canvas_backend' in keys:
+            # Used from the next time presentation mode is entered
+            self.dashboard.canvas_backend = self.settings.get('canvas_backend', 'widgets')
+        if 'tile_mode' in keys:
+            # Used for widgets created from now on (e.g. the next layout loaded)
+            self.dashboard.tile_mode = self.settings.get('tile_mode', 'full')
+
+    def start_metrics_exporter(self, port):
+        """Serve runtime counters on http://127.0.0.1:<port>/metrics (and /metrics.json)"""
+        if self.metrics_exporter is not None:
+            return
+        from diagnostics.exporter import MetricsExporter
+        # len() of the widget lists is safe to read from the exporter thread
+        gauges = {'widgets': lambda: self.dashboard.live_widget_count(),
+                  'brokers_connected': lambda: self.connections.health()[0]}
+        try:
+            self.metrics_exporter = MetricsExporter(port, gauges=gauges)
+            self.metrics_exporter.start()
+        except OSError as e:
+            self.metrics_exporter = None
+            print(f"[ERROR] Could not start metrics endpoint on port {port}: {e}")
+
+    def load_alarm_points(self, entries):
+        """Register alarms from settings, for topics that don't need a widget:
+        [{"topic": ..., "low": ..., "high": ..., "name", "broker", "hysteresis", "delay_on", "delay_off", ...}]
+        A point holds one value, so topic can't have wildcards."""
+        wanted = set()
+        subscriptions = set()
+        for entry in entries:
+            topic = entry.get('topic')
+            if not topic:
+                continue
+            if '+' in topic or '#' in topic:
+                print(f"[ERROR] Ignoring alarm entry {entry}: the topic can't have wildcards")
+                continue
+            broker = entry.get('broker') or DEFAULT_BROKER
+            key = f"setting-{broker}-{topic}-{entry.get('name', '')}"
+            wanted.add(key)
+            options = {k: entry[k] for k in ('low_warning', 'high_warning', 'hysteresis', 'delay_on', 'delay_off')
+                       if k in entry}
+            try:
+                self.alarms.register(key, entry.get('name') or topic, entry.get('low', float('-inf')),
+                                     entry.get('high', float('inf')), topic=topic, broker=broker, **options)
+            except (ValueError, TypeError) as e:
+                print(f"[ERROR] Invalid alarm entry {entry}: {e}")
+                continue
+            subscriptions.add((broker, topic))
+        # subscribe() is reference counted: only once per (broker, topic), undone when it drops out
+        for broker, topic in subscriptions - self._alarm_subscriptions:
+            client = self.connections.get(broker)
+            client.subscribe(topic)
+            client.add_listener(topic, self.alarms.listener(broker))
+        for broker, topic in self._alarm_subscriptions - subscriptions:
+            client = self.connections.get(broker)
+            client.remove_listener(self.alarms.listener(broker), topic)
+            client.unsubscribe(topic)
+        self._alarm_subscriptions = subscriptions
+        for key in [k for k in self.alarms.names if k.startswith("setting-") and k not in wanted]:
+            self.alarms.unregister(key)
+
+    def on_alarms_raised(self, raised):
+        """Tray notification for alarms that became active or more severe"""
+        if not hasattr(self, 'tray_icon'):
+            return
+        lines = [f"{name}: {SEVERITY_NAMES[severity]} ({value:g})" for name, severity, value in raised[:5]]
+        if len(raised) > 5:
+            lines.append(f"... og {len(raised) - 5} til")
+        icon = (QSystemTrayIcon.MessageIcon.Critical if any(s == CRITICAL for _, s, _ in raised)
+                else QSystemTrayIcon.MessageIcon.Warning)
+        self.tray_icon.showMessage("MQTT Dashboard - Alarm", "\n".join(lines), icon, 5000)
+
+    def update_alarm_status(self, keys=None):
+        unacknowledged = sum(1 for *_, acknowledged in self.alarms.active_alarms() if not acknowledged)
+        if hasattr(self, 'tray_icon'):
+            self.tray_icon.setToolTip(f"MQTT Dashboard - {unacknowledged} ukvitterte alarmer"
+                                      if unacknowledged else "MQTT Dashboard")
+        if hasattr(self, 'ack_alarms_action'):
+            self.ack_alarms_action.setEnabled(unacknowledged > 0)
+
     def attempt_auto_connect(self):
         """Attempt to connect automatically if settings allow"""
         if self.settings.get('auto_connect', False):
-            # Small delay to ensure UI is fully loaded
-            from PyQt6.QtCore import QTimer
-            QTimer.singleShot(500, self._perform_auto_connect)
+            self._perform_auto_connect()
+        # Brokers from the 'brokers' setting have their own auto_connect flag
+        self.connections.auto_connect()
             
     def _perform_auto_connect(self):
         """Perform the actual auto-connection"""
@@ -262,6 +777,7 @@ class MainWindow(QMainWindow):
                 'use_ssl': self.settings.get('use_ssl', False)
             }
             if settings['broker']:  # Only try to connect if we have a broker address
+                self.mqtt.set_protocol(self.settings)
                 self.mqtt.connect(**settings)
         except Exception as e:
             print(f"Auto-connect failed: {e}")
@@ -296,6 +812,20 @@ class MainWindow(QMainWindow):
         # Settings button
         self.btn_settings = QPushButton("󰒓 Settings")
         self.btn_settings.setCheckable(True)
+
+        # Startup/connection trace page
+        self.btn_trace = QPushButton("⏱ Trace")
+        self.btn_trace.setCheckable(True)
+
+        # Live runtime metrics page
+        self.btn_diagnostics = QPushButton("📊 Diagnostics")
+        self.btn_diagnostics.setCheckable(True)
+
+        # Topic explorer side panel (next to whichever page is shown)
+        self.btn_topics = QPushButton("🌳 Topics")
+        self.btn_topics.setCheckable(True)
+        self.btn_topics.clicked.connect(self.toggle_topic_explorer)
+        self.topic_explorer = None
         
         # Layout selection button
         self.btn_select_layout = QPushButton("📂 Select Startup Layout")
@@ -309,6 +839,9 @@ class MainWindow(QMainWindow):
         # Add buttons to sidebar
         self.sidebar_layout.addWidget(self.btn_dashboard)
         self.sidebar_layout.addWidget(self.btn_settings)
+        self.sidebar_layout.addWidget(self.btn_trace)
+        self.sidebar_layout.addWidget(self.btn_diagnostics)
+        self.sidebar_layout.addWidget(self.btn_topics)
         self.sidebar_layout.addStretch(1)
         self.sidebar_layout.addWidget(self.btn_select_layout)
         self.sidebar_layout.addWidget(self.btn_presentation)
@@ -317,12 +850,23 @@ class MainWindow(QMainWindow):
         self.stacked_widget = QStackedWidget()
         
         # Create pages
-        self.dashboard = Dashboard(self.mqtt)
+        self.dashboard = Dashboard(self.connections)
+        self.dashboard.max_live_pages = int(self.settings.get('max_live_pages', 3))
+        self.dashboard.canvas_backend = self.settings.get('canvas_backend', 'widgets')
+        self.dashboard.tile_mode = self.settings.get('tile_mode', 'full')
         self.settings_panel = ConnectionPanel(self.mqtt, self.settings)
         
         # Add pages to stacked widget
         self.stacked_widget.addWidget(self.dashboard)
         self.stacked_widget.addWidget(self.settings_panel)
+        self.trace_panel = TracePanel()
+        self.stacked_widget.addWidget(self.trace_panel)
+        self.diagnostics_panel = DiagnosticsPanel(self.dashboard)
+        self.stacked_widget.addWidget(self.diagnostics_panel)
+
+        # Always-on event-loop lag sampling (one cheap timer tick every 250 ms)
+        self.loop_lag_monitor = EventLoopLagMonitor(parent=self)
+        self.loop_lag_monitor.start()
         
         # Add widgets to main layout
         self.main_layout.addWidget(self.sidebar)
@@ -334,27 +878,31 @@ class MainWindow(QMainWindow):
     def setup_connections(self):
         self.btn_dashboard.clicked.connect(lambda: self.switch_page(0))
         self.btn_settings.clicked.connect(lambda: self.switch_page(1))
-        self.mqtt.connection_status.connect(self.on_connection_status)
+        self.btn_trace.clicked.connect(lambda: self.switch_page(2))
+        self.btn_diagnostics.clicked.connect(lambda: self.switch_page(3))
+        self.connections.status_changed.connect(self.on_connection_status)
         
         # Initialize presentation mode state
         self.presentation_mode = False
         self.opacity_level = 1.0
         
         # Connect the connection panel's signal to the MQTT client's connect method
-        self.settings_panel.connection_requested.connect(
-            lambda settings: self.mqtt.connect(
-                broker=settings['broker'],
-                port=settings['port'],
-                username=settings['username'],
-                password=settings['password'],
-                use_ssl=settings['use_ssl']
-            )
-        )
+        self.settings_panel.connection_requested.connect(self.connect_from_settings_panel)
 
         # Connect opacity and theme signals
         self.settings_panel.opacity_changed.connect(self.set_opacity)
         self.settings_panel.theme_changed.connect(self.apply_theme)
 
+    def connect_from_settings_panel(self, settings):
+        self.mqtt.set_protocol(settings)
+        self.mqtt.connect(
+            broker=settings['broker'],
+            port=settings['port'],
+            username=settings['username'],
+            password=settings['password'],
+            use_ssl=settings['use_ssl']
+        )
+
     def setup_system_tray(self):
         """Setup system tray icon with menu"""
         import os
@@ -399,6 +947,23 @@ class MainWindow(QMainWindow):
 
         tray_menu.addSeparator()
 
+        # Acknowledge all active alarms
+        self.ack_alarms_action = QAction("Kvitter Alle Alarmer", self)
+        self.ack_alarms_action.triggered.connect(lambda: self.alarms.acknowledge())
+        self.ack_alarms_action.setEnabled(False)
+        tray_menu.addAction(self.ack_alarms_action)
+        self.alarms.alarms_raised.connect(self.on_alarms_raised)
+        self.alarms.alarms_changed.connect(self.update_alarm_status)
+
+        tray_menu.addSeparator()
+
+        # Hot-path profiling for a fixed window
+        self.profile_action = QAction(f"Start Profilering ({PROFILE_DURATION} s)", self)
+        self.profile_action.triggered.connect(self.toggle_profiling)
+        tray_menu.addAction(self.profile_action)
+
+        tray_menu.addSeparator()
+
         # Quit action
         quit_action = QAction("Avslutt", self)
         quit_action.triggered.connect(self.quit_application)
@@ -421,6 +986,40 @@ class MainWindow(QMainWindow):
             2000
         )
 
+    def toggle_profiling(self):
+        if profiler.active:
+            self.stop_profiling()
+        else:
+            self.start_profiling(PROFILE_DURATION)
+
+    def start_profiling(self, seconds):
+        """Profile dispatch/format_value/apply_config/paintEvent for the given number of seconds"""
+        from PyQt6.QtCore import QTimer
+        if profiler.active:
+            return
+        profiler.start()
+        if not hasattr(self, 'profile_timer'):
+            self.profile_timer = QTimer(self)
+            self.profile_timer.setSingleShot(True)
+            self.profile_timer.timeout.connect(self.stop_profiling)
+        self.profile_timer.start(int(seconds * 1000))
+        if hasattr(self, 'profile_action'):
+            self.profile_action.setText("Stopp Profilering")
+
+    def stop_profiling(self):
+        if hasattr(self, 'profile_timer'):
+            self.profile_timer.stop()
+        output_dir = profiler.stop()
+        if hasattr(self, 'profile_action'):
+            self.profile_action.setText(f"Start Profilering ({PROFILE_DURATION} s)")
+        if output_dir and hasattr(self, 'tray_icon'):
+            self.tray_icon.showMessage(
+                "MQTT Dashboard",
+                f"Profil lagret i {output_dir}",
+                QSystemTrayIcon.MessageIcon.Information,
+                5000
+            )
+
     def on_tray_icon_activated(self, reason):
         """Handle tray icon click"""
         if reason == QSystemTrayIcon.ActivationReason.Trigger:
@@ -473,16 +1072,36 @@ class MainWindow(QMainWindow):
             'y': geometry.y()
         }
 
+    def toggle_topic_explorer(self, checked):
+        """Show or hide the topic explorer; it is created (and subscribes to '#') on first use"""
+        if self.topic_explorer is None:
+            if not checked:
+                return
+            from widgets.topic_explorer import TopicExplorer
+            self.topic_explorer = TopicExplorer(self.connections)
+            self.topic_explorer.setFixedWidth(320)
+            self.main_layout.addWidget(self.topic_explorer)
+        self.topic_explorer.setVisible(checked)
+
     def switch_page(self, index):
         self.stacked_widget.setCurrentIndex(index)
         self.btn_dashboard.setChecked(index == 0)
         self.btn_settings.setChecked(index == 1)
+        self.btn_trace.setChecked(index == 2)
+        self.btn_diagnostics.setChecked(index == 3)
     
-    def on_connection_status(self, connected, message):
-        status = "Connected" if connected else "Disconnected"
-        self.statusBar().showMessage(f"{status}: {message}")
-        if connected:
+    def on_connection_status(self, name, connected, message):
+        up, total = self.connections.health()
+        if total <= 1:
+            status = "Connected" if connected else "Disconnected"
+            self.statusBar().showMessage(f"{status}: {message}")
+        else:
+            # Aggregate health, plus the event that changed it
+            self.statusBar().showMessage(f"Brokers {up}/{total} connected - {name}: {message}")
+        if total and up == total:
             self.statusBar().setStyleSheet("background-color: #28a745; color: white;")
+        elif up:
+            self.statusBar().setStyleSheet("background-color: #fd7e14; color: white;")
         else:
             self.statusBar().setStyleSheet("background-color: #dc3545; color: white;")
         
@@ -529,14 +1148,11 @@ class MainWindow(QMainWindow):
         startup_layout = self.settings.get('startup_layout', '')
         print(f"[DEBUG] Checking startup layout: {startup_layout}")
         if startup_layout and Path(startup_layout).exists():
-            print(f"[DEBUG] Startup layout file exists, scheduling load: {startup_layout}")
-            from PyQt6.QtCore import QTimer
-            # Delay loading to ensure MQTT connection is established
-            QTimer.singleShot(1000, lambda: self._load_startup_layout_delayed(startup_layout))
+            self._load_startup_layout_file(startup_layout)
         else:
             print(f"[DEBUG] No startup layout configured or file doesn't exist")
     
-    def _load_startup_layout_delayed(self, file_path):
+    def _load_startup_layout_file(self, file_path):
         """Load the startup layout with debug info"""
         print(f"[DEBUG] Loading startup layout: {file_path}")
         try:
@@ -596,8 +1212,10 @@ class MainWindow(QMainWindow):
             # Save absolute screen positions of all widgets before going fullscreen
             self.save_widget_screen_positions()
 
-            # Hide sidebar and statusbar
+            # Hide sidebar, topic explorer and statusbar
             self.sidebar.setFixedWidth(0)
+            if self.topic_explorer is not None:
+                self.topic_explorer.hide()
             self.statusBar().setFixedHeight(0)
             self.setWindowOpacity(self.opacity_level)
 
@@ -634,6 +1252,8 @@ class MainWindow(QMainWindow):
         else:
             # Restore sidebar and statusbar to original size
             self.sidebar.setFixedWidth(200)
+            if self.topic_explorer is not None:
+                self.topic_explorer.setVisible(self.btn_topics.isChecked())
             self.statusBar().setMaximumHeight(16777215)  # Reset to no max height
             self.setWindowOpacity(1.0)
             # NOTE: NEVER remove WA_TranslucentBackground - keep it for future toggles!
@@ -723,7 +1343,8 @@ class MainWindow(QMainWindow):
         scroll_offset_y = self.dashboard.scroll.verticalScrollBar().value()
 
         for widget, positions in self.widget_screen_positions.items():
-            if widget is None or widget.isHidden():
+            # Widgets drawn by the presentation canvas are hidden but still placed
+            if widget is None or (widget.isHidden() and self.dashboard.canvas is None):
                 continue
 
             # Calculate where the widget should be in the container to maintain screen position
@@ -778,20 +1399,28 @@ class MainWindow(QMainWindow):
         apply_theme_to_dashboard(self.dashboard, theme_key)
 
         # Apply theme to all widgets, respecting their individual settings
-        for widget in self.dashboard.widgets:
-            if widget is not None:
-                # Only apply the global theme if the widget is not set to 'custom'
-                if widget.config.get('theme_selector') != 'custom':
-                    theme_config = get_theme_config(theme_key, widget.widget_type)
+        for widget in self.dashboard.live_widgets():
+            # Only apply the global theme if the widget is not set to 'custom'
+            if widget.config.get('theme_selector') != 'custom':
+                theme_config = get_theme_config(theme_key, widget.widget_type)
+                if theme_config:
+                    # We update a copy to avoid modifying the base theme config
+                    new_config = widget.config.copy()
+                    new_config.update(theme_config)
+                    widget.config = new_config
+
+            # Always apply the config, which will be either the theme's 
+            # or the widget's own custom one.
+            widget.apply_config()
+
+        # Pages that are not loaded pick the theme up from their entries
+        for page in self.dashboard.pages:
+            for entry in page.entries:
+                config = entry['config']
+                if config.get('theme_selector') != 'custom':
+                    theme_config = get_theme_config(theme_key, entry['type'])
                     if theme_config:
-                        # We update a copy to avoid modifying the base theme config
-                        new_config = widget.config.copy()
-                        new_config.update(theme_config)
-                        widget.config = new_config
-
-                # Always apply the config, which will be either the theme's 
-                # or the widget's own custom one.
-                widget.apply_config()
+                        config.update(theme_config)
 
     def closeEvent(self, event):
         """Handle window close event - minimize to tray instead of closing"""
@@ -830,24 +1459,62 @@ class MainWindow(QMainWindow):
         print(f"[DEBUG] Saving settings on close: {self.settings}")
         save_settings(self.settings)
 
+        # Flush any pending layout autosave
+        self.dashboard.autosaver.shutdown()
+
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.stop()
+
+        # Write out a profiling run that is still open
+        if profiler.active:
+            self.stop_profiling()
+
         # Disconnect MQTT
-        if self.mqtt.connected:
-            print("Disconnecting normally")
-            self.mqtt.disconnect()
+        self.connections.disconnect_all()
 
         # Hide tray icon
         if hasattr(self, 'tray_icon'):
             self.tray_icon.hide()
 
+def parse_args(argv):
+    """Parse our own command line options, leaving the rest for Qt"""
+    parser = argparse.ArgumentParser(description="MQTT Dashboard")
+    parser.add_argument('--exit-after-startup', action='store_true',
+                        help="Quit as soon as the startup layout is loaded (for startup timing)")
+    parser.add_argument('--trace-out', metavar='FILE',
+                        help="Write a Chrome trace-event JSON file of startup/connection spans on exit")
+    parser.add_argument('--metrics-port', type=int, metavar='PORT',
+                        help="Serve runtime metrics on http://127.0.0.1:PORT/metrics (overrides the metrics_port setting)")
+    parser.add_argument('--profile', type=float, metavar='SECONDS',
+                        help="Profile the dispatch and paint hot paths for SECONDS from startup "
+                             "(pstats and flamegraph files under ~/.config/mqtt-dashboard/profiles)")
+    return parser.parse_known_args(argv[1:])
+
 def main():
-    app = QApplication(sys.argv)
+    args, qt_args = parse_args(sys.argv)
+    with tracer.span("QApplication"):
+        app = QApplication(sys.argv[:1] + qt_args)
     
     # Set application style
     app.setStyle('Fusion')
     
-    window = MainWindow()
-    window.show()
-    sys.exit(app.exec())
+    with tracer.span("MainWindow.__init__"):
+        window = MainWindow()
+    window.exit_after_startup = args.exit_after_startup
+    if args.metrics_port:
+        if window.metrics_exporter is not None:
+            window.metrics_exporter.stop()
+            window.metrics_exporter = None
+        window.start_metrics_exporter(args.metrics_port)
+    if args.profile:
+        window.start_profiling(args.profile)
+    with tracer.span("MainWindow.show"):
+        window.show()
+    result = app.exec()
+    if args.trace_out:
+        tracer.export_chrome_trace(args.trace_out)
+        print(f"Trace written to {args.trace_out}")
+    sys.exit(result)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,89 @@
+"""
+Canvas backends: paint one frame with known tile states and check the pixels.
+
+The OpenGL test needs a context; with Mesa's software renderer that is e.g.
+
+    LIBGL_ALWAYS_SOFTWARE=1 xvfb-run -a env QT_QPA_PLATFORM=xcb python -m pytest tests
+
+Without one (the default offscreen platform has no OpenGL) it is skipped,
+and only the raster canvas is checked.
+
+Usage:
+    python -m pytest tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("LIBGL_ALWAYS_SOFTWARE", "1")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QRect
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import QApplication, QWidget
+
+app = QApplication.instance() or QApplication(sys.argv[:1])
+
+from widgets.canvas import create_canvas, opengl_available, DashboardCanvas
+
+BACKGROUND = 0xFF204080
+BAR = 0xFFFF0000
+
+
+class Tile:
+    """The two things a canvas reads from a dashboard widget"""
+    canvas_drawn = True
+
+    def __init__(self, rect, state):
+        self.rect = QRect(*rect)
+        self.state = state
+
+    def geometry(self):
+        return self.rect
+
+    def canvas_state(self):
+        return self.state
+
+
+def tiles():
+    # (background, radius, kind, title, text, fraction, color, text_color, font_size)
+    return [
+        Tile((0, 0, 100, 100), (BACKGROUND, 0, 'text', '', '', None, 0, 0, 12)),
+        Tile((100, 0, 200, 100), (0, 0, 'linear', '', '', 1.0, BAR, 0, 12)),
+    ]
+
+
+class CanvasPixelsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.page = QWidget()
+        self.page.resize(300, 100)
+
+    def tearDown(self):
+        self.page.deleteLater()
+
+    def check_frame(self, image):
+        self.assertEqual(QColor(image.pixel(50, 50)).rgb(), QColor.fromRgba(BACKGROUND).rgb())
+        self.assertEqual(QColor(image.pixel(200, 50)).rgb(), QColor.fromRgba(BAR).rgb())
+        # Nothing is drawn outside the tiles' shapes: the canvas stays transparent there
+        self.assertEqual(image.pixelColor(200, 5).alpha(), 0)
+
+    def test_raster_canvas(self):
+        canvas = create_canvas('raster', tiles(), self.page)
+        self.assertIsInstance(canvas, DashboardCanvas)
+        canvas.refresh()
+        self.check_frame(canvas.grab().toImage())
+
+    @unittest.skipUnless(opengl_available(), "no OpenGL context available")
+    def test_opengl_canvas(self):
+        canvas = create_canvas('opengl', tiles(), self.page)
+        self.assertNotIsInstance(canvas, DashboardCanvas)
+        self.page.show()
+        canvas.refresh()
+        app.processEvents()
+        self.check_frame(canvas.grabFramebuffer())
+
+
+if __name__ == "__main__":
+    unittest.main()
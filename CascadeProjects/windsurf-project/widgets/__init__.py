@@ -1,10 +1,20 @@
 # Widgets package
-from .dashboard import Dashboard
-from .base_widget import BaseWidget
-from .label_widget import LabelWidget
-from .button_widget import ButtonWidget
-from .slider_widget import SliderWidget
-from .gauge_widget import GaugeWidget
+#
+# Widget classes are imported on first access so that importing one module
+# (e.g. widgets.dashboard at startup) doesn't pull in every widget type.
+import importlib
+
+_LAZY_IMPORTS = {
+    'Dashboard': '.dashboard',
+    'BaseWidget': '.base_widget',
+    'LabelWidget': '.label_widget',
+    'ButtonWidget': '.button_widget',
+    'SliderWidget': '.slider_widget',
+    'GaugeWidget': '.gauge_widget',
+    'TopicTableWidget': '.topic_table_widget',
+    'LiteLabel': '.lite_tile',
+    'LiteGauge': '.lite_tile',
+}
 
 __all__ = [
     'Dashboard',
@@ -13,4 +23,18 @@ __all__ = [
     'ButtonWidget',
     'SliderWidget',
     'GaugeWidget',
+    'TopicTableWidget',
+    'LiteLabel',
+    'LiteGauge',
 ]
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
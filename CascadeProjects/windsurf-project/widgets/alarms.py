@@ -0,0 +1,300 @@
+"""
+Central alarm/threshold engine.
+
+Every monitored point (a widget with warnings enabled, or an entry in the
+'alarms' setting for topics that have no widget) is a row in a set of NumPy
+arrays: thresholds, hysteresis, delays, last value, state and
+acknowledgement. New values only mark their row dirty; a 100 ms timer
+evaluates all dirty rows, plus rows waiting out a delay, in one vectorised
+pass, so 10 000 points cost about as much as a handful.
+
+Per point:
+    low / high                critical at or beyond these
+    low_warning / high_warning  warning at or beyond these (defaults keep the old
+                              1.2 x low / 0.8 x high margins of get_warning_color)
+    hysteresis                a state is only left once the value is this far
+                              back inside the threshold
+    delay_on / delay_off      seconds a new, higher / lower, state must persist
+                              before it is taken
+A state that gets more severe becomes unacknowledged until acknowledge().
+"""
+import functools
+import time
+
+import numpy as np
+from PyQt6 import sip
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+NORMAL, WARNING, CRITICAL = 0, 1, 2
+SEVERITY_NAMES = {NORMAL: "normal", WARNING: "warning", CRITICAL: "critical"}
+
+
+class AlarmTable:
+    """The array-backed point store and evaluator (no Qt; used directly by the benchmark)."""
+
+    _FLOAT_FIELDS = ('low', 'high', 'low_warning', 'high_warning', 'hysteresis',
+                     'delay_on', 'delay_off', 'value', 'pending_since')
+
+    def __init__(self, capacity=64):
+        self.keys = []   # row -> key (None for free rows)
+        self.rows = {}   # key -> row
+        self._free = []
+        self._dirty = set()     # rows to re-evaluate (e.g. new thresholds)
+        self._incoming = {}     # row -> newest value, written to the arrays in evaluate()
+        self._capacity = 0
+        self._grow(capacity)
+
+    def _grow(self, capacity):
+        old = self._capacity
+        for name in self._FLOAT_FIELDS:
+            array = np.full(capacity, np.nan)
+            if old:
+                array[:old] = getattr(self, name)
+            setattr(self, name, array)
+        for name, dtype, fill in (('state', np.int8, NORMAL), ('pending', np.int8, NORMAL),
+                                  ('acked', bool, True), ('active', bool, False)):
+            array = np.full(capacity, fill, dtype=dtype)
+            if old:
+                array[:old] = getattr(self, name)
+            setattr(self, name, array)
+        self.keys.extend([None] * (capacity - old))
+        self._free.extend(range(capacity - 1, old - 1, -1))
+        self._capacity = capacity
+
+    def __len__(self):
+        return len(self.rows)
+
+    def add(self, key, low, high, low_warning=None, high_warning=None,
+            hysteresis=0.0, delay_on=0.0, delay_off=0.0):
+        """Add or update a point; returns its row."""
+        row = self.rows.get(key)
+        if row is None:
+            if not self._free:
+                self._grow(self._capacity * 2)
+            row = self._free.pop()
+            self.rows[key] = row
+            self.keys[row] = key
+            self.value[row] = np.nan
+            self.state[row] = self.pending[row] = NORMAL
+            self.acked[row] = True
+            self.active[row] = True
+        low, high = float(low), float(high)
+        self.low[row], self.high[row] = low, high
+        self.low_warning[row] = low * 1.2 if low_warning is None else float(low_warning)
+        self.high_warning[row] = high * 0.8 if high_warning is None else float(high_warning)
+        self.hysteresis[row] = float(hysteresis)
+        self.delay_on[row] = float(delay_on)
+        self.delay_off[row] = float(delay_off)
+        self._dirty.add(row)  # re-evaluate the current value against the new thresholds
+        return row
+
+    def remove(self, key):
+        row = self.rows.pop(key, None)
+        if row is None:
+            return
+        self.keys[row] = None
+        self.active[row] = False
+        self._dirty.discard(row)
+        self._incoming.pop(row, None)
+        self._free.append(row)
+
+    def rename(self, old, new):
+        """Give old's row (thresholds, value, state) the key new"""
+        row = self.rows.pop(old)
+        self.rows[new] = row
+        self.keys[row] = new
+
+    def set_value(self, key, value):
+        row = self.rows.get(key)
+        if row is not None:
+            self._incoming[row] = value
+
+    @property
+    def busy(self):
+        """True while there are dirty rows or rows waiting out a delay."""
+        return bool(self._dirty) or bool(self._incoming) or bool(np.any(self.active & (self.pending != self.state)))
+
+    def evaluate(self, now):
+        """Evaluate dirty and delayed rows. Returns (rows whose state changed, rows that got worse)."""
+        if self._incoming:
+            incoming = self._incoming
+            self._incoming = {}
+            new_rows = np.fromiter(incoming.keys(), dtype=np.intp, count=len(incoming))
+            self.value[new_rows] = np.fromiter(incoming.values(), dtype=float, count=len(incoming))
+            self._dirty.update(incoming)
+        waiting = np.flatnonzero(self.active & (self.pending != self.state))
+        if self._dirty:
+            dirty = np.fromiter(self._dirty, dtype=np.intp, count=len(self._dirty))
+            self._dirty.clear()
+            rows = np.union1d(dirty, waiting)
+        else:
+            rows = waiting
+        if not rows.size:
+            return rows, rows
+
+        v = self.value[rows]
+        state = self.state[rows]
+        h = self.hysteresis[rows]
+        low, high = self.low[rows], self.high[rows]
+        low_w, high_w = self.low_warning[rows], self.high_warning[rows]
+        with np.errstate(invalid='ignore'):  # NaN (no value yet) compares False -> NORMAL
+            critical = (v <= low) | (v >= high) | ((state == CRITICAL) & ((v <= low + h) | (v >= high - h)))
+            warning = (v <= low_w) | (v >= high_w) | ((state >= WARNING) & ((v <= low_w + h) | (v >= high_w - h)))
+        target = np.where(critical, CRITICAL, np.where(warning, WARNING, NORMAL)).astype(np.int8)
+
+        # A new target starts its delay; going back to the current state cancels a pending one
+        restart = target != self.pending[rows]
+        self.pending[rows[restart]] = target[restart]
+        self.pending_since[rows[restart]] = now
+
+        delay = np.where(target > state, self.delay_on[rows], self.delay_off[rows])
+        commit = (target != state) & (now - self.pending_since[rows] >= delay)
+        changed = rows[commit]
+        worse = commit & (target > state)
+        self.state[changed] = target[commit]
+        self.acked[rows[worse]] = False
+        self.acked[rows[commit & (target == NORMAL)]] = True
+        return changed, rows[worse]
+
+    def acknowledge(self, key=None):
+        """Acknowledge one point, or all of them. Returns the rows that changed."""
+        if key is None:
+            rows = np.flatnonzero(self.active & ~self.acked)
+        else:
+            row = self.rows.get(key)
+            rows = np.array([row] if row is not None and not self.acked[row] else [], dtype=np.intp)
+        self.acked[rows] = True
+        return rows
+
+
+class AlarmEngine(QObject):
+    alarms_changed = pyqtSignal(list)   # keys whose state or acknowledgement changed
+    alarms_raised = pyqtSignal(list)    # [(name, severity, value), ...] that got worse this tick
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.table = AlarmTable()
+        self.names = {}          # key -> display name
+        self.topic_points = {}   # (broker, topic) -> [key] for points fed from raw messages
+        self._listeners = {}     # broker -> its topic listener (see listener())
+        self.timer = QTimer(self)
+        self.timer.setInterval(100)
+        self.timer.timeout.connect(self._tick)
+
+    def register(self, key, name, low, high, topic=None, broker=None, **options):
+        """Add or update a point. With topic (no wildcards), it is fed by the messages of that
+        topic on connection broker (see listener()); otherwise by set_value."""
+        self.table.add(key, low, high, **options)
+        self.names[key] = name
+        self._unbind(key)
+        if topic:
+            self.topic_points.setdefault((broker, topic), []).append(key)
+        self.timer.start()
+
+    def register_config(self, key, name, config, **kwargs):
+        """Add or update a point from a widget config ('warning_low', 'warning_high', ...)"""
+        self.register(
+            key, name, low=config.get('warning_low', 20.0), high=config.get('warning_high', 80.0),
+            low_warning=config.get('warning_band_low'), high_warning=config.get('warning_band_high'),
+            hysteresis=config.get('alarm_hysteresis', 0.0),
+            delay_on=config.get('alarm_delay_on', 0.0), delay_off=config.get('alarm_delay_off', 0.0), **kwargs)
+
+    def _unbind(self, key):
+        for bound, keys in list(self.topic_points.items()):
+            if key in keys:
+                keys.remove(key)
+                if not keys:
+                    del self.topic_points[bound]
+
+    def unregister(self, key):
+        if key not in self.names:
+            return
+        was_alarm = self.state(key)[0] != NORMAL
+        self.table.remove(key)
+        del self.names[key]
+        self._unbind(key)
+        # Widgets unregister from their destroyed signal, which can come after the engine is gone at exit
+        if was_alarm and not sip.isdeleted(self):
+            self.alarms_changed.emit([key])
+
+    def is_registered(self, key):
+        return key in self.names
+
+    def rekey(self, old, new):
+        """Move point old, with its value, state and acknowledgement, to key new (replacing
+        new's own point): the same alarm passed between a widget and its layout entry."""
+        if old not in self.names or old == new:
+            return
+        if new in self.names:
+            self.table.remove(new)
+            del self.names[new]
+            self._unbind(new)
+        self.table.rename(old, new)
+        self.names[new] = self.names.pop(old)
+        for keys in self.topic_points.values():
+            if old in keys:
+                keys[keys.index(old)] = new
+        self.alarms_changed.emit([new])
+
+    def set_value(self, key, value):
+        try:
+            value = float(value)
+        except (ValueError, TypeError):
+            return
+        self.table.set_value(key, value)
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def listener(self, broker):
+        """The topic listener (MQTTClient.add_listener) for connection broker; the same
+        callable every time, so it can be removed again"""
+        listener = self._listeners.get(broker)
+        if listener is None:
+            listener = self._listeners[broker] = functools.partial(self.on_message, broker)
+        return listener
+
+    def on_message(self, broker, topic, message):
+        """Feeds the points bound to a topic on a connection."""
+        keys = self.topic_points.get((broker, topic))
+        if keys:
+            for key in keys:
+                self.set_value(key, message)
+
+    def state(self, key):
+        """(severity, acknowledged) for a point"""
+        row = self.table.rows.get(key)
+        if row is None:
+            return NORMAL, True
+        return int(self.table.state[row]), bool(self.table.acked[row])
+
+    def active_alarms(self):
+        """[(key, name, severity, acknowledged)] for points not in NORMAL state"""
+        table = self.table
+        rows = np.flatnonzero(table.active & (table.state != NORMAL))
+        return [(table.keys[r], self.names[table.keys[r]], int(table.state[r]), bool(table.acked[r])) for r in rows]
+
+    def acknowledge(self, key=None):
+        rows = self.table.acknowledge(key)
+        if rows.size:
+            self.alarms_changed.emit([self.table.keys[r] for r in rows])
+
+    def _tick(self):
+        table = self.table
+        changed, worse = table.evaluate(time.monotonic())
+        if changed.size:
+            self.alarms_changed.emit([table.keys[r] for r in changed])
+        if worse.size:
+            self.alarms_raised.emit([(self.names[table.keys[r]], int(table.state[r]), float(table.value[r]))
+                                     for r in worse])
+        if not table.busy:
+            self.timer.stop()
+
+
+_engine = None
+
+def get_alarm_engine():
+    """The shared AlarmEngine (created on first use)"""
+    global _engine
+    if _engine is None:
+        _engine = AlarmEngine()
+    return _engine
@@ -0,0 +1,89 @@
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from pathlib import Path
+import json
+import os
+from config.atomic_io import BackgroundWriter
+
+
+def get_autosave_dir():
+    """Directory holding autosaved layouts (next to settings.json)."""
+    return os.path.join(str(Path.home()), ".config", "mqtt-dashboard", "autosave")
+
+
+class LayoutAutosaver(QObject):
+    """
+    Debounced background autosave for a Dashboard.
+
+    Every layout change restarts a single-shot timer; when it fires, the current
+    layout is snapshotted on the GUI thread (cheap dict building only) and handed
+    to a BackgroundWriter, which serializes it and writes it with temp file +
+    fsync + rename, keeping `keep` rotated versions. A burst of drags therefore
+    costs one write, and the GUI thread never touches the disk.
+    """
+    saved = pyqtSignal(str, str)  # path, error message ('' on success)
+
+    def __init__(self, dashboard, directory=None, delay_ms=2000, keep=5):
+        super().__init__(dashboard)
+        self.dashboard = dashboard
+        self.directory = directory or get_autosave_dir()
+        self.keep = keep
+        self.enabled = True
+        self._pending = False  # a change came in (or was waiting) while disabled
+        self.writer = BackgroundWriter(name="layout-autosave")
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay_ms)
+        self.timer.timeout.connect(self.save_now)
+
+        dashboard.layout_changed.connect(self.schedule)
+
+    def autosave_path(self):
+        """Autosave file for the current layout, named after the loaded/saved file."""
+        current = self.dashboard.current_layout_file
+        name = Path(current).stem if current else "untitled"
+        return os.path.join(self.directory, f"{name}.autosave.json")
+
+    def schedule(self):
+        """(Re)start the debounce timer."""
+        if self.enabled:
+            self.timer.start()
+        else:
+            self._pending = True
+
+    def set_enabled(self, enabled):
+        """Pause autosaving (e.g. while widgets are temporarily repositioned). A save that was
+        waiting, or changes made meanwhile, are scheduled again when it is re-enabled."""
+        self.enabled = enabled
+        if not enabled:
+            self._pending = self._pending or self.timer.isActive()
+            self.timer.stop()
+        elif self._pending:
+            self._pending = False
+            self.timer.start()
+
+    def save_now(self):
+        """Snapshot the layout and queue it for writing."""
+        self.timer.stop()
+        if not self.enabled:
+            self._pending = True
+            return
+        snapshot = self.dashboard.get_layout_data()
+        path = self.autosave_path()
+        self.writer.submit(
+            path,
+            lambda: json.dumps(snapshot, indent=4),
+            keep=self.keep,
+            on_done=lambda p, error: self.saved.emit(p, str(error) if error else "")
+        )
+
+    def latest_autosave(self):
+        """Path of the most recent autosave for the current layout, or None."""
+        path = self.autosave_path()
+        return path if os.path.exists(path) else None
+
+    def shutdown(self, timeout=5.0):
+        """Flush a pending autosave and stop the writer thread (used on quit)."""
+        if self.timer.isActive():
+            self.save_now()
+        self.writer.shutdown(timeout)
@@ -2,6 +2,8 @@ from PyQt6.QtWidgets import QPushButton
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QPixmap, QIcon
 from .resizable_widget import ResizableWidget
+from .payload import as_text
+from diagnostics.metrics import metrics, timed_dispatch, profiled
 from pathlib import Path
 
 class ButtonWidget(ResizableWidget):
@@ -22,8 +24,7 @@ class ButtonWidget(ResizableWidget):
         if self.mqtt_client:
             input_topic = self.config.get('button_input_topic', self.topic)
             if input_topic:
-                self.mqtt_client.subscribe(input_topic)
-                self.mqtt_client.message_received.connect(self.on_message_received)
+                self.listen(input_topic)
 
     def on_button_clicked(self):
         """Handle button click."""
@@ -43,18 +44,26 @@ class ButtonWidget(ResizableWidget):
         except Exception as e:
             self.show_error(f"Publish failed: {e}")
 
+    @timed_dispatch
     def on_message_received(self, topic, message):
         """Handle incoming MQTT messages for state updates."""
         input_topic = self.config.get('button_input_topic', self.topic)
         if topic == input_topic:
             try:
+                message = self.payload_for(topic, message)
+                if message is None:
+                    return
                 on_payload = self.config.get('button_on_value', '1')
-                is_on = str(message).strip() == on_payload
+                is_on = as_text(message).strip() == on_payload
                 self.button.setChecked(is_on)
                 if self.error_state: self.clear_error()
+            except ValueError as e:
+                metrics.record_parse_failure(topic)
+                self.show_error(str(e))
             except RuntimeError:
                 pass # Widget might be deleted
 
+    @profiled('apply_config')
     def apply_config(self):
         """Apply configuration to the widget."""
         super().apply_config()
@@ -0,0 +1,277 @@
+"""
+Canvas backend for presentation mode: one surface paints every widget of the
+current page in a single pass.
+
+Normally each widget is a stack of QWidgets (frame with drop shadow, labels,
+gauge painter) that paint themselves through the raster engine onto a
+translucent window. With the 'canvas_backend' setting set to 'opengl' the
+dashboard hides those widgets in presentation mode (they keep receiving
+messages and keep their state) and shows a DashboardCanvas over the page
+instead. Every FRAME_INTERVAL ms it asks each widget for its canvas_state(),
+a small tuple with the background, kind, texts, gauge fraction and color,
+and repaints only if something changed.
+
+A frame is drawn as batched geometry: the shapes of all widgets are sorted
+by paint state first, so the backgrounds of one color, the gauge tracks,
+the value arcs/bars of one color and the texts of one font (cached
+QStaticText) are each drawn with a single brush, pen or font change. Merging
+them into one QPainterPath per color was tried; the raster engine fills a
+path spanning the page several times slower than the separate small shapes.
+
+'opengl' uses a QOpenGLWidget (software OpenGL such as Mesa llvmpipe works
+too, e.g. under xvfb-run with LIBGL_ALWAYS_SOFTWARE=1). Where no OpenGL
+context can be created, or with 'raster', the same single pass runs on a
+plain QWidget. 'widgets' (the default) keeps the widgets painting themselves.
+
+Only display widgets are drawn by the canvas: labels and gauges (and their
+lite tiles, see canvas_drawn). Buttons, toggles, sliders and topic tables
+stay visible as widgets beside the drawn tiles and keep taking input; the
+canvas is transparent where it draws nothing and for the mouse.
+"""
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtGui import QPainter, QColor, QPen, QStaticText, QFont, QTransform
+from PyQt6.QtCore import Qt, QTimer, QRectF, QPointF
+from diagnostics.metrics import timed_paint
+
+BACKENDS = ('widgets', 'raster', 'opengl')
+
+FRAME_INTERVAL = 50  # ms between state checks (at most 20 frames per second)
+
+TRACK_RGBA = QColor(200, 200, 200, 50).rgba()
+
+# Text layouts kept between frames; cleared when it grows past this
+TEXT_CACHE_SIZE = 4096
+
+_opengl_available = None
+
+
+def opengl_available():
+    """True if an OpenGL context can be created and made current here (checked once)"""
+    global _opengl_available
+    if _opengl_available is None:
+        _opengl_available = False
+        try:
+            from PyQt6.QtGui import QOpenGLContext, QOffscreenSurface
+            import PyQt6.QtOpenGLWidgets  # noqa: F401 (not part of every PyQt6 build)
+            context = QOpenGLContext()
+            if context.create():
+                surface = QOffscreenSurface()
+                surface.setFormat(context.format())
+                surface.create()
+                if surface.isValid() and context.makeCurrent(surface):
+                    context.doneCurrent()
+                    _opengl_available = True
+        except ImportError as e:
+            print(f"[ERROR] OpenGL canvas unavailable: {e}")
+    return _opengl_available
+
+
+def create_canvas(backend, widgets, parent):
+    """The canvas for a 'canvas_backend' setting, or None for 'widgets'"""
+    if backend not in BACKENDS:
+        print(f"[ERROR] Unknown canvas backend '{backend}', expected one of {', '.join(BACKENDS)}")
+        return None
+    if backend == 'widgets':
+        return None
+    if backend == 'opengl':
+        if opengl_available():
+            return _gl_canvas_class()(widgets, parent)
+        print("[ERROR] No OpenGL context available, using the raster canvas")
+    return DashboardCanvas(widgets, parent)
+
+
+class CanvasPainter:
+    """Draws canvas_state() tuples; shared by the raster and the OpenGL canvas."""
+
+    def __init__(self):
+        self._colors = {}
+        self._fonts = {}
+        self._texts = {}
+
+    def color(self, name):
+        color = self._colors.get(name)
+        if color is None:
+            color = self._colors[name] = QColor.fromRgba(name) if isinstance(name, int) else QColor(name)
+        return color
+
+    def font(self, size, bold):
+        key = (size, bold)
+        font = self._fonts.get(key)
+        if font is None:
+            font = self._fonts[key] = QFont()
+            font.setPixelSize(max(1, int(size)))
+            font.setBold(bold)
+        return font
+
+    def static_text(self, text, font_key):
+        key = (text, font_key)
+        static = self._texts.get(key)
+        if static is None:
+            if len(self._texts) > TEXT_CACHE_SIZE:
+                self._texts.clear()
+            static = self._texts[key] = QStaticText(text)
+            static.setPerformanceHint(QStaticText.PerformanceHint.AggressiveCaching)
+            static.prepare(QTransform(), self.font(*font_key))
+        return static
+
+    def paint(self, painter, items):
+        """items: ((x, y, width, height), canvas_state()) per widget"""
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        backgrounds = {}  # color -> [(rect, radius)]
+        fills = {}        # color -> [(rect, radius)]
+        strokes = {}      # (color, width) -> [(rect, start angle, span angle)]
+        texts = {}        # (font size, bold) -> [(text, color, center x, y, top aligned)]
+
+        for (x, y, width, height), (background, radius, kind, title, text, fraction, color, text_color, font_size) in items:
+            rect = QRectF(x, y, width, height)
+            if background >> 24:  # lite tiles paint their own background and pass 0
+                backgrounds.setdefault(background, []).append((rect, radius))
+            center_x = x + width / 2
+            if kind == 'text':
+                if text:
+                    texts.setdefault((font_size, True), []).append((text, color, center_x, y + height / 2, False))
+                continue
+
+            # Gauges: title on top, value below, the gauge in between (like GaugeWidget's layout)
+            gauge = rect.adjusted(10, 12 + font_size, -10, -(12 + font_size))
+            if title:
+                texts.setdefault((max(10, font_size - 2), True), []).append((title, text_color, center_x, y + 8, True))
+            if text:
+                texts.setdefault((font_size, False), []).append((text, text_color, center_x, y + height - 10 - font_size, True))
+            if gauge.width() <= 0 or gauge.height() <= 0:
+                continue
+            if kind == 'linear':
+                bar_height = max(15, min(gauge.height() - 10, 30))
+                bar = QRectF(gauge.x(), gauge.center().y() - bar_height / 2, gauge.width(), bar_height)
+                fills.setdefault(TRACK_RGBA, []).append((bar, bar_height / 2))
+                if fraction:
+                    fills.setdefault(color, []).append((QRectF(bar.x(), bar.y(), bar.width() * fraction, bar_height), bar_height / 2))
+                continue
+            size = min(gauge.width(), gauge.height())
+            square = QRectF(gauge.center().x() - size / 2, gauge.center().y() - size / 2, size, size)
+            if kind == 'circular':
+                pen_width, start, track_span, span = 8, 90, 360, -360 * (fraction or 0)
+            else:
+                pen_width, start, track_span, span = 12, 210, 120, 120 * (fraction or 0)
+            strokes.setdefault((TRACK_RGBA, pen_width), []).append((square, start, track_span))
+            if span:
+                strokes.setdefault((color, pen_width), []).append((square, start, span))
+
+        # One brush/pen change per color; the raster engine fills separate small shapes
+        # much faster than one merged path spanning the page
+        painter.setPen(Qt.PenStyle.NoPen)
+        for shapes in (backgrounds, fills):
+            for color, rects in shapes.items():
+                painter.setBrush(self.color(color))
+                for rect, radius in rects:
+                    painter.drawRoundedRect(rect, radius, radius)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        for (color, width), arcs in strokes.items():
+            painter.setPen(QPen(self.color(color), width))
+            for rect, start, span in arcs:
+                painter.drawArc(rect, int(start * 16), int(span * 16))
+        for font_key, entries in texts.items():
+            painter.setFont(self.font(*font_key))
+            for text, color, center_x, y, top in entries:
+                static = self.static_text(text, font_key)
+                size = static.size()
+                painter.setPen(self.color(color))
+                painter.drawStaticText(QPointF(center_x - size.width() / 2, y if top else y - size.height() / 2), static)
+
+
+_shared_painter = None
+
+
+def shared_painter():
+    """One CanvasPainter, with its color, font and text caches, for every lite tile"""
+    global _shared_painter
+    if _shared_painter is None:
+        _shared_painter = CanvasPainter()
+    return _shared_painter
+
+
+class _CanvasMixin:
+    """Frame timer and state collection for both canvas classes."""
+
+    def _init_canvas(self, widgets):
+        self.widget_type = 'canvas'  # metrics kind for timed_paint
+        self.widgets = widgets       # the page's widget list (shared, so additions show up)
+        self.painter = CanvasPainter()
+        self.items = []
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setInterval(FRAME_INTERVAL)
+        self.frame_timer.timeout.connect(self.refresh)
+
+    def start(self):
+        self.refresh()
+        self.frame_timer.start()
+
+    def stop(self):
+        self.frame_timer.stop()
+
+    def refresh(self):
+        """Collect every widget's state; repaint if any changed"""
+        parent = self.parentWidget()
+        if parent is not None and self.size() != parent.size():
+            self.resize(parent.size())
+        items = [(widget.geometry().getRect(), widget.canvas_state())
+                 for widget in self.widgets if widget and widget.canvas_drawn]
+        if items != self.items:
+            self.items = items
+            self.update()
+
+
+class DashboardCanvas(_CanvasMixin, QWidget):
+    """Raster canvas: the single batched pass on a plain QWidget."""
+
+    def __init__(self, widgets, parent=None):
+        super().__init__(parent)
+        self._init_canvas(widgets)
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+
+    @timed_paint
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        try:
+            self.painter.paint(painter, self.items)
+        finally:
+            painter.end()
+
+
+_gl_canvas = None
+
+
+def _gl_canvas_class():
+    # QtOpenGLWidgets is only imported when the OpenGL backend is used
+    global _gl_canvas
+    if _gl_canvas is None:
+        from PyQt6.QtOpenGLWidgets import QOpenGLWidget
+        from PyQt6.QtGui import QSurfaceFormat
+
+        class GLDashboardCanvas(_CanvasMixin, QOpenGLWidget):
+            """OpenGL canvas: the same pass on the OpenGL paint engine."""
+
+            def __init__(self, widgets, parent=None):
+                super().__init__(parent)
+                self._init_canvas(widgets)
+                surface_format = QSurfaceFormat()
+                surface_format.setAlphaBufferSize(8)  # the presentation window is translucent
+                surface_format.setSamples(4)
+                self.setFormat(surface_format)
+                # Composited over the page; interactive widgets show through where it draws nothing
+                self.setAttribute(Qt.WidgetAttribute.WA_AlwaysStackOnTop)
+
+            @timed_paint
+            def paintGL(self):
+                painter = QPainter(self)
+                try:
+                    painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+                    painter.fillRect(self.rect(), Qt.GlobalColor.transparent)
+                    painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)
+                    self.painter.paint(painter, self.items)
+                finally:
+                    painter.end()
+
+        _gl_canvas = GLDashboardCanvas
+    return _gl_canvas
@@ -2,6 +2,7 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QFormLayout,
                            QLineEdit, QPushButton, QLabel, QMessageBox, QSpinBox,
                            QCheckBox, QGroupBox, QSlider, QComboBox)
 from PyQt6.QtCore import Qt, pyqtSignal
+from .mqtt5 import describe_limits
 
 class ConnectionPanel(QWidget):
     connection_requested = pyqtSignal(dict)  # Emits connection settings
@@ -51,6 +52,25 @@ class ConnectionPanel(QWidget):
         # Auto Connect
         self.auto_connect = QCheckBox("Connect on startup")
         form_layout.addRow("", self.auto_connect)
+
+        # Protocol version and the MQTT 5 limits we ask for
+        self.protocol_combo = QComboBox()
+        self.protocol_combo.addItem("MQTT 3.1.1", 4)
+        self.protocol_combo.addItem("MQTT 5", 5)
+        self.protocol_combo.currentIndexChanged.connect(self.update_protocol_fields)
+        form_layout.addRow("Protocol:", self.protocol_combo)
+
+        self.receive_maximum_spin = QSpinBox()
+        self.receive_maximum_spin.setRange(0, 65535)
+        self.receive_maximum_spin.setSpecialValueText("Broker default")
+        form_layout.addRow("Receive Maximum:", self.receive_maximum_spin)
+
+        self.max_packet_spin = QSpinBox()
+        self.max_packet_spin.setRange(0, 268435455)
+        self.max_packet_spin.setSuffix(" B")
+        self.max_packet_spin.setSpecialValueText("No limit")
+        form_layout.addRow("Max Packet Size:", self.max_packet_spin)
+        self.update_protocol_fields()
         
         connection_group.setLayout(form_layout)
         
@@ -69,6 +89,10 @@ class ConnectionPanel(QWidget):
         self.status_label = QLabel("Status: Disconnected")
         self.status_label.setStyleSheet("color: red; font-weight: bold;")
 
+        # Limits the broker announced in its CONNACK (MQTT 5)
+        self.limits_label = QLabel("")
+        self.limits_label.setWordWrap(True)
+
         # Theme Selection Group
         theme_group = QGroupBox("Tema og Utseende")
         theme_layout = QFormLayout()
@@ -110,6 +134,7 @@ class ConnectionPanel(QWidget):
         layout.addWidget(connection_group)
         layout.addLayout(button_layout)
         layout.addWidget(self.status_label)
+        layout.addWidget(self.limits_label)
         layout.addWidget(theme_group)
         layout.addWidget(presentation_group)
         layout.addStretch()
@@ -128,6 +153,9 @@ class ConnectionPanel(QWidget):
         self.password_edit.setText(self.settings.get('password', ''))
         self.ssl_check.setChecked(self.settings.get('use_ssl', False))
         self.auto_connect.setChecked(self.settings.get('auto_connect', False))
+        self.protocol_combo.setCurrentIndex(max(0, self.protocol_combo.findData(int(self.settings.get('mqtt_version', 4)))))
+        self.receive_maximum_spin.setValue(int(self.settings.get('receive_maximum', 0) or 0))
+        self.max_packet_spin.setValue(int(self.settings.get('maximum_packet_size', 0) or 0))
         
         if self.auto_connect.isChecked():
             self.on_connect_clicked()
@@ -140,8 +168,22 @@ class ConnectionPanel(QWidget):
             'username': self.username_edit.text(),
             'password': self.password_edit.text(),
             'use_ssl': self.ssl_check.isChecked(),
-            'auto_connect': self.auto_connect.isChecked()
+            'auto_connect': self.auto_connect.isChecked(),
+            **self.get_protocol_settings()
         }
+
+    def get_protocol_settings(self):
+        return {
+            'mqtt_version': self.protocol_combo.currentData(),
+            'receive_maximum': self.receive_maximum_spin.value(),
+            'maximum_packet_size': self.max_packet_spin.value()
+        }
+
+    def update_protocol_fields(self):
+        """The receive maximum and packet size limits only exist in MQTT 5"""
+        is_v5 = self.protocol_combo.currentData() == 5
+        self.receive_maximum_spin.setEnabled(is_v5)
+        self.max_packet_spin.setEnabled(is_v5)
         
     def on_connect_clicked(self):
         """Handle connect button click"""
@@ -162,7 +204,8 @@ class ConnectionPanel(QWidget):
             'username': username,
             'password': password,
             'use_ssl': use_ssl,
-            'auto_connect': self.auto_connect.isChecked()
+            'auto_connect': self.auto_connect.isChecked(),
+            **self.get_protocol_settings()
         })
         
         # Emit connection request
@@ -171,7 +214,8 @@ class ConnectionPanel(QWidget):
             'port': port,
             'username': username if username else None,
             'password': password if password else None,
-            'use_ssl': use_ssl
+            'use_ssl': use_ssl,
+            **self.get_protocol_settings()
         })
         
         # Update UI
@@ -191,11 +235,14 @@ class ConnectionPanel(QWidget):
         if connected:
             self.status_label.setText(f"Status: Connected to {self.broker_edit.text()}")
             self.status_label.setStyleSheet("color: green; font-weight: bold;")
+            self.limits_label.setText(describe_limits(self.mqtt.negotiated, self.mqtt.receive_maximum,
+                                                      self.mqtt.maximum_packet_size))
             self.connect_btn.setEnabled(False)
             self.disconnect_btn.setEnabled(True)
         else:
             self.status_label.setText(f"Status: Disconnected - {message}")
             self.status_label.setStyleSheet("color: red; font-weight: bold;")
+            self.limits_label.setText("")
             self.connect_btn.setEnabled(True)
             self.disconnect_btn.setEnabled(False)
 
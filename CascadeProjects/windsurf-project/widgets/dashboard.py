@@ -1,47 +1,155 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QScrollArea, QMessageBox, QFileDialog, QMenu, QInputDialog, QDialog, QComboBox, QLineEdit, QDialogButtonBox, QLabel
-from PyQt6.QtCore import Qt, QRect
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QScrollArea, QMessageBox, QFileDialog, QMenu, QInputDialog, QDialog, QComboBox, QLineEdit, QDialogButtonBox, QLabel, QStackedWidget, QTabBar
+from PyQt6.QtCore import Qt, QRect, pyqtSignal
 from PyQt6.QtGui import QFont
 import json
 import os
+from config.atomic_io import atomic_write_text
 from .grid_container import GridContainer
+from .spatial_index import SpatialIndex
+from .layout_styles import build_styles, resolve_config, compact_layout
+from .autosave import LayoutAutosaver
+from .alarms import get_alarm_engine
+from .payload import payloads
+from .window_stats import WindowedStats, AGGREGATES
+from diagnostics.tracing import tracer
+
+class DashboardPage:
+    """
+    One page (tab) of a layout. While live it has its own GridContainer, scroll
+    area, spatial index and widgets; otherwise it only keeps the layout entries
+    of its widgets (type/topic/x/y/width/height/config/broker), so it costs no
+    widgets and no subscriptions, except for the topics of entries with
+    warnings: their alarms are kept by EntryAlarms.
+    """
+
+    def __init__(self, name, entries=None):
+        self.name = name
+        self.entries = entries or []
+        self.live = False
+        self.widgets = []
+        self.container = None
+        self.scroll = None
+        self.spatial_index = None
+        self.alarms = {}  # id(entry) -> EntryAlarm, for the entries with warnings while not live
+
+
+class EntryAlarm:
+    """
+    The warning thresholds of a layout entry whose widget doesn't exist (its
+    page isn't live). The point stays registered with the alarm engine and is
+    fed from the entry's topic, through its json_field and aggregate like the
+    widget would, so alarms don't depend on which pages have been shown. The
+    point moves to the widget (and back) with its state when the page is
+    built (or unloaded). Aggregates only advance with new messages here.
+    """
+
+    def __init__(self, entry, client):
+        self.config = entry['config']
+        self.topic = entry['topic']
+        self.client = client
+        self.key = f"entry-{id(self)}"
+        get_alarm_engine().register_config(self.key, self.config.get('display_name') or self.topic, self.config)
+        aggregate = self.config.get('aggregate', '')
+        self.window_stats = WindowedStats(float(self.config.get('aggregate_window', 60))) if aggregate in AGGREGATES else None
+        client.add_listener(self.topic, self.on_message)
+        client.subscribe(self.topic)
+
+    def on_message(self, topic, message):
+        selector = self.config.get('json_field') or ''
+        try:
+            if selector:
+                message = payloads.extract(topic, message, selector)
+                if message is None:
+                    return
+            if self.window_stats is not None:
+                self.window_stats.add(payloads.number((topic, selector), message))
+                message = self.window_stats.value(self.config['aggregate'])
+                if message is None:
+                    return
+        except (ValueError, TypeError):
+            return  # the widget would show an error; the alarm keeps its last value
+        get_alarm_engine().set_value(self.key, message)
+
+    def stop(self, hand_over_to=None):
+        """Stop listening; the point moves to key hand_over_to (a widget's), or is removed"""
+        self.client.remove_listener(self.on_message, self.topic)
+        self.client.unsubscribe(self.topic)
+        engine = get_alarm_engine()
+        if hand_over_to is not None and engine.is_registered(hand_over_to):
+            engine.rekey(self.key, hand_over_to)
+        else:
+            engine.unregister(self.key)
+
 
 class Dashboard(QWidget):
-    def __init__(self, mqtt_client, parent=None):
+    layout_changed = pyqtSignal()  # Widgets added/removed/moved/resized or reconfigured
+
+    def __init__(self, connections, parent=None):
         super().__init__(parent)
         self.main_window = self.get_main_window()
-        self.mqtt_client = mqtt_client
-        self.widgets = []
+        # Broker connections by name; widgets use the default one unless their entry names another
+        self.connections = connections
+        self.mqtt_client = connections.default
         self.current_layout_file = None
         self.grid_size = 20
+        self.layout_styles = {}  # style class name -> shared read-only config
         self.presentation_mode = False
+        # 'widgets', 'raster' or 'opengl': what draws the page in presentation mode (see canvas.py)
+        self.canvas_backend = 'widgets'
+        self.canvas = None
+        # 'full' or 'lite': labels and gauges as single self-painting tiles (see lite_tile.py)
+        self.tile_mode = 'full'
+        self.zoom_view = None  # zoomable view of the current page, while it is shown
+
+        # Pages of the layout. widgets, container, scroll and spatial_index always belong
+        # to the current page; only the max_live_pages most recently shown pages have widgets.
+        self.pages = []
+        self.current_page = None
+        self.max_live_pages = 3
+        self._live_pages = []  # least recently shown first
+        self.widgets = []
+        self.container = None
+        self.scroll = None
+        self.spatial_index = None
         
-        self.container = GridContainer(self.grid_size)
-        self.container.setMinimumSize(500, 300)
-        
-        # Add the welcome message label
+        # Add the welcome message label (moves to the current page's container)
         self.welcome_label = QLabel(
             "Welcome to MQTT Dashboard!\n\n"
             "Right-click to add a widget or load a layout to get started.",
-            self.container
+            self
         )
         font = QFont()
         font.setPointSize(16)
         self.welcome_label.setFont(font)
         self.welcome_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.welcome_label.setStyleSheet("color: #888;")
-        
-        self.scroll = QScrollArea()
-        self.scroll.setWidgetResizable(True)
-        self.scroll.setWidget(self.container)
+
+        # Page tabs, shown when the layout has more than one page
+        self.tab_bar = QTabBar()
+        self.tab_bar.setExpanding(False)
+        self.tab_bar.currentChanged.connect(self._on_tab_changed)
+        self.tab_bar.hide()
+        self.page_stack = QStackedWidget()
         
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(0, 0, 0, 0)
-        main_layout.addWidget(self.scroll)
+        main_layout.setSpacing(0)
+        main_layout.addWidget(self.tab_bar)
+        main_layout.addWidget(self.page_stack)
         
         self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.customContextMenuRequested.connect(self.show_context_menu)
+
+        # Topics dragged from the topic explorer
+        self.setAcceptDrops(True)
         
-        self._update_welcome_message_visibility()
+        self._loading_layout = False
+        self.add_page("Page 1")
+        self.autosaver = LayoutAutosaver(self)
+
+    def _emit_layout_changed(self):
+        if not self._loading_layout:
+            self.layout_changed.emit()
 
     def get_main_window(self):
         parent = self.parent()
@@ -65,15 +173,195 @@ class Dashboard(QWidget):
 
     def set_widget_opacity(self, opacity):
         """Set opacity for all widgets."""
-        for widget in self.widgets:
-            if widget:
-                widget.config['individual_opacity'] = opacity
-                widget.apply_config()
+        for widget in self.live_widgets():
+            widget.config['individual_opacity'] = opacity
+            widget.apply_config()
+        for page in self.pages:
+            for entry in page.entries:
+                entry['config']['individual_opacity'] = opacity
+        self._emit_layout_changed()
+
+    # --- pages --------------------------------------------------------------
+
+    def add_page(self, name, entries=None, show=True):
+        """Append a page; its widgets are created when it is first shown"""
+        page = DashboardPage(name, entries)
+        self.pages.append(page)
+        self.tab_bar.blockSignals(True)
+        self.tab_bar.addTab(name)
+        self.tab_bar.blockSignals(False)
+        self._update_tab_bar_visibility()
+        if show:
+            self.show_page(len(self.pages) - 1)
+        else:
+            self._watch_alarms(page)
+        self._emit_layout_changed()
+        return page
+
+    def show_page(self, index):
+        """Make a page the current one, creating its widgets if it isn't live"""
+        page = self.pages[index]
+        if page is not self.current_page:
+            self.set_zoom_view(False)
+            canvas = self.canvas is not None
+            self._stop_canvas()
+            entries = None
+            if not page.live:
+                self._make_live(page)
+                entries, page.entries = page.entries, []
+            self.current_page = page
+            self.widgets, self.container = page.widgets, page.container
+            self.scroll, self.spatial_index = page.scroll, page.spatial_index
+            self.page_stack.setCurrentWidget(page.scroll)
+            self.welcome_label.setParent(page.container)
+            self.welcome_label.setGeometry(0, 0, page.container.width(), page.container.height())
+            if entries:
+                loading, self._loading_layout = self._loading_layout, True
+                try:
+                    with tracer.span("page.build", page=page.name, widgets=len(entries)):
+                        for entry in entries:
+                            widget = self._add_entry(entry)
+                            alarm = page.alarms.pop(id(entry), None)
+                            if alarm is not None:
+                                alarm.stop(hand_over_to=widget._alarm_key if widget is not None else None)
+                finally:
+                    self._loading_layout = loading
+                self._stop_alarms(page)
+            if canvas:
+                self._start_canvas()
+        if page in self._live_pages:
+            self._live_pages.remove(page)
+        self._live_pages.append(page)
+        self._evict_pages()
+        self.tab_bar.blockSignals(True)
+        self.tab_bar.setCurrentIndex(index)
+        self.tab_bar.blockSignals(False)
+        self._update_welcome_message_visibility()
+
+    def rename_page(self, index, name):
+        self.pages[index].name = name
+        self.tab_bar.setTabText(index, name)
+        self._emit_layout_changed()
+
+    def remove_page(self, index):
+        """Delete a page and its widgets (there is always at least one page)"""
+        if len(self.pages) <= 1:
+            return
+        self.set_zoom_view(False)
+        page = self.pages.pop(index)
+        self._discard_widgets(page)
+        self._stop_alarms(page)
+        self.tab_bar.blockSignals(True)
+        self.tab_bar.removeTab(index)
+        self.tab_bar.blockSignals(False)
+        self._update_tab_bar_visibility()
+        if page is self.current_page:
+            self.current_page = None
+            self.show_page(min(index, len(self.pages) - 1))
+        self._emit_layout_changed()
+
+    def live_widgets(self):
+        """Widgets of every live page, not only the current one"""
+        return [widget for page in self._live_pages for widget in page.widgets if widget]
+
+    def live_widget_count(self):
+        # Read from the metrics exporter thread: plain len() calls only
+        return sum(len(page.widgets) for page in list(self._live_pages))
+
+    def _on_tab_changed(self, index):
+        if 0 <= index < len(self.pages):
+            self.show_page(index)
+
+    def _update_tab_bar_visibility(self):
+        self.tab_bar.setVisible(len(self.pages) > 1 and not self.presentation_mode)
+
+    def _make_live(self, page):
+        page.container = GridContainer(self.grid_size)
+        page.container.setMinimumSize(500, 300)
+        page.scroll = QScrollArea()
+        page.scroll.setWidgetResizable(True)
+        page.scroll.setWidget(page.container)
+        page.spatial_index = SpatialIndex(cell_size=self.grid_size * 10)
+        page.widgets = []
+        page.live = True
+        self.page_stack.addWidget(page.scroll)
+
+    def _evict_pages(self):
+        """Turn the least recently shown pages beyond max_live_pages back into layout entries.
+        Their widgets are deleted, which also ends their subscriptions."""
+        while len(self._live_pages) > max(1, self.max_live_pages):
+            page = self._live_pages[0]
+            widgets = [widget for widget in page.widgets if widget]
+            page.entries = [self._widget_entry(widget) for widget in widgets]
+            self._watch_alarms(page, [widget._alarm_key for widget in widgets])
+            tracer.instant("page.unload", page=page.name, widgets=len(page.entries))
+            self._discard_widgets(page)
+
+    def _watch_alarms(self, page, widget_keys=None):
+        """EntryAlarms for a page that isn't live; widget_keys (per entry) are the points of
+        the widgets the entries were made from, which the EntryAlarms take over"""
+        engine = get_alarm_engine()
+        for index, entry in enumerate(page.entries):
+            if not entry['config'].get('warning_enabled', False):
+                continue
+            try:
+                alarm = EntryAlarm(entry, self.connections.get(entry.get('broker')))
+            except (ValueError, TypeError) as e:
+                print(f"[ERROR] Invalid warning thresholds for {entry['topic']}: {e}")
+                continue
+            page.alarms[id(entry)] = alarm
+            if widget_keys is not None:
+                engine.rekey(widget_keys[index], alarm.key)
+
+    def _stop_alarms(self, page):
+        for alarm in page.alarms.values():
+            alarm.stop()
+        page.alarms = {}
+
+    def _discard_widgets(self, page):
+        if page in self._live_pages:
+            self._live_pages.remove(page)
+        if not page.live:
+            return
+        if self.welcome_label.parent() is page.container:
+            self.welcome_label.setParent(self)
+            self.welcome_label.hide()
+        for widget in page.widgets:
+            widget.setParent(None)
+            widget.deleteLater()
+        self.page_stack.removeWidget(page.scroll)
+        page.scroll.deleteLater()
+        page.widgets = []
+        page.container = page.scroll = page.spatial_index = None
+        page.live = False
+
+    def _widget_entry(self, widget):
+        entry = {
+            'type': widget.config.get('type', widget.widget_type), # Use specific type from config if available (for gauges)
+            'topic': widget.topic,
+            'x': widget.x(),
+            'y': widget.y(),
+            'width': widget.width(),
+            'height': widget.height(),
+            'config': widget.config
+        }
+        if getattr(widget, 'broker', None):
+            entry['broker'] = widget.broker
+        return entry
+
+    def _add_entry(self, entry):
+        return self.add_widget(entry['type'], entry['topic'], entry['x'], entry['y'],
+                               entry['width'], entry['height'], config=entry['config'], broker=entry.get('broker'))
 
     def set_presentation_mode(self, enabled):
         """Toggle presentation mode - hide/show frames and enable transparency"""
         self.presentation_mode = enabled
+        # Widgets are temporarily repositioned for fullscreen; don't autosave that
+        self.autosaver.set_enabled(not enabled)
+        self._update_tab_bar_visibility()
         if enabled:
+            self.set_zoom_view(False)
+
             # Hide welcome message in presentation mode
             self.welcome_label.hide()
 
@@ -118,8 +406,11 @@ class Dashboard(QWidget):
             for widget in self.widgets:
                 if widget and hasattr(widget, 'set_presentation_mode'):
                     widget.set_presentation_mode(True)
+            self._start_canvas()
 
         else:
+            self._stop_canvas()
+
             # Show welcome message if needed
             self._update_welcome_message_visibility()
 
@@ -146,16 +437,76 @@ class Dashboard(QWidget):
                 if widget and hasattr(widget, 'set_presentation_mode'):
                     widget.set_presentation_mode(False)
 
-    def add_widget(self, widget_type, topic, x=None, y=None, width=None, height=None, config=None):
+    def _start_canvas(self):
+        """Draw the current page on a canvas instead of its widgets (canvas_backend other than 'widgets')"""
+        from .canvas import create_canvas
+        self.canvas = create_canvas(self.canvas_backend, self.widgets, self.container)
+        if self.canvas is None:
+            return
+        # Hidden widgets still get their messages; the canvas reads their state.
+        # Interactive widgets (buttons, sliders, ...) stay visible and above the canvas.
+        for widget in self.widgets:
+            if widget and widget.canvas_drawn:
+                widget.hide()
+        self.canvas.setGeometry(self.container.rect())
+        self.canvas.show()
+        self.canvas.lower()
+        self.canvas.start()
+
+    def _stop_canvas(self):
+        if self.canvas is None:
+            return
+        self.canvas.stop()
+        self.canvas.deleteLater()
+        self.canvas = None
+        for widget in self.widgets:
+            if widget and widget.canvas_drawn:
+                widget.show()
+
+    def set_zoom_view(self, enabled):
+        """Show the current page in the zoomable view (zoom_view.py) or back as widgets"""
+        if enabled == (self.zoom_view is not None):
+            return
+        if enabled:
+            from .zoom_view import ZoomView
+            self.zoom_view = ZoomView(self.widgets, self)
+            self.zoom_view.widget_activated.connect(self._leave_zoom_view_at)
+            self.zoom_view.closed.connect(lambda: self.set_zoom_view(False))
+            self.zoom_view.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+            self.zoom_view.customContextMenuRequested.connect(
+                lambda position: self.show_context_menu(self.zoom_view.mapTo(self, position)))
+            self.page_stack.addWidget(self.zoom_view)
+            self.page_stack.setCurrentWidget(self.zoom_view)
+            self.zoom_view.fit()
+            self.zoom_view.setFocus()
+        else:
+            self.page_stack.setCurrentWidget(self.scroll)
+            self.page_stack.removeWidget(self.zoom_view)
+            self.zoom_view.deleteLater()
+            self.zoom_view = None
+
+    def _leave_zoom_view_at(self, widget):
+        self.set_zoom_view(False)
+        self.scroll.ensureWidgetVisible(widget)
+
+    def add_widget(self, widget_type, topic, x=None, y=None, width=None, height=None, config=None, broker=None):
         """Dynamically add a widget to the dashboard."""
         try:
             WidgetClass = None
             if widget_type == 'label':
-                from .label_widget import LabelWidget
-                WidgetClass = LabelWidget
+                if self.tile_mode == 'lite':
+                    from .lite_tile import LiteLabel
+                    WidgetClass = LiteLabel
+                else:
+                    from .label_widget import LabelWidget
+                    WidgetClass = LabelWidget
             elif widget_type in ['gauge', 'gauge_circular', 'gauge_linear', 'gauge_speedometer', 'gauge_voltage']:
-                from .gauge_widget import GaugeWidget
-                WidgetClass = GaugeWidget
+                if self.tile_mode == 'lite':
+                    from .lite_tile import LiteGauge
+                    WidgetClass = LiteGauge
+                else:
+                    from .gauge_widget import GaugeWidget
+                    WidgetClass = GaugeWidget
                 # Ensure the specific gauge type is in the config
                 if config:
                     config['type'] = widget_type
@@ -170,25 +521,37 @@ class Dashboard(QWidget):
             elif widget_type == 'button':
                 from .button_widget import ButtonWidget
                 WidgetClass = ButtonWidget
+            elif widget_type == 'topic_table':
+                from .topic_table_widget import TopicTableWidget
+                WidgetClass = TopicTableWidget
+                # A table needs room for a few rows
+                width = 480 if width is None else width
+                height = 320 if height is None else height
 
             if not WidgetClass:
                 raise ValueError(f"Unknown widget type: {widget_type}")
 
-            # Default position if not specified
-            if x is None or y is None:
-                x, y = self._find_next_position()
-
             # Default size if not specified - ensure int values
             width = int(width) if width is not None else 200
             height = int(height) if height is not None else 160
+
+            # Default position if not specified
+            if x is None or y is None:
+                x, y = self._find_next_position(width, height)
             x = int(x)
             y = int(y)
 
-            widget = WidgetClass(topic, self.mqtt_client, self.container, config)
-            widget.setGeometry(x, y, width, height)
-            widget.show()
+            with tracer.span("widget.construct", type=widget_type, topic=topic):
+                widget = WidgetClass(topic, self.connections.get(broker), self.container, config)
+                widget.broker = broker if broker and broker != self.connections.default.name else None
+                widget.setGeometry(x, y, width, height)
+                widget.show()
             self.widgets.append(widget)
+            self.spatial_index.insert(widget, (x, y, width, height))
+            widget.geometry_changed.connect(lambda rect, w=widget: self._on_widget_geometry_changed(w, rect))
+            widget.config_changed.connect(self._emit_layout_changed)
             self._update_welcome_message_visibility() # Update visibility
+            self._emit_layout_changed()
             return widget
         except Exception as e:
             print(f"[ERROR] Failed to add widget: {e}")
@@ -200,18 +563,68 @@ class Dashboard(QWidget):
         """Remove a widget from the dashboard."""
         if widget in self.widgets:
             self.widgets.remove(widget)
+            self.spatial_index.remove(widget)
             self._update_welcome_message_visibility()
+            self._emit_layout_changed()
+
+    def _on_widget_geometry_changed(self, widget, rect):
+        """Keep the spatial index in sync when a widget is moved or resized."""
+        if widget in self.spatial_index:
+            if self.spatial_index.update(widget, (rect.x(), rect.y(), rect.width(), rect.height())):
+                self._emit_layout_changed()
+
+    def _find_next_position(self, width=100, height=100):
+        """Find the first free spot on the grid using the spatial index."""
+        return self.spatial_index.find_free_slot(
+            width, height, self.container.width(), origin=(20, 20), step=self.grid_size * 2
+        )
+
+    def is_area_free(self, rect, exclude=None):
+        """Return True if rect (QRect) does not overlap any widget other than exclude."""
+        return not self.spatial_index.intersects((rect.x(), rect.y(), rect.width(), rect.height()), exclude=exclude)
+
+    def widget_at(self, pos):
+        """Return the topmost widget under a container position (QPoint), or None."""
+        hits = self.spatial_index.hit_test(pos.x(), pos.y())
+        if not hits:
+            return None
+        if len(hits) == 1:
+            return hits[0]
+        # self.widgets is in stacking order; the last one added is on top
+        for widget in reversed(self.widgets):
+            if widget in hits:
+                return widget
+        return None
 
-    def _find_next_position(self):
-        # Simple logic to find an empty spot. Can be improved.
-        x, y = 20, 20
-        occupied_rects = [w.geometry() for w in self.widgets]
-        while any(rect.intersects(QRect(x, y, 100, 100)) for rect in occupied_rects):
-            x += self.grid_size * 2
-            if x > self.container.width() - 100:
-                x = 20
-                y += self.grid_size * 2
-        return x, y
+    def dragEnterEvent(self, event):
+        from .topic_explorer import TOPIC_MIME_TYPE
+        if event.mimeData().hasFormat(TOPIC_MIME_TYPE) and not self.presentation_mode:
+            event.acceptProposedAction()
+
+    def dragMoveEvent(self, event):
+        from .topic_explorer import TOPIC_MIME_TYPE
+        if event.mimeData().hasFormat(TOPIC_MIME_TYPE):
+            event.acceptProposedAction()
+
+    def dropEvent(self, event):
+        """Add a widget for a topic dropped from the topic explorer: a label, or a
+        topic table for a wildcard topic"""
+        from .topic_explorer import TOPIC_MIME_TYPE
+        try:
+            data = json.loads(bytes(event.mimeData().data(TOPIC_MIME_TYPE)).decode('utf-8'))
+            topic = data['topic']
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"[ERROR] Invalid topic drop: {e}")
+            return
+        widget_type = 'topic_table' if '+' in topic or '#' in topic else 'label'
+        width, height = (480, 320) if widget_type == 'topic_table' else (200, 160)
+        pos = self.container.mapFrom(self, event.position().toPoint())
+        x = max(0, round(pos.x() / self.grid_size) * self.grid_size)
+        y = max(0, round(pos.y() / self.grid_size) * self.grid_size)
+        if not self.is_area_free(QRect(x, y, width, height)):
+            x = y = None  # first free spot instead
+        event.acceptProposedAction()
+        self.add_widget(widget_type, topic, x, y, width, height, broker=data.get('broker'))
 
     def save_layout(self):
         """Save the current layout to a JSON file."""
@@ -225,29 +638,38 @@ class Dashboard(QWidget):
         if not file_path:
             return
 
-        layout_data = []
-        for widget in self.widgets:
-            if widget:
-                widget_data = {
-                    'type': widget.config.get('type', widget.widget_type), # Use specific type from config if available (for gauges)
-                    'topic': widget.topic,
-                    'x': widget.x(),
-                    'y': widget.y(),
-                    'width': widget.width(),
-                    'height': widget.height(),
-                    'config': widget.config
-                }
-                layout_data.append(widget_data)
+        layout_data = self.get_layout_data()
         
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(layout_data, f, indent=4)
+            atomic_write_text(file_path, json.dumps(layout_data, indent=4))
             self.current_layout_file = file_path
             if self.main_window and hasattr(self.main_window, 'statusBar'):
                 self.main_window.statusBar().showMessage(f"Layout saved to {os.path.basename(file_path)}", 5000)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save layout: {e}")
 
+    def get_layout_data(self):
+        """Serialize all pages to the compact layout format (with style classes). A single
+        page is written as a plain 'widgets' list, several as 'pages'."""
+        page_entries = []
+        for page in self.pages:
+            if page.live:
+                page_entries.append([self._widget_entry(widget) for widget in page.widgets if widget])
+            else:
+                page_entries.append(page.entries)
+        style_names = {id(style): name for name, style in self.layout_styles.items()}
+        # One pass over every page, so style classes are shared between pages
+        layout = compact_layout([entry for entries in page_entries for entry in entries], style_names)
+        if len(self.pages) == 1:
+            return layout
+        widgets = layout.pop('widgets')
+        layout['pages'] = []
+        start = 0
+        for page, entries in zip(self.pages, page_entries):
+            layout['pages'].append({'name': page.name, 'widgets': widgets[start:start + len(entries)]})
+            start += len(entries)
+        return layout
+
     def load_layout(self, file_path=None):
         """Load a layout from a JSON file."""
         if not file_path:
@@ -257,48 +679,95 @@ class Dashboard(QWidget):
             return
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                layout_data = json.load(f)
+            with tracer.span("layout.parse", file=os.path.basename(file_path)):
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    layout_data = json.load(f)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load or parse layout file: {e}")
             return
             
-        self.clear_widgets()
-
-        widget_list = []
-        if isinstance(layout_data, dict) and 'widgets' in layout_data:
-            widget_list = layout_data.get('widgets', [])
+        self._loading_layout = True
+
+        pages_data = []
+        self.layout_styles = {}
+        if isinstance(layout_data, dict) and 'pages' in layout_data:
+            pages_data = layout_data.get('pages') or []
+            self.layout_styles = build_styles(layout_data.get('styles', {}))
+        elif isinstance(layout_data, dict) and 'widgets' in layout_data:
+            pages_data = [{'widgets': layout_data.get('widgets', [])}]
+            self.layout_styles = build_styles(layout_data.get('styles', {}))
         elif isinstance(layout_data, list):
-            widget_list = layout_data
+            pages_data = [{'widgets': layout_data}]
 
-        for widget_data in widget_list:
-            if not isinstance(widget_data, dict):
-                print(f"Skipping invalid widget data (not a dict): {widget_data}")
-                continue
+        try:
+            self._remove_all_pages()
+            for number, page_data in enumerate(pages_data, 1):
+                if not isinstance(page_data, dict):
+                    print(f"Skipping invalid page data (not a dict): {page_data}")
+                    continue
+                entries = []
+                for widget_data in page_data.get('widgets') or []:
+                    if not isinstance(widget_data, dict):
+                        print(f"Skipping invalid widget data (not a dict): {widget_data}")
+                        continue
+                    entry = {
+                        'type': widget_data.get('type'),
+                        'topic': widget_data.get('topic'),
+                        'x': widget_data.get('x'),
+                        'y': widget_data.get('y'),
+                        'width': widget_data.get('width'),
+                        'height': widget_data.get('height'),
+                        'config': resolve_config(widget_data, self.layout_styles)
+                    }
+                    if widget_data.get('broker'):
+                        entry['broker'] = widget_data['broker']
+                    entries.append(entry)
+                self.add_page(page_data.get('name') or f"Page {number}", entries, show=False)
+            if not self.pages:
+                self.add_page("Page 1", show=False)
+            # Only the first page is built now; the others when they are first shown
+            with tracer.span("layout.build", widgets=len(self.pages[0].entries), pages=len(self.pages)):
+                self.show_page(0)
+        finally:
+            self._loading_layout = False
 
-            self.add_widget(
-                widget_type=widget_data.get('type'),
-                topic=widget_data.get('topic'),
-                x=widget_data.get('x'),
-                y=widget_data.get('y'),
-                width=widget_data.get('width'),
-                height=widget_data.get('height'),
-                config=widget_data.get('config')
-            )
-        
         self.current_layout_file = file_path
         if self.main_window and hasattr(self.main_window, 'statusBar'):
             self.main_window.statusBar().showMessage(f"Layout '{os.path.basename(file_path)}' loaded", 5000)
         
         self._update_welcome_message_visibility()
 
+    def restore_autosave(self):
+        """Reload the most recent autosave of the current layout."""
+        path = self.autosaver.latest_autosave()
+        if not path:
+            return
+        layout_file = self.current_layout_file
+        self.load_layout(path)
+        # Keep pointing at the real layout so the next autosave/save targets it
+        self.current_layout_file = layout_file
+
+    def _remove_all_pages(self):
+        self.set_zoom_view(False)
+        for page in self.pages:
+            self._discard_widgets(page)
+            self._stop_alarms(page)
+        self.pages = []
+        self.current_page = None
+        self.tab_bar.blockSignals(True)
+        while self.tab_bar.count():
+            self.tab_bar.removeTab(0)
+        self.tab_bar.blockSignals(False)
+
     def clear_widgets(self):
-        """Remove all widgets from the dashboard."""
+        """Remove all widgets from the current page."""
         for widget in self.widgets[:]:
             widget.setParent(None)
             widget.deleteLater()
         self.widgets.clear()
+        self.spatial_index.clear()
         self._update_welcome_message_visibility() # Update visibility
+        self._emit_layout_changed()
 
     def show_context_menu(self, position):
         """Show context menu for the dashboard."""
@@ -318,23 +787,52 @@ class Dashboard(QWidget):
         # Normal menu when not in presentation mode
         add_action = menu.addAction("Add Widget...")
         menu.addSeparator()
+        add_page_action = menu.addAction("Add Page...")
+        rename_page_action = menu.addAction("Rename Page...")
+        remove_page_action = menu.addAction("Remove Page")
+        remove_page_action.setEnabled(len(self.pages) > 1)
+        zoom_action = menu.addAction("Zoom View")
+        zoom_action.setCheckable(True)
+        zoom_action.setChecked(self.zoom_view is not None)
+        menu.addSeparator()
         save_action = menu.addAction("Save Layout As...")
         load_action = menu.addAction("Load Layout...")
+        restore_action = menu.addAction("Restore Autosave")
         menu.addSeparator()
         clear_action = menu.addAction("Clear All Widgets")
 
         # Disable save if there's nothing to save
         save_action.setEnabled(bool(self.widgets))
         clear_action.setEnabled(bool(self.widgets))
+        restore_action.setEnabled(self.autosaver.latest_autosave() is not None)
 
         action = menu.exec(self.mapToGlobal(position))
 
         if action == add_action:
             self.show_add_widget_dialog()
+        elif action == add_page_action:
+            name, ok = QInputDialog.getText(self, "Add Page", "Page name:", text=f"Page {len(self.pages) + 1}")
+            if ok and name.strip():
+                self.add_page(name.strip())
+        elif action == rename_page_action:
+            index = self.pages.index(self.current_page)
+            name, ok = QInputDialog.getText(self, "Rename Page", "Page name:", text=self.current_page.name)
+            if ok and name.strip():
+                self.rename_page(index, name.strip())
+        elif action == remove_page_action:
+            reply = QMessageBox.question(self, 'Confirm Remove', f"Remove the page '{self.current_page.name}' and its widgets?",
+                                         QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                                         QMessageBox.StandardButton.No)
+            if reply == QMessageBox.StandardButton.Yes:
+                self.remove_page(self.pages.index(self.current_page))
+        elif action == zoom_action:
+            self.set_zoom_view(self.zoom_view is None)
         elif action == save_action:
             self.save_layout()
         elif action == load_action:
             self.load_layout()
+        elif action == restore_action:
+            self.restore_autosave()
         elif action == clear_action:
             reply = QMessageBox.question(self, 'Confirm Clear', 'Are you sure you want to remove all widgets?',
                                            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
@@ -348,8 +846,9 @@ class Dashboard(QWidget):
         if dialog.exec():
             widget_type = dialog.widget_type.currentText()
             topic = dialog.topic_edit.text()
+            broker = dialog.broker_combo.currentText() if dialog.broker_combo.count() > 1 else None
             if widget_type and topic:
-                self.add_widget(widget_type, topic)
+                self.add_widget(widget_type, topic, broker=broker)
 
 class AddWidgetDialog(QDialog):
     def __init__(self, parent=None):
@@ -385,7 +884,7 @@ class AddWidgetDialog(QDialog):
         
         self.widget_type = QComboBox()
         self.widget_type.addItems([
-            'label', 'gauge', 'gauge_circular', 'gauge_linear', 'button', 'slider', 'toggle'
+            'label', 'gauge', 'gauge_circular', 'gauge_linear', 'button', 'slider', 'toggle', 'topic_table'
         ])
         layout.addWidget(QLabel("Widget Type:"))
         layout.addWidget(self.widget_type)
@@ -394,6 +893,15 @@ class AddWidgetDialog(QDialog):
         layout.addWidget(QLabel("MQTT Topic:"))
         layout.addWidget(self.topic_edit)
 
+        # Only worth asking when more than one broker is configured
+        self.broker_combo = QComboBox()
+        connections = getattr(parent, 'connections', None)
+        if connections is not None:
+            self.broker_combo.addItems(list(connections.connections))
+        if self.broker_combo.count() > 1:
+            layout.addWidget(QLabel("Broker:"))
+            layout.addWidget(self.broker_combo)
+
         button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
         button_box.accepted.connect(self.accept)
         button_box.rejected.connect(self.reject)
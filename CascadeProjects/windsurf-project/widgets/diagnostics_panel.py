@@ -0,0 +1,186 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QGroupBox)
+from PyQt6.QtCore import Qt, QObject, QTimer
+import time
+from diagnostics.metrics import metrics
+
+# Only the busiest topics are listed; the table is rebuilt every refresh
+MAX_TOPIC_ROWS = 200
+
+
+class EventLoopLagMonitor(QObject):
+    """Measures how late a periodic QTimer fires, i.e. how long the GUI thread was busy."""
+
+    def __init__(self, interval_ms=250, parent=None):
+        super().__init__(parent)
+        self.interval_ms = interval_ms
+        self._expected = None
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self._tick)
+
+    def start(self):
+        self._expected = time.perf_counter() + self.interval_ms / 1000.0
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    def _tick(self):
+        now = time.perf_counter()
+        metrics.record_loop_lag(max(0.0, (now - self._expected) * 1000.0))
+        self._expected = now + self.interval_ms / 1000.0
+
+
+class DiagnosticsPanel(QWidget):
+    """Live runtime metrics page. Refreshes at 1 Hz, and only while visible."""
+
+    def __init__(self, dashboard=None, parent=None):
+        super().__init__(parent)
+        self.dashboard = dashboard
+        self._previous = None
+        self.init_ui()
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(1000)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+
+        self.summary_label = QLabel()
+        self.summary_label.setStyleSheet("color: #E0E0E0; font-weight: bold;")
+        layout.addWidget(self.summary_label)
+
+        topic_group = QGroupBox("Topics")
+        topic_layout = QVBoxLayout(topic_group)
+        self.topic_table = self._make_table(
+            ["Topic", "Msg/s", "Bytes/s", "Messages", "Widgets", "Parse failures", "Last seen (s ago)"])
+        topic_layout.addWidget(self.topic_table)
+        layout.addWidget(topic_group, 2)
+
+        type_group = QGroupBox("Widget types")
+        type_layout = QVBoxLayout(type_group)
+        self.type_table = self._make_table(
+            ["Type", "Dispatch/s", "Avg dispatch (µs)", "Max dispatch (µs)",
+             "Paint/s", "Avg paint (µs)", "Max paint (µs)"])
+        type_layout.addWidget(self.type_table)
+        layout.addWidget(type_group, 1)
+
+        button_layout = QHBoxLayout()
+        reset_btn = QPushButton("Reset Counters")
+        reset_btn.clicked.connect(self.reset_counters)
+        button_layout.addWidget(reset_btn)
+        button_layout.addStretch()
+        layout.addLayout(button_layout)
+
+    def _make_table(self, headers):
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.verticalHeader().setVisible(False)
+        table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        return table
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._previous = metrics.snapshot()
+        self.refresh()
+        self.refresh_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.refresh_timer.stop()
+
+    def reset_counters(self):
+        metrics.reset()
+        self._previous = metrics.snapshot()
+        self.refresh()
+
+    def _widget_counts(self):
+        counts = {}
+        if self.dashboard is None:
+            return counts
+        for widget in self.dashboard.live_widgets():
+            topics = {widget.topic}
+            for key in ('toggle_input_topic', 'button_input_topic'):
+                extra = widget.config.get(key)
+                if extra:
+                    topics.add(extra.strip())
+            for topic in topics:
+                counts[topic] = counts.get(topic, 0) + 1
+        return counts
+
+    def refresh(self):
+        current = metrics.snapshot()
+        previous = self._previous or current
+        elapsed = max(1e-6, current['time'] - previous['time'])
+        self._previous = current
+
+        self.summary_label.setText(
+            f"Messages: {current['received']} (dropped {current['dropped']})   "
+            f"Reconnects: {current['reconnects']}   "
+            f"Queue depth (network → GUI): {current['queue_depth']}   "
+            f"Event-loop lag: {current['loop_lag_ms']:.1f} ms (max {current['loop_lag_max_ms']:.1f} ms)"
+        )
+        self._fill_topics(current, previous, elapsed)
+        self._fill_types(current, previous, elapsed)
+
+    def _fill_topics(self, current, previous, elapsed):
+        widget_counts = self._widget_counts()
+        now = time.time()
+        rows = []
+        for topic, (messages, nbytes, failures, last_seen) in current['topics'].items():
+            prev_messages, prev_bytes, _, _ = previous['topics'].get(topic, (0, 0, 0, 0))
+            rows.append((
+                topic,
+                (messages - prev_messages) / elapsed,
+                (nbytes - prev_bytes) / elapsed,
+                messages,
+                widget_counts.get(topic, 0),
+                failures,
+                now - last_seen if last_seen else None,
+            ))
+        # Subscribed topics that never received anything are interesting too
+        for topic, count in widget_counts.items():
+            if topic not in current['topics']:
+                rows.append((topic, 0.0, 0.0, 0, count, 0, None))
+        rows.sort(key=lambda row: (row[1], row[3]), reverse=True)
+        self._fill_table(self.topic_table, rows[:MAX_TOPIC_ROWS],
+                         ["{}", "{:.1f}", "{:.0f}", "{}", "{}", "{}", "{:.1f}"])
+
+    def _fill_types(self, current, previous, elapsed):
+        kinds = sorted(set(current['dispatch']) | set(current['paint']))
+        rows = []
+        for kind in kinds:
+            d_count, d_total, d_max = current['dispatch'].get(kind, (0, 0, 0))
+            p_count, p_total, p_max = current['paint'].get(kind, (0, 0, 0))
+            d_prev = previous['dispatch'].get(kind, (0, 0, 0))
+            p_prev = previous['paint'].get(kind, (0, 0, 0))
+            rows.append((
+                kind,
+                (d_count - d_prev[0]) / elapsed,
+                d_total / d_count / 1000 if d_count else 0.0,
+                d_max / 1000,
+                (p_count - p_prev[0]) / elapsed,
+                p_total / p_count / 1000 if p_count else 0.0,
+                p_max / 1000,
+            ))
+        self._fill_table(self.type_table, rows,
+                         ["{}", "{:.1f}", "{:.1f}", "{:.0f}", "{:.1f}", "{:.1f}", "{:.0f}"])
+
+    def _fill_table(self, table, rows, formats):
+        table.setUpdatesEnabled(False)
+        table.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            for c, (value, fmt) in enumerate(zip(row, formats)):
+                text = "-" if value is None else fmt.format(value)
+                item = table.item(r, c)
+                if item is None:
+                    item = QTableWidgetItem()
+                    if c > 0:
+                        item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                    table.setItem(r, c, item)
+                if item.text() != text:
+                    item.setText(text)
+        table.setUpdatesEnabled(True)
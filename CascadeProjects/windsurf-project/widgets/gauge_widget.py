@@ -2,8 +2,13 @@ from PyQt6.QtWidgets import QWidget, QLabel, QVBoxLayout
 from PyQt6.QtGui import QPainter, QColor, QPen, QBrush
 from PyQt6.QtCore import Qt, QRect
 from .resizable_widget import ResizableWidget
+from .widget_config import GaugeConfig
+from diagnostics.metrics import metrics, timed_dispatch, timed_paint, profiled
 
 class GaugeWidget(ResizableWidget):
+    config_class = GaugeConfig
+    canvas_drawn = True
+
     def __init__(self, topic, mqtt_client=None, parent=None, config=None):
         super().__init__(config.get('type', 'gauge'), topic, mqtt_client, parent, config)
         self.value = 0.0
@@ -35,22 +40,35 @@ class GaugeWidget(ResizableWidget):
     def connect_signals(self):
         if self.mqtt_client:
             print(f"[DEBUG] GaugeWidget subscribing to topic: {self.topic}")
-            self.mqtt_client.subscribe(self.topic)
-            self.mqtt_client.message_received.connect(self.on_message_received)
+            self.listen(self.topic)
 
+    @timed_dispatch
     def on_message_received(self, topic, message):
         if topic == self.topic:
             try:
                 print(f"[DEBUG] GaugeWidget received: topic={topic}, message={message}")
-                self.value = float(message)
+                message = self.payload_for(topic, message)
+                if message is None:
+                    return
+                self.trace_once("widget.first_value", topic=topic)
+                if self.window_stats is None:
+                    self.value = self.numeric_payload(topic, message)
+                else:
+                    value = self.aggregate_payload(topic, message)
+                    if value is None:
+                        return
+                    self.value = value
+                self.report_alarm_value(self.value)
                 self.value_label.setText(self.format_value(self.value))
                 if self.error_state: self.clear_error()
                 self.gauge_painter.update()
             except (ValueError, TypeError):
+                metrics.record_parse_failure(topic)
                 self.show_error(f"Invalid payload: '{message}'")
             except RuntimeError:
                 pass # Widget might be deleted
 
+    @profiled('apply_config')
     def apply_config(self):
         super().apply_config()
         self.title_label.hide() # Hide ResizableWidget's title
@@ -58,20 +76,35 @@ class GaugeWidget(ResizableWidget):
         self.title_label_internal.setText(self.config.get('display_name', self.topic))
         self.value_label.setText(self.format_value(self.value))
 
-        text_color = self.config.get('text_color', '#D9D9D9')
-        font_size = int(self.config.get('font_size', 12))
+        text_color = self.options.text_color
+        font_size = self.options.font_size
         self.title_label_internal.setStyleSheet(f"color: {text_color}; font-size: {max(10, font_size - 2)}px; font-weight: bold;")
         self.value_label.setStyleSheet(f"color: {text_color}; font-size: {font_size}px;")
 
         # Show/hide value label based on config
-        show_text = self.config.get('show_text', True)
-        if show_text:
+        if self.options.show_text:
             self.value_label.show()
         else:
             self.value_label.hide()
 
         self.gauge_painter.update()
 
+    def show_aggregate(self, value):
+        self.value = value
+        self.report_alarm_value(self.value)
+        self.value_label.setText(self.format_value(self.value))
+        self.gauge_painter.update()
+
+    def on_alarm_changed(self):
+        self.gauge_painter.update()
+
+    def canvas_content(self):
+        options = self.options
+        text = self.value_label.text() if options.show_text else ''
+        return (options.kind, self.config.get('display_name', self.topic), text, options.fraction(self.value),
+                self.get_warning_color(self.value) or options.accent_color,
+                options.text_color, options.font_size)
+
     def get_value(self):
         return str(self.value)
 
@@ -80,25 +113,24 @@ class GaugePainter(QWidget):
         super().__init__(parent_widget)
         self.parent_widget = parent_widget
 
+    @timed_paint
     def paintEvent(self, event):
         painter = QPainter(self)
         try:
             painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-            config = self.parent_widget.config
+            options = self.parent_widget.options
             value = self.parent_widget.value
             
-            gauge_type = config.get('type', 'gauge')
-            min_val = float(config.get('min_value', 0.0))
-            max_val = float(config.get('max_value', 100.0))
-            accent_color = config.get('accent_color', '#0d6efd')
+            min_val, max_val = options.min_value, options.max_value
+            accent_color = options.accent_color
             warning_color = self.parent_widget.get_warning_color(value)
             
             rect = self.rect()
             center = rect.center()
 
-            if gauge_type == 'gauge_circular':
+            if options.kind == 'circular':
                 self.draw_circular_gauge(painter, rect, center, value, min_val, max_val, accent_color, warning_color)
-            elif gauge_type == 'gauge_linear':
+            elif options.kind == 'linear':
                 self.draw_linear_gauge(painter, rect, center, value, min_val, max_val, accent_color, warning_color)
             else:
                 self.draw_arc_gauge(painter, rect, center, value, min_val, max_val, accent_color, warning_color)
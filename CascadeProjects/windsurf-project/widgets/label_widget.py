@@ -2,9 +2,14 @@ from PyQt6.QtWidgets import QLabel, QHBoxLayout
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QPixmap
 from .resizable_widget import ResizableWidget
+from .widget_config import LabelConfig
+from diagnostics.metrics import timed_dispatch, profiled
 from pathlib import Path
 
 class LabelWidget(ResizableWidget):
+    config_class = LabelConfig
+    canvas_drawn = True
+
     def __init__(self, topic, mqtt_client=None, parent=None, config=None):
         super().__init__("label", topic, mqtt_client, parent, config)
         self.init_content()
@@ -42,14 +47,22 @@ class LabelWidget(ResizableWidget):
         """Connect MQTT signals."""
         if self.mqtt_client:
             print(f"[DEBUG] LabelWidget subscribing to topic: {self.topic}")
-            self.mqtt_client.subscribe(self.topic)
-            self.mqtt_client.message_received.connect(self.on_message_received)
+            self.listen(self.topic)
 
+    @timed_dispatch
     def on_message_received(self, topic, message):
         """Handle incoming MQTT messages"""
         if topic == self.topic:
             try:
                 print(f"[DEBUG] LabelWidget received: topic={topic}, message={message}")
+                message = self.payload_for(topic, message)
+                if message is None:
+                    return
+                message = self.aggregate_payload(topic, message)
+                if message is None:
+                    return
+                self.report_alarm_value(message)
+                self.trace_once("widget.first_value", topic=topic)
                 formatted_value = self.format_value(message)
                 self.value_label.setText(formatted_value)
                 if self.error_state:
@@ -57,17 +70,15 @@ class LabelWidget(ResizableWidget):
             except Exception as e:
                 self.show_error(f"Failed to display value: {e}")
 
+    @profiled('apply_config')
     def apply_config(self):
         """Apply configuration to the widget."""
         super().apply_config()
 
-        text_color = self.config.get('text_color', '#D9D9D9')
-        font_size = int(self.config.get('font_size', 16))
-        self.value_label.setStyleSheet(f"color: {text_color}; font-size: {font_size}px; font-weight: bold;")
+        self._update_value_style()
 
         # Show/hide value label based on config
-        show_text = self.config.get('show_text', True)
-        if show_text:
+        if self.options.show_text:
             self.value_label.show()
         else:
             self.value_label.hide()
@@ -75,12 +86,21 @@ class LabelWidget(ResizableWidget):
         # Update icon display for left/right positions
         self._update_content_icon()
 
+    def _update_value_style(self):
+        # Alarm color (from the alarm engine) overrides the text color
+        text_color = self.get_warning_color() or self.options.text_color
+        font_size = self.options.font_size
+        self.value_label.setStyleSheet(f"color: {text_color}; font-size: {font_size}px; font-weight: bold;")
+
+    def on_alarm_changed(self):
+        self._update_value_style()
+
     def _update_content_icon(self):
         """Update icon display for left/right positions"""
         icon_data = self.config.get('icon_data', '')
         is_text = self.config.get('icon_is_text', False)
         icon_size = self.config.get('icon_size', 24)
-        icon_position = self.config.get('icon_position', 'left')
+        icon_position = self.options.icon_position
 
         # Hide both icons first
         self.icon_label_left.hide()
@@ -123,6 +143,16 @@ class LabelWidget(ResizableWidget):
 
         icon_label.show()
 
+    def show_aggregate(self, value):
+        self.report_alarm_value(value)
+        self.value_label.setText(self.format_value(value))
+
+    def canvas_content(self):
+        options = self.options
+        text = self.value_label.text() if options.show_text else ''
+        return ('text', '', text, None, self.get_warning_color() or options.text_color, options.text_color,
+                options.font_size)
+
     def get_value(self):
         """Return the current value of the widget"""
         return self.value_label.text()
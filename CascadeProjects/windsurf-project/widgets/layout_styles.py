@@ -0,0 +1,155 @@
+"""
+Shared style classes for the layout file format.
+
+A layout may define named config blocks once and let widgets reference them:
+
+    {
+        "styles": {
+            "energy_gauge": {"bg_color": "#ffffff", "unit": "W", "max_value": 10000.0, ...}
+        },
+        "widgets": [
+            {"type": "gauge", "topic": "total_effekt", "style": "energy_gauge",
+             "config": {"display_name": "Total Effekt"}}
+        ]
+    }
+
+At load time each style becomes one read-only mapping shared by every widget
+that uses it, and the widget's own config is a ChainMap with the sparse
+per-widget overrides in front. Writes (customization dialog, themes, opacity)
+land in the override dict, so the shared defaults are never touched.
+Plain layouts (a list or `widgets` without `style`) keep working unchanged.
+"""
+from collections import ChainMap
+from types import MappingProxyType
+import json
+
+# Keys that identify a single widget and are never worth sharing in a style class
+INSTANCE_KEYS = ('display_name', 'description')
+
+# Minimum number of widgets with an identical config before save_layout extracts a style
+MIN_STYLE_USERS = 2
+
+
+def build_styles(raw_styles):
+    """Turn the `styles` section of a layout into shared read-only mappings."""
+    styles = {}
+    if not isinstance(raw_styles, dict):
+        return styles
+    for name, values in raw_styles.items():
+        if isinstance(values, dict):
+            styles[name] = MappingProxyType(dict(values))
+        else:
+            print(f"Skipping invalid style class '{name}' (not a dict)")
+    return styles
+
+
+def resolve_config(widget_data, styles):
+    """Return the config for a widget entry, layered on its style class if it has one."""
+    own = widget_data.get('config') or {}
+    style_name = widget_data.get('style')
+    if not style_name:
+        return own
+    style = styles.get(style_name)
+    if style is None:
+        print(f"Unknown style class '{style_name}', using widget config only")
+        return own
+    # Drop overrides that merely repeat the shared value
+    deltas = {k: v for k, v in own.items() if k not in style or style[k] != v}
+    return ChainMap(deltas, style)
+
+
+def style_of(config):
+    """Return the shared style mapping behind a resolved config, or None."""
+    if isinstance(config, ChainMap) and len(config.maps) > 1:
+        return config.maps[-1]
+    return None
+
+
+def config_deltas(config):
+    """Return only the keys of a resolved config that differ from its style class."""
+    style = style_of(config)
+    if style is None:
+        return dict(config)
+    deltas = {}
+    for overrides in config.maps[:-1]:
+        for key, value in overrides.items():
+            if key not in deltas and (key not in style or style[key] != value):
+                deltas[key] = value
+    return deltas
+
+
+def _style_signature(config):
+    shared = {k: v for k, v in config.items() if k not in INSTANCE_KEYS}
+    return json.dumps(shared, sort_keys=True, default=str)
+
+
+def compact_layout(entries, style_names=None):
+    """
+    Build the compact layout document from per-widget entries.
+
+    entries is a list of dicts with the usual type/topic/x/y/width/height keys plus
+    'config' (a plain dict or a resolved ChainMap). Widgets that came from a style
+    class keep it and only store their deltas. Widgets with plain configs are
+    grouped by identical config (ignoring INSTANCE_KEYS) and groups of at least
+    MIN_STYLE_USERS widgets get a new style class.
+
+    style_names maps id(style mapping) -> name for styles loaded from the file, so
+    names survive a load/save round trip.
+    """
+    style_names = dict(style_names or {})
+    styles = {}
+    widgets = []
+
+    # Styles that were loaded from the file
+    for entry in entries:
+        style = style_of(entry['config'])
+        if style is not None and id(style) in style_names:
+            styles.setdefault(style_names[id(style)], dict(style))
+
+    # Group plain configs into new style classes
+    groups = {}
+    for index, entry in enumerate(entries):
+        config = entry['config']
+        if style_of(config) is None and config:
+            groups.setdefault((entry['type'], _style_signature(config)), []).append(index)
+
+    new_style_for = {}
+    counter = 1
+    for (widget_type, _), indexes in groups.items():
+        if len(indexes) < MIN_STYLE_USERS:
+            continue
+        sample = entries[indexes[0]]['config']
+        shared = {k: v for k, v in sample.items() if k not in INSTANCE_KEYS}
+        if not shared:
+            continue
+        name = f"{widget_type}_{counter}"
+        while name in styles:
+            counter += 1
+            name = f"{widget_type}_{counter}"
+        counter += 1
+        styles[name] = shared
+        for index in indexes:
+            new_style_for[index] = name
+
+    for index, entry in enumerate(entries):
+        data = {k: v for k, v in entry.items() if k != 'config'}
+        config = entry['config']
+        style = style_of(config)
+        if index in new_style_for:
+            name = new_style_for[index]
+            data['style'] = name
+            shared = styles[name]
+            deltas = {k: v for k, v in config.items() if k not in shared or shared[k] != v}
+        elif style is not None and id(style) in style_names:
+            data['style'] = style_names[id(style)]
+            deltas = config_deltas(config)
+        else:
+            deltas = dict(config)
+        if deltas:
+            data['config'] = deltas
+        widgets.append(data)
+
+    layout = {'widgets': widgets}
+    if styles:
+        layout = {'styles': styles, 'widgets': widgets}
+    return layout
@@ -0,0 +1,288 @@
+"""
+Lite tiles: labels and gauges as one self-painting widget each.
+
+A LabelWidget is a QFrame holding a background container with a drop
+shadow, three layouts, title/icon/error labels, a close button and its own
+value and icon labels, most of them with a stylesheet; a GaugeWidget has a
+similar tree plus a painter widget. With the 'tile_mode' setting at 'lite'
+the dashboard creates LiteLabel and LiteGauge instead: a single QFrame with
+no children that paints background, border, header icon and title, close
+glyph, content and error state in its paintEvent. The content is drawn by
+the canvas backend's shared CanvasPainter (widgets/canvas.py) from the same
+canvas_content() tuple, so colors, fonts and text layouts are cached once
+for all tiles.
+
+The config is the same dict with the same keys; everything else
+(payload selection, formatting, aggregates, alarms, moving and resizing,
+the customization dialog, saving to the layout) is inherited from
+ResizableWidget. The drop shadow is not drawn.
+"""
+from pathlib import Path
+
+from PyQt6.QtCore import Qt, QRect, QRectF
+from PyQt6.QtGui import QPainter, QColor, QPen, QPixmap, QFont, QPalette
+from .resizable_widget import ResizableWidget
+from .canvas import shared_painter
+from .widget_config import LabelConfig, GaugeConfig
+from diagnostics.metrics import metrics, timed_dispatch, timed_paint, profiled
+
+MARGIN = 8          # background to header/content, like ResizableWidget's layout margins
+HEADER_HEIGHT = 20  # title row (the close button's height)
+ERROR_COLOR = "#dc3545"
+
+
+class LiteTile(ResizableWidget):
+    """Base of the lite tiles; subclasses provide on_message_received and canvas_content."""
+
+    show_title = True  # gauges draw their title inside the content, like GaugeWidget
+    canvas_drawn = True
+
+    def __init__(self, widget_type, topic, mqtt_client=None, parent=None, config=None):
+        super().__init__(widget_type, topic, mqtt_client, parent, config)
+        self.text = ""
+        self._title = ""
+        self._icon = None  # None, an emoji/text string or a scaled QPixmap
+
+    def init_frame(self):
+        # Everything is painted; no child widgets, layouts or stylesheets
+        pass
+
+    def connect_signals(self):
+        if self.mqtt_client:
+            self.listen(self.topic)
+
+    @profiled('apply_config')
+    def apply_config(self):
+        self.options = self.config_class.from_mapping(self.config)
+        self._title = self.config.get('display_name', '') or self.topic
+        self._icon = self._load_icon()
+        self._canvas_background = None
+        self._setup_aggregate()
+        self._setup_alarm()
+        self.update()
+
+    def _load_icon(self):
+        icon_data = self.config.get('icon_data', '')
+        if not icon_data:
+            return None
+        if self.config.get('icon_is_text', False):
+            return icon_data
+        icon_size = self.config.get('icon_size', 24)
+        if Path(icon_data).exists():
+            pixmap = QPixmap(icon_data)
+            if not pixmap.isNull():
+                return pixmap.scaled(icon_size, icon_size, Qt.AspectRatioMode.KeepAspectRatio,
+                                     Qt.TransformationMode.SmoothTransformation)
+        return None
+
+    def show_value(self, value):
+        self.report_alarm_value(value)
+        self.text = self.format_value(value)
+        self.update()
+
+    def show_aggregate(self, value):
+        self.show_value(value)
+
+    def show_error(self, message):
+        self.error_state, self.error_message = True, message
+        self.setToolTip(f"Error: {message}")
+        self.update()
+
+    def clear_error(self):
+        if not self.error_state: return
+        self.error_state, self.error_message = False, ""
+        self.setToolTip("")
+        self.update()
+
+    def set_presentation_mode(self, enabled):
+        self.presentation_mode = enabled
+        if enabled:
+            self.setWindowFlags(self.windowFlags() | Qt.WindowType.WindowTransparentForInput)
+        else:
+            self.setWindowFlags(self.windowFlags() & ~Qt.WindowType.WindowTransparentForInput)
+        self.setMouseTracking(not enabled)
+        self.setCursor(Qt.CursorShape.ArrowCursor)
+        self.update()
+
+    def get_value(self):
+        return self.text
+
+    # --- painting -----------------------------------------------------------
+
+    def _header_height(self):
+        if isinstance(self._icon, QPixmap):
+            return max(HEADER_HEIGHT, self._icon.height())
+        if self._icon:
+            return max(HEADER_HEIGHT, self.config.get('icon_size', 24) + 4)
+        return HEADER_HEIGHT
+
+    def _close_rect(self):
+        return QRect(self.width() - MARGIN - HEADER_HEIGHT, MARGIN, HEADER_HEIGHT, HEADER_HEIGHT)
+
+    @timed_paint
+    def paintEvent(self, event):
+        self.trace_once("widget.first_paint", type=self.widget_type, topic=self.topic)
+        painter = QPainter(self)
+        try:
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            options = self.options
+            background, radius = self.canvas_background()
+            rect = QRectF(self.rect())
+            if self.presentation_mode:
+                painter.setPen(Qt.PenStyle.NoPen)
+            else:
+                border_width = options.border_width
+                border_color = ERROR_COLOR if self.error_state else options.border_color
+                painter.setPen(QPen(QColor(border_color), border_width) if border_width else Qt.PenStyle.NoPen)
+                rect.adjust(border_width / 2, border_width / 2, -border_width / 2, -border_width / 2)
+            painter.setBrush(QColor.fromRgba(background))
+            painter.drawRoundedRect(rect, radius, radius)
+
+            content = QRectF(self.rect()).adjusted(MARGIN, MARGIN, -MARGIN, -MARGIN)
+            if not self.presentation_mode:
+                header_height = self._header_height()
+                self._paint_header(painter, QRectF(content.x(), content.y(), content.width(), header_height))
+                content.setTop(content.top() + header_height + 4)
+            content.adjust(4, 4, -4, -4)
+            if self.error_state:
+                painter.setPen(QColor(options.text_color))
+                painter.drawText(content, Qt.AlignmentFlag.AlignCenter | Qt.TextFlag.TextWordWrap, "⚠️\nInvalid Data")
+            elif content.width() > 0 and content.height() > 0:
+                self.paint_content(painter, content)
+        finally:
+            painter.end()
+
+    def _paint_header(self, painter, header):
+        x = header.x()
+        if self._icon is not None:
+            width = self._paint_icon(painter, QRectF(x, header.y(), header.height(), header.height()))
+            x += width + 4
+        text_color = self.palette().color(QPalette.ColorRole.WindowText)
+        painter.setPen(text_color)
+        if self.show_title:
+            title_rect = QRectF(x, header.y(), header.right() - HEADER_HEIGHT - x - 4, header.height())
+            painter.setFont(self.font())
+            title = painter.fontMetrics().elidedText(self._title, Qt.TextElideMode.ElideRight, int(title_rect.width()))
+            painter.drawText(title_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, title)
+        painter.drawText(QRectF(self._close_rect()), Qt.AlignmentFlag.AlignCenter, "×")
+
+    def _paint_icon(self, painter, rect):
+        """Draw the icon at rect's left edge; returns the width it took"""
+        icon = self._icon
+        if isinstance(icon, QPixmap):
+            painter.drawPixmap(int(rect.x()), int(rect.center().y() - icon.height() / 2), icon)
+            return icon.width()
+        icon_size = self.config.get('icon_size', 24)
+        font = QFont(self.font())
+        font.setPixelSize(max(1, int(icon_size)))
+        painter.setFont(font)
+        painter.setPen(QColor(self.options.text_color))
+        painter.drawText(QRectF(rect.x(), rect.y(), icon_size + 4, rect.height()), Qt.AlignmentFlag.AlignCenter, icon)
+        return icon_size + 4
+
+    def paint_content(self, painter, rect):
+        # Background 0: the tile has painted its own
+        shared_painter().paint(painter, [(rect.getRect(), (0, 0) + self.canvas_content())])
+
+    def mousePressEvent(self, event):
+        if (not self.presentation_mode and event.button() == Qt.MouseButton.LeftButton
+                and self._close_rect().contains(event.position().toPoint())):
+            self.safe_delete()
+            return
+        super().mousePressEvent(event)
+
+
+class LiteLabel(LiteTile):
+    config_class = LabelConfig
+
+    def __init__(self, topic, mqtt_client=None, parent=None, config=None):
+        super().__init__("label", topic, mqtt_client, parent, config)
+        self.text = "0"
+        self.connect_signals()
+        self.apply_config()
+
+    @timed_dispatch
+    def on_message_received(self, topic, message):
+        if topic == self.topic:
+            try:
+                message = self.payload_for(topic, message)
+                if message is None:
+                    return
+                message = self.aggregate_payload(topic, message)
+                if message is None:
+                    return
+                self.trace_once("widget.first_value", topic=topic)
+                self.show_value(message)
+                if self.error_state:
+                    self.clear_error()
+            except Exception as e:
+                self.show_error(f"Failed to display value: {e}")
+
+    def canvas_content(self):
+        options = self.options
+        text = self.text if options.show_text else ''
+        return ('text', '', text, None, self.get_warning_color() or options.text_color, options.text_color,
+                options.font_size)
+
+    def paint_content(self, painter, rect):
+        # The content icon sits left or right of the value, like LabelWidget's icon labels
+        position = self.options.icon_position
+        if self._icon is not None and position in ('left', 'right'):
+            icon_width = self._icon.width() if isinstance(self._icon, QPixmap) else self.config.get('icon_size', 24) + 4
+            if position == 'left':
+                self._paint_icon(painter, rect)
+                rect = rect.adjusted(icon_width + 4, 0, 0, 0)
+            else:
+                self._paint_icon(painter, QRectF(rect.right() - icon_width, rect.y(), icon_width, rect.height()))
+                rect = rect.adjusted(0, 0, -(icon_width + 4), 0)
+        super().paint_content(painter, rect)
+
+
+class LiteGauge(LiteTile):
+    config_class = GaugeConfig
+    show_title = False
+
+    def __init__(self, topic, mqtt_client=None, parent=None, config=None):
+        super().__init__(config.get('type', 'gauge'), topic, mqtt_client, parent, config)
+        self.value = 0.0
+        self.connect_signals()
+        self.apply_config()
+
+    @timed_dispatch
+    def on_message_received(self, topic, message):
+        if topic == self.topic:
+            try:
+                message = self.payload_for(topic, message)
+                if message is None:
+                    return
+                self.trace_once("widget.first_value", topic=topic)
+                if self.window_stats is None:
+                    value = self.numeric_payload(topic, message)
+                else:
+                    value = self.aggregate_payload(topic, message)
+                    if value is None:
+                        return
+                self.show_value(value)
+                if self.error_state: self.clear_error()
+            except (ValueError, TypeError):
+                metrics.record_parse_failure(topic)
+                self.show_error(f"Invalid payload: '{message}'")
+
+    def show_value(self, value):
+        self.value = value
+        super().show_value(value)
+
+    @profiled('apply_config')
+    def apply_config(self):
+        super().apply_config()
+        self.text = self.format_value(self.value)
+
+    def canvas_content(self):
+        options = self.options
+        text = self.text if options.show_text else ''
+        return (options.kind, self.config.get('display_name', self.topic), text, options.fraction(self.value),
+                self.get_warning_color(self.value) or options.accent_color,
+                options.text_color, options.font_size)
+
+    def get_value(self):
+        return str(self.value)
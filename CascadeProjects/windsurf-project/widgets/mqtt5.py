@@ -0,0 +1,160 @@
+"""
+MQTT v5 features used by MQTTClient when a connection has "mqtt_version": 5.
+
+    receive_maximum       sent in CONNECT: how many QoS 1/2 messages the broker
+                          may have in flight to us (0 = not sent, broker default)
+    maximum_packet_size   sent in CONNECT: the broker drops larger messages
+                          instead of sending them (0 = not sent, no limit)
+
+From the CONNACK we take the broker's own limits (negotiated_limits): its
+receive maximum caps our in-flight QoS 1/2 publishes (from the next connect on,
+as paho fixes that limit while connected), its maximum packet size
+is checked before publishing, its topic alias maximum enables TopicAliases and
+its subscription identifier support enables SubscriptionIds.
+
+Topic aliases replace a long topic by a 2-byte number on every publish after
+the first; they are assigned to topics that are published repeatedly (QoS 0
+only, since the mapping doesn't survive a reconnect that would resend QoS 1/2
+packets). Subscription identifiers tag each subscription, so an incoming
+message says which subscriptions it matched and MQTTClient can hand it to
+their listeners without matching the topic against wildcard filters.
+"""
+# Defaults when the CONNACK leaves a property out (MQTT 5.0, 3.2.2.3)
+_CONNACK_DEFAULTS = {
+    'ReceiveMaximum': 65535,
+    'MaximumQoS': 2,
+    'RetainAvailable': 1,
+    'MaximumPacketSize': None,  # no limit
+    'TopicAliasMaximum': 0,
+    'WildcardSubscriptionAvailable': 1,
+    'SubscriptionIdentifierAvailable': 1,
+    'SharedSubscriptionAvailable': 1,
+    'ServerKeepAlive': None,
+}
+
+# Only topics at least this long, published at least this often, get an alias
+ALIAS_MIN_LENGTH = 16
+ALIAS_MIN_USES = 2
+
+MAX_SUBSCRIPTION_ID = 268435455
+
+# paho's own default for in-flight QoS 1/2 messages
+DEFAULT_INFLIGHT = 20
+
+
+def connect_properties(receive_maximum=0, maximum_packet_size=0):
+    """CONNECT properties for our limits, or None if neither is set"""
+    if not receive_maximum and not maximum_packet_size:
+        return None
+    from paho.mqtt.properties import Properties
+    from paho.mqtt.packettypes import PacketTypes
+    properties = Properties(PacketTypes.CONNECT)
+    if receive_maximum:
+        properties.ReceiveMaximum = int(receive_maximum)
+    if maximum_packet_size:
+        properties.MaximumPacketSize = int(maximum_packet_size)
+    return properties
+
+
+def negotiated_limits(properties):
+    """The broker's limits from CONNACK properties, with the protocol defaults filled in"""
+    limits = dict(_CONNACK_DEFAULTS)
+    for name in limits:
+        value = getattr(properties, name, None) if properties is not None else None
+        if value is not None:
+            limits[name] = value
+    return limits
+
+
+def describe_limits(limits, receive_maximum=0, maximum_packet_size=0):
+    """One line for the connection panel"""
+    if not limits:
+        return "MQTT 3.1.1: no negotiated limits"
+    packet = limits['MaximumPacketSize']
+    parts = [
+        f"receive max {limits['ReceiveMaximum']}" + (f" (ours {receive_maximum})" if receive_maximum else ""),
+        f"max packet {packet} B" if packet else "max packet unlimited",
+        f"topic aliases {limits['TopicAliasMaximum']}",
+        f"subscription ids {'yes' if limits['SubscriptionIdentifierAvailable'] else 'no'}",
+        f"max QoS {limits['MaximumQoS']}",
+    ]
+    if maximum_packet_size:
+        parts[1] += f" (ours {maximum_packet_size} B)"
+    return "MQTT 5: " + ", ".join(parts)
+
+
+def publish_properties(alias):
+    from paho.mqtt.properties import Properties
+    from paho.mqtt.packettypes import PacketTypes
+    properties = Properties(PacketTypes.PUBLISH)
+    properties.TopicAlias = alias
+    return properties
+
+
+def subscribe_properties(subscription_id):
+    from paho.mqtt.properties import Properties
+    from paho.mqtt.packettypes import PacketTypes
+    properties = Properties(PacketTypes.SUBSCRIBE)
+    properties.SubscriptionIdentifier = subscription_id
+    return properties
+
+
+def packet_size(topic, payload, qos=0):
+    """Approximate PUBLISH packet size, for the broker's maximum packet size"""
+    length = 2 + len(topic.encode('utf-8')) + len(payload) + (2 if qos else 0) + 5  # + properties
+    return 1 + (1 if length < 128 else 2 if length < 16384 else 3 if length < 2097152 else 4) + length
+
+
+class TopicAliases:
+    """Outbound topic aliases for one connection; replaced on every connect."""
+
+    def __init__(self, maximum=0):
+        self.maximum = maximum
+        self.aliases = {}  # topic -> alias
+        self.next_alias = 1
+        self.counts = {}   # topic -> publishes so far, until it gets an alias
+
+    def resolve(self, topic):
+        """(topic to send, alias or None). The first publish with a new alias carries the full
+        topic, which tells the broker the mapping; later ones send an empty topic."""
+        alias = self.aliases.get(topic)
+        if alias is not None:
+            return "", alias
+        if self.next_alias > self.maximum or len(topic) < ALIAS_MIN_LENGTH:
+            return topic, None
+        count = self.counts.get(topic, 0) + 1
+        if count < ALIAS_MIN_USES:
+            if len(self.counts) > 1024:
+                self.counts.clear()
+            self.counts[topic] = count
+            return topic, None
+        self.counts.pop(topic, None)
+        alias = self.aliases[topic] = self.next_alias
+        self.next_alias += 1
+        return topic, alias
+
+    def forget(self, topic):
+        """Drop an alias whose first publish didn't go out (the broker never learned it)"""
+        self.aliases.pop(topic, None)
+
+
+class SubscriptionIds:
+    """Subscription identifier per topic filter, and back."""
+
+    def __init__(self):
+        self.ids = {}      # filter -> id
+        self.filters = {}  # id -> filter
+
+    def id_for(self, topic_filter):
+        subscription_id = self.ids.get(topic_filter)
+        if subscription_id is None:
+            subscription_id = len(self.ids) + 1
+            if subscription_id > MAX_SUBSCRIPTION_ID:
+                return None
+            self.ids[topic_filter] = subscription_id
+            self.filters[subscription_id] = topic_filter
+        return subscription_id
+
+    def filters_for(self, subscription_ids):
+        """Topic filters for the identifiers on an incoming PUBLISH"""
+        return tuple(self.filters[i] for i in subscription_ids if i in self.filters)
@@ -0,0 +1,179 @@
+"""
+MQTT transport driven by the Qt event loop instead of paho's loop_start() thread.
+
+paho's external-loop API (loop_read / loop_write / loop_misc and the
+on_socket_* callbacks) is hooked up to QSocketNotifiers and a QTimer, so
+packets are read and on_message runs on the GUI thread: message_received is
+delivered as a direct call instead of a queued signal from the network
+thread, and there is no second thread competing for the GIL. Each time the
+socket becomes readable, up to BATCH_SIZE packets that are already buffered
+are processed before returning to the event loop.
+
+Only the blocking part of connecting (DNS lookup, TCP connect, TLS
+handshake) runs on a short-lived worker thread, so an unreachable broker
+never freezes the window. Reconnects back off between the connection's
+reconnect_delay bounds, like paho's own loop does.
+
+Selected with "mqtt_transport": "qt" in the settings (or "transport": "qt" on
+an entry of 'brokers'); "thread" is the default.
+"""
+import select
+import threading
+
+from PyQt6.QtCore import QObject, QSocketNotifier, QTimer, pyqtSignal
+
+TRANSPORTS = ('thread', 'qt')
+
+# Packets processed per read notification before yielding to the event loop
+BATCH_SIZE = 64
+
+
+def _has_buffered_data(sock):
+    pending = getattr(sock, 'pending', None)  # TLS: decrypted bytes already read from the socket
+    if pending is not None and pending():
+        return True
+    try:
+        return bool(select.select([sock], [], [], 0)[0])
+    except (OSError, ValueError):
+        return False
+
+
+class QtSocketLoop(QObject):
+    """Runs one paho client on the Qt event loop. Create it after configuring the client, then connect()."""
+    # paho calls the socket callbacks on the connect worker thread too; these
+    # signals bring them to the GUI thread (direct calls when already there)
+    _socket_opened = pyqtSignal(object)
+    _socket_closed = pyqtSignal(object)
+    _write_wanted = pyqtSignal(bool)
+    _connect_failed = pyqtSignal(str)
+
+    def __init__(self, client, reconnect_delay=(1, 120), on_error=None, parent=None):
+        super().__init__(parent)
+        self.client = client
+        self.min_delay, self.max_delay = reconnect_delay
+        self.on_error = on_error  # on_error(message) when a connection attempt fails
+        self._delay = self.min_delay
+        self._stopping = False
+        self._connecting = False
+        self._host = None
+        self._properties = None
+        self._read_notifier = None
+        self._write_notifier = None
+
+        self._misc_timer = QTimer(self)
+        self._misc_timer.setInterval(1000)  # keepalive pings and timeouts
+        self._misc_timer.timeout.connect(self._on_misc)
+        self._retry_timer = QTimer(self)
+        self._retry_timer.setSingleShot(True)
+        self._retry_timer.timeout.connect(self._start_connect)
+
+        self._socket_opened.connect(self._on_socket_opened)
+        self._socket_closed.connect(self._on_socket_closed)
+        self._write_wanted.connect(self._on_write_wanted)
+        self._connect_failed.connect(self._on_connect_failed)
+
+        client.on_socket_open = lambda c, userdata, sock: self._socket_opened.emit(sock)
+        client.on_socket_close = lambda c, userdata, sock: self._socket_closed.emit(sock)
+        client.on_socket_register_write = lambda c, userdata, sock: self._write_wanted.emit(True)
+        client.on_socket_unregister_write = lambda c, userdata, sock: self._write_wanted.emit(False)
+
+    def connect(self, host, port, keepalive=60, properties=None):
+        self._host = (host, port, keepalive)
+        self._properties = properties  # MQTT 5 CONNECT properties
+        self._stopping = False
+        self._delay = self.min_delay
+        self._start_connect()
+
+    def stop(self):
+        """Send DISCONNECT (if connected), close the socket and stop reconnecting"""
+        self._stopping = True
+        self._retry_timer.stop()
+        self._misc_timer.stop()
+        client = self.client
+        try:
+            if client.socket() is not None:
+                client.disconnect()
+                client.loop_write()  # flush DISCONNECT now; paho closes the socket once it is sent
+        except Exception as e:
+            print(f"[ERROR] Error while disconnecting: {e}")
+        self._remove_notifiers()
+        client.on_socket_open = client.on_socket_close = None
+        client.on_socket_register_write = client.on_socket_unregister_write = None
+
+    # --- connecting -----------------------------------------------------
+
+    def _start_connect(self):
+        if self._stopping or self._connecting or self._host is None:
+            return
+        self._connecting = True
+        threading.Thread(target=self._connect_blocking, name="mqtt-connect", daemon=True).start()
+
+    def _connect_blocking(self):
+        # Worker thread: everything after the socket exists happens on the GUI thread
+        try:
+            self.client.connect(*self._host, properties=self._properties)
+        except Exception as e:
+            self._connect_failed.emit(str(e) or type(e).__name__)
+        finally:
+            self._connecting = False
+
+    def _on_connect_failed(self, message):
+        if self._stopping:
+            return
+        print(f"[ERROR] MQTT connection attempt failed: {message} (retrying in {self._delay} s)")
+        if self.on_error is not None:
+            self.on_error(f"Error: {message}")
+        self._schedule_retry()
+
+    def _schedule_retry(self):
+        self._retry_timer.start(int(self._delay * 1000))
+        self._delay = min(self._delay * 2, self.max_delay)
+
+    # --- socket events --------------------------------------------------
+
+    def _on_socket_opened(self, sock):
+        if self._stopping or sock is not self.client.socket():
+            return
+        self._remove_notifiers()
+        fd = sock.fileno()
+        self._read_notifier = QSocketNotifier(fd, QSocketNotifier.Type.Read, self)
+        self._read_notifier.activated.connect(self._on_readable)
+        self._write_notifier = QSocketNotifier(fd, QSocketNotifier.Type.Write, self)
+        self._write_notifier.activated.connect(self._on_writable)
+        self._write_notifier.setEnabled(self.client.want_write())
+        self._misc_timer.start()
+
+    def _on_socket_closed(self, sock):
+        self._remove_notifiers()
+        self._misc_timer.stop()
+        if not self._stopping:
+            # Connection lost; paho has already reported it through on_disconnect
+            self._schedule_retry()
+
+    def _on_write_wanted(self, wanted):
+        if self._write_notifier is not None:
+            self._write_notifier.setEnabled(wanted)
+
+    def _on_readable(self):
+        client = self.client
+        for _ in range(BATCH_SIZE):
+            if client.loop_read() != 0:
+                break
+            sock = client.socket()
+            if sock is None or not _has_buffered_data(sock):
+                break
+        if self._delay != self.min_delay and client.is_connected():
+            self._delay = self.min_delay
+
+    def _on_writable(self):
+        self.client.loop_write()
+
+    def _on_misc(self):
+        self.client.loop_misc()
+
+    def _remove_notifiers(self):
+        for notifier in (self._read_notifier, self._write_notifier):
+            if notifier is not None:
+                notifier.setEnabled(False)
+                notifier.deleteLater()
+        self._read_notifier = self._write_notifier = None
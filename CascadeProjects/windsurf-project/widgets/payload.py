@@ -0,0 +1,148 @@
+"""
+Shared payload decoding for widgets.
+
+Many widgets often subscribe to the same topic, and every one of them
+receives every message. The work that only depends on the message (parsing
+JSON, converting to a number, formatting with a given unit/precision) is done
+once per message here and shared, instead of once per widget.
+
+A widget whose config has 'json_field' (e.g. "ENERGY.Power", "temperature",
+"$.sensors[0].value" or '["key.with.dots"]') displays only that field.
+Selectors are compiled once and cached, and each payload is parsed at most
+once per message: the parsed document is kept per topic and shared by every
+widget on that topic. orjson is used when installed.
+"""
+import functools
+import json
+import re
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+
+class PayloadError(ValueError):
+    """Raised when a payload is not valid JSON or a selector can't be parsed"""
+
+
+_TOKEN = re.compile(r"""
+    \.?(?P<name>[^.\[\]]+)              # .key or key
+  | \[(?P<index>-?\d+)\]                # [0]
+  | \[(?P<quote>["'])(?P<key>.*?)(?P=quote)\]   # ["key.with.dots"]
+""", re.VERBOSE)
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_selector(selector):
+    """Turn "a.b[0]" into the path ('a', 'b', 0). Cached, so every widget shares the result."""
+    text = selector.strip()
+    if text.startswith('$'):
+        text = text[1:]
+    path = []
+    pos = 0
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if match is None or match.end() == pos:
+            raise PayloadError(f"Invalid JSON field selector: '{selector}'")
+        if match.group('name') is not None:
+            path.append(match.group('name'))
+        elif match.group('index') is not None:
+            path.append(int(match.group('index')))
+        else:
+            path.append(match.group('key'))
+        pos = match.end()
+    return tuple(path)
+
+
+def select(document, path):
+    """Follow path into a parsed document. Returns None if the field is absent."""
+    value = document
+    for step in path:
+        try:
+            value = value[step]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return value
+
+
+def as_text(value):
+    """Render an extracted or decoded value the way it would look as a plain MQTT payload"""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex(' ')
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (int, float)):
+        return str(value)
+    return json.dumps(value)
+
+
+class PayloadCache:
+    """Remembers the decoded form (JSON document, number) of the latest message on each topic."""
+
+    def __init__(self):
+        self._documents = {}  # topic -> (message, document, error)
+        self._numbers = {}    # key -> (message, float value, error)
+
+    def parse(self, topic, message):
+        if not isinstance(message, str):
+            return message  # already structured (CBOR/MessagePack/struct codecs)
+        cached = self._documents.get(topic)
+        if cached is not None and cached[0] == message:
+            document, error = cached[1], cached[2]
+        else:
+            try:
+                document, error = _loads(message), None
+            except ValueError as e:
+                document, error = None, f"Payload is not JSON: {e}"
+            self._documents[topic] = (message, document, error)
+        if error:
+            raise PayloadError(error)
+        return document
+
+    def extract(self, topic, message, selector):
+        """The selected field, or None if this message doesn't contain it.
+        Strings and numbers are returned as is; other values as JSON text."""
+        path = compile_selector(selector)
+        value = select(self.parse(topic, message), path)
+        if value is None or isinstance(value, (str, int, float)):
+            return value
+        return as_text(value)
+
+    def number(self, key, message):
+        """float(message), computed once per message for key (a topic, or topic + field).
+        Raises ValueError, with the same message for every widget, if it isn't a number."""
+        cached = self._numbers.get(key)
+        if cached is None or cached[0] is not message and cached[0] != message:
+            try:
+                cached = (message, float(message), None)
+            except (ValueError, TypeError):
+                cached = (message, None, f"Invalid payload: '{message}'")
+            self._numbers[key] = cached
+        if cached[2] is not None:
+            raise ValueError(cached[2])
+        return cached[1]
+
+    def forget(self, topic):
+        self._documents.pop(topic, None)
+        for key in [key for key in self._numbers if key == topic or (isinstance(key, tuple) and key[0] == topic)]:
+            del self._numbers[key]
+
+
+@functools.lru_cache(maxsize=4096)
+def format_number(value, factor, offset, decimal_places, unit):
+    """Format a payload value; widgets with the same settings share the resulting string."""
+    try:
+        converted_value = float(value) * factor + offset
+        formatted = f"{converted_value:.{decimal_places}f}"
+        if unit: formatted += f" {unit}"
+        return formatted
+    except (ValueError, TypeError):
+        if unit: return f"{value} {unit}"
+        return str(value)
+
+
+payloads = PayloadCache()
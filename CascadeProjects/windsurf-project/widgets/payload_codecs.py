@@ -0,0 +1,138 @@
+"""
+Per-topic payload codecs, applied in MQTTClient.on_message on the network thread.
+
+Rules come from the 'payload_codecs' setting, first match wins:
+
+    "payload_codecs": [
+        {"pattern": "sensors/+/packed", "codec": "struct", "format": "<hfI"},
+        {"pattern": "zigbee/#", "codec": "msgpack"},
+        {"pattern": "cam/+/snapshot", "codec": "raw"}
+    ]
+
+Topics without a matching rule use "utf-8", which is what every payload used
+to go through. Decoders read from a memoryview of the paho payload, so the
+binary codecs never copy it, and produce typed values (str, int/float, tuple
+for multi-field structs, dict/list for CBOR and MessagePack, a read-only
+memoryview for raw) that are handed to widgets as is.
+
+Custom codecs can be added with register_codec(name, factory), where
+factory(rule) returns a decode(view) callable.
+"""
+import codecs
+import struct
+
+DEFAULT_CODEC = 'utf-8'
+
+_utf8_decode = codecs.utf_8_decode
+
+
+def topic_matches(pattern, topic):
+    """MQTT subscription matching: '+' matches one level, a trailing '#' the rest"""
+    if pattern == topic or pattern == '#':
+        return True
+    pattern_levels = pattern.split('/')
+    topic_levels = topic.split('/')
+    for i, level in enumerate(pattern_levels):
+        if level == '#':
+            return i == len(pattern_levels) - 1
+        if i >= len(topic_levels):
+            return False
+        if level != '+' and level != topic_levels[i]:
+            return False
+    return len(pattern_levels) == len(topic_levels)
+
+
+def _text_codec(rule):
+    def decode(view):
+        return _utf8_decode(view, 'strict', True)[0]
+    return decode
+
+
+def _struct_codec(rule):
+    packer = struct.Struct(rule['format'])
+
+    def decode(view):
+        values = packer.unpack_from(view)
+        return values[0] if len(values) == 1 else values
+    return decode
+
+
+def _cbor_codec(rule):
+    import cbor2
+
+    def decode(view):
+        return cbor2.loads(view)
+    return decode
+
+
+def _msgpack_codec(rule):
+    import msgpack
+
+    def decode(view):
+        return msgpack.unpackb(view, raw=False)
+    return decode
+
+
+def _raw_codec(rule):
+    def decode(view):
+        return view.toreadonly()
+    return decode
+
+
+_CODECS = {
+    'utf-8': _text_codec,
+    'text': _text_codec,
+    'struct': _struct_codec,
+    'cbor': _cbor_codec,
+    'msgpack': _msgpack_codec,
+    'raw': _raw_codec,
+}
+
+
+def register_codec(name, factory):
+    _CODECS[name] = factory
+
+
+def available_codecs():
+    return sorted(_CODECS)
+
+
+class CodecRegistry:
+    """Maps topics to decoders. Lookups are cached per topic; set_rules() swaps everything at once."""
+
+    def __init__(self, rules=None):
+        self._default = _text_codec({})
+        self._rules = ()
+        self._by_topic = {}
+        self.set_rules(rules or [])
+
+    def set_rules(self, rules):
+        compiled = []
+        for rule in rules:
+            name = rule.get('codec', DEFAULT_CODEC)
+            factory = _CODECS.get(name)
+            if factory is None or not rule.get('pattern'):
+                print(f"[ERROR] Ignoring payload codec rule {rule}: unknown codec or missing pattern")
+                continue
+            try:
+                compiled.append((rule['pattern'], factory(rule)))
+            except Exception as e:
+                print(f"[ERROR] Ignoring payload codec rule {rule}: {e}")
+        # Assigned last, as whole objects, so the network thread never sees a half-built table
+        self._rules = tuple(compiled)
+        self._by_topic = {}
+
+    def decoder_for(self, topic):
+        decoder = self._by_topic.get(topic)
+        if decoder is None:
+            decoder = self._default
+            for pattern, candidate in self._rules:
+                if topic_matches(pattern, topic):
+                    decoder = candidate
+                    break
+            self._by_topic[topic] = decoder
+        return decoder
+
+    def decode(self, topic, payload):
+        """Decode a payload (bytes) for topic. Raises on payloads the codec can't read."""
+        return self.decoder_for(topic)(memoryview(payload))
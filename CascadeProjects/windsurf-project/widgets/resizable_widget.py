@@ -1,19 +1,44 @@
 from PyQt6.QtWidgets import QFrame, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QMenu, QDialog, QGraphicsDropShadowEffect, QWidget, QSizePolicy
-from PyQt6.QtCore import Qt, QPoint, QRect, QSize, pyqtSignal
+from PyQt6.QtCore import Qt, QPoint, QRect, QSize, QTimer, pyqtSignal
 from PyQt6.QtGui import QPainter, QColor, QPen, QAction, QPixmap, QIcon
 from pathlib import Path
+from diagnostics.tracing import tracer
+from diagnostics.metrics import timed_paint, profiled
+from .payload import payloads, format_number, as_text
+from .window_stats import WindowedStats, AGGREGATES
+from .alarms import get_alarm_engine, NORMAL, WARNING, CRITICAL
+from .widget_config import WidgetConfig
 
 class ResizableWidget(QFrame):
+    geometry_changed = pyqtSignal(QRect)  # Emitted after every move/resize
+    config_changed = pyqtSignal()  # Emitted when the user accepts new settings
+    config_class = WidgetConfig  # typed view of self.config read by the hot paths (widget_config.py)
+    canvas_drawn = False  # the presentation canvas draws it in place of the widget (display widgets only)
+    _traced = ()  # tracer events already recorded for this widget (see trace_once)
+
     def __init__(self, widget_type, topic, mqtt_client=None, parent=None, config=None):
         super().__init__(parent)
         self.config = config or {}
+        self.options = self.config_class.from_mapping(self.config)  # refreshed by apply_config
         self.widget_type = widget_type
         self.topic = topic
         self.mqtt_client = mqtt_client
+        self.broker = None  # name of the connection from the layout entry (None: default)
+        self._listening = False
+        self._listened_topics = []
+        self._canvas_background = None  # (rgba, radius) for canvas_state(), reset by apply_config
         self.presentation_mode = False
         
         self.error_state = False
         self.error_message = ""
+
+        # Sliding-window statistic shown instead of the raw value (config 'aggregate')
+        self.window_stats = None
+        self._aggregate_timer = None
+
+        # Warning thresholds are evaluated by the central alarm engine
+        self._alarm_key = f"widget-{id(self)}"
+        self._alarm_connected = False
         
         self.grid_size = 20
         self.resize_margin = 8
@@ -30,6 +55,13 @@ class ResizableWidget(QFrame):
         self.setMouseTracking(True)
         self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.customContextMenuRequested.connect(self.show_context_menu)
+
+        self.init_frame()
+
+        # NOTE: apply_config() is NOT called here - subclasses must call it after init_content()
+
+    def init_frame(self):
+        """Build the child widgets that draw the frame (lite tiles paint it themselves)."""
         self.setStyleSheet("QFrame { background: transparent; border: none; }")
 
         # Inner container handles all appearance (background, border)
@@ -50,8 +82,6 @@ class ResizableWidget(QFrame):
         # Setup UI inside the background container
         self.init_ui()
 
-        # NOTE: apply_config() is NOT called here - subclasses must call it after init_content()
-        
     def init_ui(self):
         """Initialize UI elements inside the background_container."""
         self.layout = QVBoxLayout(self.background_container) # Use self.layout for base ResizableWidget layout
@@ -159,7 +189,8 @@ class ResizableWidget(QFrame):
         elif self.dragging:
             new_pos = self.mapToParent(event.pos() - self.offset)
             snapped_pos = self.snap_to_grid(new_pos)
-            self.move(snapped_pos)
+            if self._can_occupy(QRect(snapped_pos, self.size())):
+                self.move(snapped_pos)
         else:
             if not self.presentation_mode:
                 resize_dir = self.get_resize_direction(event.position().toPoint())
@@ -186,7 +217,39 @@ class ResizableWidget(QFrame):
         # Snap size to grid and update geometry
         snapped_size = self.snap_size_to_grid(new_rect.size())
         snapped_pos = self.snap_to_grid(new_rect.topLeft())
-        self.setGeometry(QRect(snapped_pos, snapped_size))
+        snapped_rect = QRect(snapped_pos, snapped_size)
+        if self._can_occupy(snapped_rect):
+            self.setGeometry(snapped_rect)
+
+    def _find_dashboard(self):
+        """Walk up the parent chain to the owning Dashboard (if any)."""
+        parent = self.parent()
+        while parent:
+            if hasattr(parent, 'is_area_free'):
+                return parent
+            parent = parent.parent()
+        return None
+
+    def _can_occupy(self, rect):
+        """Check a snapped drag/resize target against the other widgets.
+
+        Widgets that already overlap something (e.g. stacked by an old layout) are
+        allowed to move freely so they can be pulled apart.
+        """
+        dashboard = self._find_dashboard()
+        if dashboard is None:
+            return True
+        if dashboard.is_area_free(rect, exclude=self):
+            return True
+        return not dashboard.is_area_free(self.geometry(), exclude=self)
+
+    def moveEvent(self, event):
+        super().moveEvent(event)
+        self.geometry_changed.emit(self.geometry())
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.geometry_changed.emit(self.geometry())
     
     def mouseReleaseEvent(self, event):
         if self.presentation_mode: return
@@ -196,14 +259,16 @@ class ResizableWidget(QFrame):
     def leaveEvent(self, event):
         if not self.resizing and not self.presentation_mode: self.setCursor(Qt.CursorShape.ArrowCursor)
     
+    @timed_paint
     def paintEvent(self, event):
         super().paintEvent(event)
+        self.trace_once("widget.first_paint", type=self.widget_type, topic=self.topic)
         if self.presentation_mode: return
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
         handle_size, rect = 6, self.rect()
-        border_color = self.config.get('border_color', '#666666')
+        border_color = self.options.border_color
         handle_color = QColor(border_color)
         handle_color.setAlpha(100)
         painter.setBrush(handle_color)
@@ -215,6 +280,13 @@ class ResizableWidget(QFrame):
         ]
         for x, y in positions: painter.drawRect(x, y, handle_size, handle_size)
     
+    def trace_once(self, name, **args):
+        """Record a tracer event the first time this widget gets to it (widget.first_paint, ...).
+        Kept on the widget, so it goes with it and a later widget starts afresh."""
+        if name not in self._traced and tracer.enabled:
+            self._traced += (name,)
+            tracer.instant(name, **args)
+
     def show_context_menu(self, position):
         if self.presentation_mode: return
 
@@ -222,6 +294,11 @@ class ResizableWidget(QFrame):
         customize_action = QAction("Customize Widget...", self)
         customize_action.triggered.connect(self.customize_widget)
         menu.addAction(customize_action)
+        severity, acknowledged = get_alarm_engine().state(self._alarm_key)
+        if severity != NORMAL and not acknowledged:
+            ack_action = QAction("Acknowledge Alarm", self)
+            ack_action.triggered.connect(lambda: get_alarm_engine().acknowledge(self._alarm_key))
+            menu.addAction(ack_action)
         menu.addSeparator()
         delete_action = QAction("Delete Widget", self)
         delete_action.triggered.connect(self.safe_delete)
@@ -235,6 +312,7 @@ class ResizableWidget(QFrame):
         if dialog.exec():
             self.config = dialog.get_config()
             self.apply_config()
+            self.config_changed.emit()
     
     def safe_delete(self):
         parent_dashboard = self.parent()
@@ -244,13 +322,30 @@ class ResizableWidget(QFrame):
                 break
             parent_dashboard = parent_dashboard.parent()
         
-        if self.mqtt_client and hasattr(self, 'on_message_received'):
-            try: self.mqtt_client.message_received.disconnect(self.on_message_received)
-            except (RuntimeError, TypeError): pass
-            except Exception as e: print(f"[WARNING] Error disconnecting MQTT signal: {e}")
+        if self.mqtt_client and self._listening:
+            self.mqtt_client.remove_listener(self.on_message_received)
             
         self.deleteLater()
 
+    def listen(self, topic):
+        """Subscribe to topic on this widget's connection and receive its messages in on_message_received.
+        Both end when the widget is destroyed."""
+        self.mqtt_client.subscribe(topic)
+        self.mqtt_client.add_listener(topic, self.on_message_received)
+        self._listened_topics.append(topic)
+        if not self._listening:
+            self._listening = True
+            client, callback, topics = self.mqtt_client, self.on_message_received, self._listened_topics
+            stop = self._stop_listening
+            self.destroyed.connect(lambda *args: stop(client, callback, topics))
+
+    @staticmethod
+    def _stop_listening(client, callback, topics):
+        # Runs after the widget is gone, so it must not touch self
+        client.remove_listener(callback)
+        for topic in topics:
+            client.unsubscribe(topic)
+
     def set_presentation_mode(self, enabled):
         self.presentation_mode = enabled
 
@@ -261,21 +356,8 @@ class ResizableWidget(QFrame):
             self.icon_label.hide()
 
             # Remove border but keep background for visibility
-            # Support both 'bg_color' (from widget customization) and 'background_color' (from themes)
-            bg_color = self.config.get('bg_color', self.config.get('background_color', '#1e1e1e'))
-            border_radius = self.config.get('border_radius', 6)
-
-            # Support both 'opacity' (0-100) and 'individual_opacity' (0.0-1.0)
-            opacity = self.config.get('opacity', 100)
-            individual_opacity = self.config.get('individual_opacity')
-            if individual_opacity is not None:
-                # individual_opacity is 0.0-1.0, convert to 0-100
-                opacity = int(individual_opacity * 100)
-
-            # Convert opacity (0-100) to alpha (0-255)
-            alpha = int(opacity * 2.55)
-            bg_with_alpha = QColor(bg_color)
-            bg_with_alpha.setAlpha(alpha)
+            border_radius = self.options.border_radius
+            bg_with_alpha = self.background_color()
 
             self.background_container.setStyleSheet(f"""
                 #widget_background {{
@@ -298,8 +380,11 @@ class ResizableWidget(QFrame):
         self.setMouseTracking(not enabled) # Disable mouse tracking for cursor changes
         self.setCursor(Qt.CursorShape.ArrowCursor) # Reset cursor
 
+    @profiled('apply_config')
     def apply_config(self):
         """Apply configuration styling to the widget."""
+        self.options = options = self.config_class.from_mapping(self.config)
+
         # Update title
         display_name = self.config.get('display_name', '')
         self.title_label.setText(display_name or self.topic)
@@ -308,23 +393,11 @@ class ResizableWidget(QFrame):
         self._update_header_icon()
 
         # Apply background styling
-        # Support both 'bg_color' (from widget customization) and 'background_color' (from themes)
-        bg_color = self.config.get('bg_color', self.config.get('background_color', '#1e1e1e'))
-        border_color = self.config.get('border_color', '#666666')
-        border_width = self.config.get('border_width', 2)
-        border_radius = self.config.get('border_radius', 6)
-
-        # Support both 'opacity' (0-100) and 'individual_opacity' (0.0-1.0)
-        opacity = self.config.get('opacity', 100)
-        individual_opacity = self.config.get('individual_opacity')
-        if individual_opacity is not None:
-            # individual_opacity is 0.0-1.0, convert to 0-100
-            opacity = int(individual_opacity * 100)
-
-        # Convert opacity (0-100) to alpha (0-255)
-        alpha = int(opacity * 2.55)
-        bg_with_alpha = QColor(bg_color)
-        bg_with_alpha.setAlpha(alpha)
+        border_color = options.border_color
+        border_width = options.border_width
+        border_radius = options.border_radius
+        bg_with_alpha = self.background_color()
+        self._canvas_background = None
 
         self.background_container.setStyleSheet(f"""
             #widget_background {{
@@ -334,6 +407,103 @@ class ResizableWidget(QFrame):
             }}
         """)
 
+        self._setup_aggregate()
+        self._setup_alarm()
+
+    def background_color(self):
+        """Background color with the widget's opacity as alpha"""
+        return QColor.fromRgba(self.options.background)
+
+    # --- canvas backend (widgets/canvas.py) ---------------------------------
+
+    def canvas_state(self):
+        """What the canvas draws for this widget: (background rgba, border radius, kind, title,
+        text, fraction, color, text color, font size). Equal tuples mean nothing to repaint."""
+        return self.canvas_background() + self.canvas_content()
+
+    def canvas_background(self):
+        """(background rgba, border radius), cached until apply_config"""
+        if self._canvas_background is None:
+            self._canvas_background = (self.options.background, self.options.border_radius)
+        return self._canvas_background
+
+    def canvas_content(self):
+        """(kind, title, text, fraction, color, text color, font size); kind is 'text' or a gauge
+        ('arc', 'circular', 'linear'). Widgets without their own drawing show get_value()."""
+        text_color = self.options.text_color
+        return ('text', '', as_text(self.get_value()), None, text_color, text_color, 12)
+
+    def _setup_alarm(self):
+        """Register this widget's warning thresholds with the alarm engine (or drop them)."""
+        engine = get_alarm_engine()
+        if not self.config.get('warning_enabled', False):
+            engine.unregister(self._alarm_key)
+            return
+        try:
+            engine.register_config(self._alarm_key, self.config.get('display_name') or self.topic, self.config)
+        except (ValueError, TypeError) as e:
+            print(f"[ERROR] Invalid warning thresholds for {self.topic}: {e}")
+            return
+        if not self._alarm_connected:
+            self._alarm_connected = True
+            engine.alarms_changed.connect(self._on_alarms_changed)
+            key = self._alarm_key
+            self.destroyed.connect(lambda *args: engine.unregister(key))
+
+    def _on_alarms_changed(self, keys):
+        if self._alarm_key in keys:
+            self.on_alarm_changed()
+
+    def on_alarm_changed(self):
+        """Called when this widget's alarm state or acknowledgement changes."""
+        self.update()
+
+    def report_alarm_value(self, value):
+        """Hand the displayed value to the alarm engine (ignored unless warnings are enabled)."""
+        engine = get_alarm_engine()
+        if engine.is_registered(self._alarm_key):
+            engine.set_value(self._alarm_key, value)
+
+    def _setup_aggregate(self):
+        """Create or drop the sliding window for config 'aggregate' / 'aggregate_window' (seconds)."""
+        if self.config.get('aggregate', '') not in AGGREGATES:
+            if self._aggregate_timer is not None:
+                self._aggregate_timer.stop()
+            self.window_stats = None
+            return
+        window = float(self.config.get('aggregate_window', 60))
+        # Switching between statistics keeps the samples; all of them are maintained together
+        if self.window_stats is None or self.window_stats.window != window:
+            self.window_stats = WindowedStats(window)
+        if self._aggregate_timer is None:
+            self._aggregate_timer = QTimer(self)
+            self._aggregate_timer.setInterval(1000)
+            self._aggregate_timer.timeout.connect(self._on_aggregate_tick)
+        self._aggregate_timer.start()
+
+    def aggregate_payload(self, topic, message):
+        """With an aggregate configured, add the payload to the window and return the statistic
+        (None until there is one); otherwise return the payload unchanged."""
+        if self.window_stats is None:
+            return message
+        self.window_stats.add(self.numeric_payload(topic, message))
+        return self.window_stats.value(self.config['aggregate'])
+
+    def _on_aggregate_tick(self):
+        # Old samples leave the window even when no new messages arrive
+        if self.window_stats is None or not len(self.window_stats):
+            return
+        before = len(self.window_stats)
+        self.window_stats.expire()
+        if len(self.window_stats) != before:
+            value = self.window_stats.value(self.config['aggregate'])
+            if value is not None:
+                self.show_aggregate(value)
+
+    def show_aggregate(self, value):
+        """Display a statistic that changed because samples expired (label and gauge override this)."""
+        pass
+
     def _update_header_icon(self):
         """Update the header icon based on config."""
         icon_data = self.config.get('icon_data', '')
@@ -367,28 +537,35 @@ class ResizableWidget(QFrame):
 
         self.icon_label.show()
 
+    def payload_for(self, topic, message):
+        """The part of a message this widget shows: its json_field, or the whole payload.
+        Returns None if the message doesn't contain the field; raises PayloadError on bad JSON."""
+        selector = self.options.json_field
+        if not selector:
+            return message
+        return payloads.extract(topic, message, selector)
+
+    def numeric_payload(self, topic, message):
+        """float() of a payload, shared with every other widget on the same topic and field"""
+        return payloads.number((topic, self.options.json_field), message)
+
+    @profiled('format_value')
     def format_value(self, value):
         if self.error_state: self.clear_error()
-        try:
-            factor, offset = float(self.config.get('conversion_factor', 1.0)), float(self.config.get('conversion_offset', 0.0))
-            converted_value = float(value) * factor + offset
-            decimal_places = int(self.config.get('decimal_places', 1))
-            formatted = f"{converted_value:.{decimal_places}f}"
-            unit = self.config.get('unit', '')
-            if unit: formatted += f" {unit}"
-            return formatted
-        except (ValueError, TypeError):
-            unit = self.config.get('unit', '')
-            if unit: return f"{value} {unit}"
+        if not isinstance(value, (str, int, float)):
+            value = as_text(value)  # binary/structured payloads from a codec
+        options = self.options
+        if not options.convert:
+            if options.unit: return f"{value} {options.unit}"
             return str(value)
+        return format_number(value, options.conversion_factor, options.conversion_offset, options.decimal_places, options.unit)
     
-    def get_warning_color(self, value):
-        if not self.config.get('warning_enabled', False): return None
-        try:
-            val, low, high = float(value), self.config.get('warning_low', 20.0), self.config.get('warning_high', 80.0)
-            if val <= low or val >= high: return self.config.get('critical_color', '#dc3545')
-            elif val <= low * 1.2 or val >= high * 0.8: return self.config.get('warning_color', '#ffc107')
-        except (ValueError, TypeError): pass
+    def get_warning_color(self, value=None):
+        """Color for the widget's current alarm state, or None. The state comes from the
+        alarm engine, which has already evaluated the value; `value` is kept for callers."""
+        severity, _ = get_alarm_engine().state(self._alarm_key)
+        if severity == CRITICAL: return self.options.critical_color
+        if severity == WARNING: return self.options.warning_color
         return None
     
     def show_error(self, message):
@@ -398,7 +575,7 @@ class ResizableWidget(QFrame):
             widget = self.content_layout.itemAt(i).widget()
             if widget: widget.hide()
         self.error_label.show()
-        border_width, border_radius, error_border_color = self.config.get('border_width', 2), self.config.get('border_radius', 6), "#dc3545"
+        border_width, border_radius, error_border_color = self.options.border_width, self.options.border_radius, "#dc3545"
         self.background_container.setStyleSheet(self.background_container.styleSheet() + f"border: {border_width}px solid {error_border_color};")
 
     def clear_error(self):
@@ -1,6 +1,7 @@
 from PyQt6.QtWidgets import QSlider, QLabel, QVBoxLayout, QWidget
 from PyQt6.QtCore import Qt
 from .resizable_widget import ResizableWidget
+from diagnostics.metrics import metrics, timed_dispatch, profiled
 
 class SliderWidget(ResizableWidget):
     def __init__(self, topic, mqtt_client=None, parent=None, config=None):
@@ -22,8 +23,7 @@ class SliderWidget(ResizableWidget):
     def connect_signals(self):
         if self.mqtt_client:
             print(f"[DEBUG] SliderWidget subscribing to topic: {self.topic}")
-            self.mqtt_client.subscribe(self.topic)
-            self.mqtt_client.message_received.connect(self.on_message_received)
+            self.listen(self.topic)
         self.slider.valueChanged.connect(self.on_slider_changed)
 
     def on_slider_changed(self, value):
@@ -31,18 +31,23 @@ class SliderWidget(ResizableWidget):
         if self.mqtt_client and self.mqtt_client.connected:
             self.mqtt_client.publish(self.topic, str(value))
 
+    @timed_dispatch
     def on_message_received(self, topic, message):
         if topic == self.topic:
             try:
                 print(f"[DEBUG] SliderWidget received: topic={topic}, message={message}")
+                message = self.payload_for(topic, message)
+                if message is None:
+                    return
                 self.slider.blockSignals(True)
-                value = int(float(message))
+                value = int(self.numeric_payload(topic, message))
                 min_val, max_val = self.slider.minimum(), self.slider.maximum()
                 clamped_value = max(min_val, min(max_val, value))
                 self.slider.setValue(clamped_value)
                 self.value_label.setText(str(clamped_value))
                 if self.error_state: self.clear_error()
             except (ValueError, TypeError):
+                metrics.record_parse_failure(topic)
                 self.show_error(f"Invalid payload: '{message}'")
             except RuntimeError:
                 pass # Widget might be deleted
@@ -50,6 +55,7 @@ class SliderWidget(ResizableWidget):
                 if self.slider and self.slider.signalsBlocked():
                     self.slider.blockSignals(False)
 
+    @profiled('apply_config')
     def apply_config(self):
         """Apply configuration to the widget."""
         super().apply_config()
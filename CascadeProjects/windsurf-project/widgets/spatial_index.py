@@ -0,0 +1,178 @@
+"""
+Grid-bucketed spatial index for dashboard widget rectangles.
+
+Rectangles are plain (x, y, width, height) tuples so the index can be used
+(and benchmarked) without a QApplication. Each rectangle is registered in
+every bucket it overlaps; queries only look at the buckets covering the
+query area, so the cost depends on local density rather than on the total
+number of widgets on the dashboard.
+"""
+
+
+def rects_intersect(a, b):
+    """Return True if two (x, y, w, h) rectangles overlap (touching edges don't count)."""
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    return ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah
+
+
+class SpatialIndex:
+    """Uniform grid of buckets mapping cells to the keys whose rectangles overlap them."""
+
+    def __init__(self, cell_size=200):
+        self.cell_size = max(1, int(cell_size))
+        self.buckets = {}  # (col, row) -> set of keys
+        self.rects = {}    # key -> (x, y, w, h)
+        # Row bands: row -> number of bucket entries, used to skip empty rows during slot search
+        self.row_counts = {}
+        # (width, height, origin x/y, step, limit) -> y above which no free slot of that size exists.
+        # Only lowered when space is freed, so repeated placement resumes where it left off.
+        self.slot_hints = {}
+
+    def __len__(self):
+        return len(self.rects)
+
+    def __contains__(self, key):
+        return key in self.rects
+
+    def _cells(self, rect):
+        x, y, w, h = rect
+        cs = self.cell_size
+        col0, row0 = int(x // cs), int(y // cs)
+        # Subtract one so a rect ending exactly on a cell border stays out of the next cell
+        col1, row1 = int((x + max(w, 1) - 1) // cs), int((y + max(h, 1) - 1) // cs)
+        for row in range(row0, row1 + 1):
+            for col in range(col0, col1 + 1):
+                yield col, row
+
+    def insert(self, key, rect):
+        """Add or replace the rectangle stored for key."""
+        if key in self.rects:
+            self.remove(key)
+        rect = (int(rect[0]), int(rect[1]), int(rect[2]), int(rect[3]))
+        self.rects[key] = rect
+        for cell in self._cells(rect):
+            self.buckets.setdefault(cell, set()).add(key)
+            self.row_counts[cell[1]] = self.row_counts.get(cell[1], 0) + 1
+
+    def update(self, key, rect):
+        """Move/resize an existing entry. Returns False (and does nothing) if the rectangle didn't change."""
+        if self.rects.get(key) == tuple(rect):
+            return False
+        self.insert(key, rect)
+        return True
+
+    def remove(self, key):
+        """Remove key from the index (ignored if unknown)."""
+        rect = self.rects.pop(key, None)
+        if rect is None:
+            return
+        if self.slot_hints:
+            # Freed space may open slots that start up to one slot height above the rect
+            for hint_key, hint_y in self.slot_hints.items():
+                self.slot_hints[hint_key] = min(hint_y, rect[1] - hint_key[1])
+        for cell in self._cells(rect):
+            bucket = self.buckets.get(cell)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self.buckets[cell]
+            count = self.row_counts.get(cell[1], 0) - 1
+            if count > 0:
+                self.row_counts[cell[1]] = count
+            else:
+                self.row_counts.pop(cell[1], None)
+
+    def clear(self):
+        self.buckets.clear()
+        self.rects.clear()
+        self.row_counts.clear()
+        self.slot_hints.clear()
+
+    def query(self, rect, exclude=None):
+        """Return the set of keys whose rectangles overlap rect."""
+        found = set()
+        seen = set()
+        for cell in self._cells(rect):
+            bucket = self.buckets.get(cell)
+            if not bucket:
+                continue
+            for key in bucket:
+                if key in seen or key is exclude:
+                    continue
+                seen.add(key)
+                if rects_intersect(self.rects[key], rect):
+                    found.add(key)
+        return found
+
+    def intersects(self, rect, exclude=None):
+        """Return True as soon as any stored rectangle (other than exclude) overlaps rect."""
+        for cell in self._cells(rect):
+            bucket = self.buckets.get(cell)
+            if not bucket:
+                continue
+            for key in bucket:
+                if key is not exclude and rects_intersect(self.rects[key], rect):
+                    return True
+        return False
+
+    def hit_test(self, x, y):
+        """Return the keys whose rectangles contain the point (x, y)."""
+        cs = self.cell_size
+        bucket = self.buckets.get((int(x // cs), int(y // cs)), ())
+        hits = []
+        for key in bucket:
+            rx, ry, rw, rh = self.rects[key]
+            if rx <= x < rx + rw and ry <= y < ry + rh:
+                hits.append(key)
+        return hits
+
+    def _first_blocker(self, rect):
+        """Return the stored rectangle overlapping rect with the smallest right edge, or None."""
+        best = None
+        for cell in self._cells(rect):
+            bucket = self.buckets.get(cell)
+            if not bucket:
+                continue
+            for key in bucket:
+                other = self.rects[key]
+                if rects_intersect(other, rect) and (best is None or other[0] + other[2] < best[0] + best[2]):
+                    best = other
+        return best
+
+    def find_free_slot(self, width, height, max_width, origin=(20, 20), step=40, max_rows=10000):
+        """
+        Find the first free top-left position for a width x height rectangle, scanning
+        rows of height `step` left to right starting at origin.
+
+        Instead of probing every step position, a collision jumps the probe straight past
+        the blocking rectangle's right edge, rows whose buckets are empty are accepted
+        immediately, and rows already known to be full for this slot size are skipped.
+        """
+        ox, oy = origin
+        step = max(1, int(step))
+        limit = max(ox + width, int(max_width))
+        hint_key = (width, height, ox, oy, step, limit)
+        y = oy
+        # Rows that are full for a smaller slot are also full for this one
+        for (hw, hh, hox, hoy, hstep, hlimit), hint_y in self.slot_hints.items():
+            if hw <= width and hh <= height and (hox, hoy, hstep, hlimit) == (ox, oy, step, limit):
+                y = max(y, hint_y)
+        # Snap the resume point back onto the row grid
+        y = oy + ((y - oy) // step) * step
+        for _ in range(max_rows):
+            row0, row1 = int(y // self.cell_size), int((y + max(height, 1) - 1) // self.cell_size)
+            if not any(row in self.row_counts for row in range(row0, row1 + 1)):
+                self.slot_hints[hint_key] = y
+                return ox, y
+            x = ox
+            while x + width <= limit or x == ox:
+                blocker = self._first_blocker((x, y, width, height))
+                if blocker is None:
+                    self.slot_hints[hint_key] = y
+                    return x, y
+                # Jump to the next step-aligned position past the blocker
+                right = blocker[0] + blocker[2]
+                x = ox + -(-(right - ox) // step) * step
+            y += step
+        return ox, y
@@ -2,6 +2,8 @@ from PyQt6.QtWidgets import QLabel, QWidget, QHBoxLayout, QAbstractButton
 from PyQt6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QRectF, pyqtProperty
 from PyQt6.QtGui import QPainter, QColor, QBrush
 from .resizable_widget import ResizableWidget
+from .payload import as_text
+from diagnostics.metrics import metrics, timed_dispatch, timed_paint, profiled
 
 class AnimatedToggle(QAbstractButton):
     def __init__(self, parent=None):
@@ -34,6 +36,7 @@ class AnimatedToggle(QAbstractButton):
         self.animation.setEndValue(1.0 if checked else 0.0)
         self.animation.start()
 
+    @timed_paint
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
@@ -69,8 +72,7 @@ class ToggleWidget(ResizableWidget):
         if self.mqtt_client:
             input_topic = self.config.get('toggle_input_topic', '').strip()
             if input_topic:
-                self.mqtt_client.subscribe(input_topic)
-                self.mqtt_client.message_received.connect(self.on_message_received)
+                self.listen(input_topic)
 
     def on_toggled(self, checked):
         try:
@@ -83,20 +85,28 @@ class ToggleWidget(ResizableWidget):
         except Exception as e:
             self.show_error(f"Publish failed: {e}")
 
+    @timed_dispatch
     def on_message_received(self, topic, message):
         input_topic = self.config.get('toggle_input_topic', '').strip()
         if topic == input_topic:
             try:
-                is_on = str(message).strip() == self.config.get('toggle_on_payload', '1')
+                message = self.payload_for(topic, message)
+                if message is None:
+                    return
+                is_on = as_text(message).strip() == self.config.get('toggle_on_payload', '1')
                 self.toggle_switch.blockSignals(True)
                 self.toggle_switch.setChecked(is_on)
                 if self.error_state: self.clear_error()
+            except ValueError as e:
+                metrics.record_parse_failure(topic)
+                self.show_error(str(e))
             except RuntimeError:
                 pass # Widget might be deleted
             finally:
                 if self.toggle_switch and self.toggle_switch.signalsBlocked():
                     self.toggle_switch.blockSignals(False)
 
+    @profiled('apply_config')
     def apply_config(self):
         super().apply_config()
         self.toggle_label.setText(self.config.get('display_name', self.topic))
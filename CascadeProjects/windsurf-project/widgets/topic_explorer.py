@@ -0,0 +1,324 @@
+"""
+Topic explorer: a tree of every topic seen under '#', with live counters.
+
+Each topic level is a TopicNode (with __slots__, and its name interned, so
+the segments that 50 000 topics share, like "site" or "meters", are stored
+once; only nodes with many children get a lookup dict). A message walks its path from the root, creating missing nodes and
+adding one to the message count and last-seen time of every node on the
+way, so each node always holds the totals of its subtree.
+
+The Qt model is lazy: a node's children only become model rows when the
+view expands it (fetchMore), FETCH_BATCH at a time. Until then a node with
+children gets a single row, so the view draws an expand arrow. Changes are
+collected per message and sent to the view every FLUSH_INTERVAL ms, as row
+insertions under expanded nodes and contiguous dataChanged ranges for the
+counters of nodes the view knows about. Nodes beyond MAX_NODES are not
+created; their messages are counted on the deepest existing ancestor.
+
+Dragging a node onto the dashboard adds a widget for it: a label for a
+topic, a topic table for a subtree (as "<path>/#").
+"""
+import json
+import sys
+import time
+
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QTreeView, QAbstractItemView, QHeaderView
+from PyQt6.QtCore import Qt, QAbstractItemModel, QModelIndex, QMimeData, QTimer
+from .topic_table_widget import dirty_ranges
+
+# Dashboard.dropEvent accepts this: {"topic": ..., "broker": ...}
+TOPIC_MIME_TYPE = "application/x-mqtt-topic"
+
+FLUSH_INTERVAL = 250   # ms between model updates
+FETCH_BATCH = 1000     # children made visible per fetchMore
+MAX_NODES = 200000
+# Nodes with up to this many children find them by scanning child_list (no dict)
+SMALL_NODE = 8
+
+NAME, MESSAGES, LAST_SEEN = range(3)
+COLUMNS = ("Topic", "Messages", "Last seen")
+
+
+class TopicNode:
+    __slots__ = ('name', 'parent', 'row', 'children', 'child_list', 'count', 'last_seen',
+                 'is_topic', 'shown', 'fetched', 'announced')
+
+    def __init__(self, name, parent, row):
+        self.name = name
+        self.parent = parent
+        self.row = row             # index in parent.child_list
+        self.children = None       # name -> node, once there are more than SMALL_NODE children
+        self.child_list = None     # children in arrival order (= model row order)
+        self.count = 0             # messages on this topic and everything below it
+        self.last_seen = 0.0
+        self.is_topic = False      # messages arrive on this exact topic
+        self.shown = 0             # children that are model rows
+        self.fetched = False       # the view asked for the children (expanded)
+        self.announced = False     # this node is a model row
+
+    def topic(self):
+        names = []
+        node = self
+        while node.parent is not None:
+            names.append(node.name)
+            node = node.parent
+        return "/".join(reversed(names))
+
+
+class TopicTreeModel(QAbstractItemModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.broker = None  # connection name, for drops on the dashboard
+        self._reset_tree()
+
+    def _reset_tree(self):
+        self.root = TopicNode("", None, 0)
+        self.root.fetched = self.root.announced = True
+        self.node_count = 0
+        self.topic_count = 0
+        self._grown = set()   # nodes that got new children since the last flush
+        self._dirty = set()   # model rows whose counters changed
+
+    def clear(self):
+        self.beginResetModel()
+        self._reset_tree()
+        self.endResetModel()
+
+    # --- incoming messages ----------------------------------------------
+
+    def add(self, topic, message=None):
+        """Count one message on topic (a message listener)"""
+        now = time.time()
+        node = self.root
+        node.count += 1
+        node.last_seen = now
+        dirty, grown = self._dirty, self._grown
+        for name in topic.split('/'):
+            child = None
+            if node.children is not None:
+                child = node.children.get(name)
+            elif node.child_list is not None:
+                for candidate in node.child_list:
+                    if candidate.name == name:
+                        child = candidate
+                        break
+            if child is None:
+                if self.node_count >= MAX_NODES:
+                    return
+                if node.child_list is None:
+                    node.child_list = []
+                name = sys.intern(name)
+                child = TopicNode(name, node, len(node.child_list))
+                node.child_list.append(child)
+                if node.children is not None:
+                    node.children[name] = child
+                elif len(node.child_list) > SMALL_NODE:
+                    node.children = {c.name: c for c in node.child_list}
+                self.node_count += 1
+                if node.announced:
+                    grown.add(node)
+            node = child
+            node.count += 1
+            node.last_seen = now
+            if node.announced:
+                dirty.add(node)
+        if not node.is_topic:
+            node.is_topic = True
+            self.topic_count += 1
+
+    def flush(self):
+        """Send new rows and changed counters to the view"""
+        if self._grown:
+            grown, self._grown = self._grown, set()
+            for node in grown:
+                if not node.announced:
+                    continue
+                total = len(node.child_list)
+                # Unexpanded nodes only get their first row (for the expand arrow)
+                target = min(total, node.shown + FETCH_BATCH) if node.fetched else min(total, 1)
+                self._show_children(node, target)
+        if self._dirty:
+            dirty, self._dirty = self._dirty, set()
+            by_parent = {}
+            for node in dirty:
+                if node.announced:
+                    by_parent.setdefault(node.parent, []).append(node.row)
+            for parent, rows in by_parent.items():
+                for first, last in dirty_ranges(rows):
+                    self.dataChanged.emit(self.createIndex(first, MESSAGES, parent.child_list[first]),
+                                          self.createIndex(last, LAST_SEEN, parent.child_list[last]))
+
+    def _show_children(self, node, target):
+        if target <= node.shown:
+            return
+        self.beginInsertRows(self._index_of(node), node.shown, target - 1)
+        for child in node.child_list[node.shown:target]:
+            child.announced = True
+        node.shown = target
+        self.endInsertRows()
+
+    def _index_of(self, node):
+        if node.parent is None:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    def _node(self, index):
+        return index.internalPointer() if index.isValid() else self.root
+
+    # --- QAbstractItemModel ---------------------------------------------
+
+    def index(self, row, column, parent=QModelIndex()):
+        node = self._node(parent)
+        if row < 0 or row >= node.shown or column < 0 or column >= len(COLUMNS):
+            return QModelIndex()
+        return self.createIndex(row, column, node.child_list[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        return self._index_of(index.internalPointer().parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return self._node(parent).shown
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(COLUMNS)
+
+    def hasChildren(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return False
+        return bool(self._node(parent).child_list)
+
+    def canFetchMore(self, parent):
+        node = self._node(parent)
+        return node.announced and node.child_list is not None and node.shown < len(node.child_list)
+
+    def fetchMore(self, parent):
+        node = self._node(parent)
+        node.fetched = True
+        if node.child_list:
+            self._show_children(node, min(len(node.child_list), node.shown + FETCH_BATCH))
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == NAME:
+                return node.name
+            if column == MESSAGES:
+                return str(node.count)
+            return time.strftime("%H:%M:%S", time.localtime(node.last_seen)) if node.last_seen else "-"
+        if role == Qt.ItemDataRole.ToolTipRole and column == NAME:
+            return node.topic()
+        if role == Qt.ItemDataRole.TextAlignmentRole and column != NAME:
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsDragEnabled
+
+    def mimeTypes(self):
+        return [TOPIC_MIME_TYPE, "text/plain"]
+
+    def mimeData(self, indexes):
+        nodes = [index.internalPointer() for index in indexes if index.isValid() and index.column() == NAME]
+        if not nodes:
+            return None
+        node = nodes[0]
+        # A branch stands for everything below it
+        topic = node.topic() + "/#" if node.child_list else node.topic()
+        mime = QMimeData()
+        mime.setData(TOPIC_MIME_TYPE, json.dumps({'topic': topic, 'broker': self.broker}).encode('utf-8'))
+        mime.setText(topic)
+        return mime
+
+
+class TopicExplorer(QWidget):
+    """Side panel with the topic tree. Subscribes to '#' the first time it is shown."""
+
+    def __init__(self, connections, parent=None):
+        super().__init__(parent)
+        self.connections = connections
+        self.client = None
+        self.model = TopicTreeModel(self)
+        self.init_ui()
+
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setInterval(FLUSH_INTERVAL)
+        self.flush_timer.timeout.connect(self.refresh)
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+
+        header = QHBoxLayout()
+        self.summary_label = QLabel("Topics")
+        self.summary_label.setStyleSheet("font-weight: bold;")
+        header.addWidget(self.summary_label, 1)
+        # Only worth showing when more than one broker is configured
+        self.broker_combo = QComboBox()
+        self.broker_combo.addItems(list(self.connections.connections))
+        self.broker_combo.setVisible(self.broker_combo.count() > 1)
+        self.broker_combo.currentTextChanged.connect(self.set_broker)
+        header.addWidget(self.broker_combo)
+        layout.addLayout(header)
+
+        self.tree = QTreeView()
+        self.tree.setModel(self.model)
+        self.tree.setUniformRowHeights(True)  # no per-row size queries for big trees
+        self.tree.setDragEnabled(True)
+        self.tree.setDragDropMode(QAbstractItemView.DragDropMode.DragOnly)
+        self.tree.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.tree.header().setSectionResizeMode(NAME, QHeaderView.ResizeMode.Stretch)
+        self.tree.header().setStretchLastSection(False)
+        layout.addWidget(self.tree)
+
+        hint = QLabel("Dra et emne til dashbordet for å lage en widget")
+        hint.setStyleSheet("color: #888;")
+        hint.setWordWrap(True)
+        layout.addWidget(hint)
+
+    def set_broker(self, name):
+        """Explore the topics of another connection"""
+        if self.client is not None:
+            self.client.remove_listener(self.model.add, '#')
+            self.client.unsubscribe('#')
+            self.client = None
+        self.model.clear()
+        if self.isVisible():
+            self._listen(name)
+
+    def _listen(self, name=None):
+        name = name or self.broker_combo.currentText()
+        self.client = self.connections.get(name)
+        self.model.broker = name if name != self.connections.default.name else None
+        print(f"[DEBUG] TopicExplorer subscribing to '#' on {name}")
+        self.client.subscribe('#')
+        self.client.add_listener('#', self.model.add)
+
+    def refresh(self):
+        self.model.flush()
+        self.summary_label.setText(f"Topics ({self.model.topic_count})")
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.client is None:
+            self._listen()
+        self.refresh()
+        self.flush_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        # Counting goes on; the view catches up when shown again
+        self.flush_timer.stop()
@@ -0,0 +1,284 @@
+"""
+Table of every topic under a wildcard subscription (e.g. site/+/meters/#).
+
+Rows live in a columnar TopicStore: a topic list and a topic -> row dict,
+the newest payload per row, and NumPy arrays for the receive time, the
+message count since the last rate tick and the rate. A message only writes
+its row and marks it dirty; a 100 ms timer turns new rows into one
+beginInsertRows() and dirty rows into a few contiguous dataChanged ranges.
+The view asks for the text of visible cells only, so a table of 5 000+
+topics updating thousands of times per second costs about as much to
+paint as the rows on screen.
+"""
+import time
+
+import numpy as np
+from PyQt6.QtWidgets import QTableView, QLineEdit, QHeaderView, QAbstractItemView
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, QTimer
+from .resizable_widget import ResizableWidget
+from .payload import PayloadError
+from diagnostics.metrics import timed_dispatch
+
+# Milliseconds between model updates, and between rate updates
+FLUSH_INTERVAL = 100
+RATE_INTERVAL = 1000
+
+# More separate dirty ranges than this are sent as one range (the view clips it anyway)
+MAX_RANGES = 32
+
+# Topics beyond this are not added (a '#' subscription on a busy broker never ends)
+MAX_TOPICS = 50000
+
+TOPIC, VALUE, TIME, RATE = range(4)
+COLUMNS = ("Topic", "Value", "Time", "Rate/s")
+
+
+def dirty_ranges(rows):
+    """Sorted (first, last) runs of consecutive rows"""
+    ranges = []
+    for row in sorted(rows):
+        if ranges and row == ranges[-1][1] + 1:
+            ranges[-1][1] = row
+        else:
+            ranges.append([row, row])
+    return ranges
+
+
+class TopicStore:
+    """The columnar row store (no Qt; used directly by the benchmark)."""
+
+    def __init__(self, capacity=256):
+        self.topics = []   # row -> topic
+        self.rows = {}     # topic -> row
+        self.values = []   # row -> newest payload
+        self._capacity = 0
+        self._grow(capacity)
+        self._rate_time = time.monotonic()
+
+    def _grow(self, capacity):
+        old = self._capacity
+        for name, dtype in (('received', np.float64), ('counts', np.uint32), ('rates', np.float32)):
+            array = np.zeros(capacity, dtype=dtype)
+            if old:
+                array[:old] = getattr(self, name)
+            setattr(self, name, array)
+        self._capacity = capacity
+
+    def __len__(self):
+        return len(self.topics)
+
+    def update(self, topic, value, now):
+        """Store a message; returns its row, or None if the table is full"""
+        row = self.rows.get(topic)
+        if row is None:
+            row = len(self.topics)
+            if row >= MAX_TOPICS:
+                return None
+            if row == self._capacity:
+                self._grow(self._capacity * 2)
+            self.rows[topic] = row
+            self.topics.append(topic)
+            self.values.append(value)
+        else:
+            self.values[row] = value
+        self.received[row] = now
+        self.counts[row] += 1
+        return row
+
+    def update_rates(self):
+        """Messages per second since the last call, smoothed, for every row at once"""
+        now = time.monotonic()
+        elapsed = now - self._rate_time
+        self._rate_time = now
+        n = len(self.topics)
+        if not n or elapsed <= 0:
+            return
+        rates = self.rates[:n]
+        rates *= 0.5
+        rates += 0.5 * self.counts[:n] / elapsed
+        self.counts[:n] = 0
+
+    def clear(self):
+        self.topics.clear()
+        self.rows.clear()
+        self.values.clear()
+        self.received[:] = 0
+        self.counts[:] = 0
+        self.rates[:] = 0
+
+
+class TopicTableModel(QAbstractTableModel):
+    """Qt view of a TopicStore. The model only sees store rows once flush() has announced them."""
+
+    def __init__(self, formatter=str, parent=None):
+        super().__init__(parent)
+        self.store = TopicStore()
+        self.formatter = formatter  # payload -> cell text, only called for visible cells
+        self._row_count = 0
+        self._dirty = set()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        row, column = index.row(), index.column()
+        store = self.store
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == TOPIC:
+                return store.topics[row]
+            if column == VALUE:
+                return self.formatter(store.values[row])
+            if column == TIME:
+                received = store.received[row]
+                return time.strftime("%H:%M:%S", time.localtime(received)) + f".{int(received * 1000) % 1000:03d}"
+            return f"{store.rates[row]:.1f}"
+        if role == Qt.ItemDataRole.EditRole:
+            # Sort key for QSortFilterProxyModel
+            if column == TIME:
+                return float(store.received[row])
+            if column == RATE:
+                return float(store.rates[row])
+            return self.data(index)
+        if role == Qt.ItemDataRole.ToolTipRole and column == TOPIC:
+            return store.topics[row]
+        if role == Qt.ItemDataRole.TextAlignmentRole and column in (TIME, RATE):
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def update(self, topic, value):
+        row = self.store.update(topic, value, time.time())
+        if row is not None and row < self._row_count:
+            self._dirty.add(row)
+
+    def flush(self):
+        """Announce new rows and changed cells to the view"""
+        count = len(self.store)
+        if count > self._row_count:
+            self.beginInsertRows(QModelIndex(), self._row_count, count - 1)
+            self._row_count = count
+            self.endInsertRows()
+        if not self._dirty:
+            return
+        ranges = dirty_ranges(self._dirty)
+        self._dirty.clear()
+        if len(ranges) > MAX_RANGES:
+            ranges = [(ranges[0][0], ranges[-1][1])]
+        for first, last in ranges:
+            self.dataChanged.emit(self.index(first, VALUE), self.index(last, TIME))
+
+    def update_rates(self):
+        self.store.update_rates()
+        if self._row_count:
+            self.dataChanged.emit(self.index(0, RATE), self.index(self._row_count - 1, RATE))
+
+    def clear(self):
+        self.beginResetModel()
+        self.store.clear()
+        self._row_count = 0
+        self._dirty.clear()
+        self.endResetModel()
+
+
+class TopicTableWidget(ResizableWidget):
+    def __init__(self, topic, mqtt_client=None, parent=None, config=None):
+        super().__init__("topic_table", topic, mqtt_client, parent, config)
+        self.init_content()
+        self.connect_signals()
+        self.apply_config()
+
+    def init_content(self):
+        """Initialize the filter field and the table."""
+        # The drop shadow re-renders and blurs the whole widget on every cell update
+        self.background_container.setGraphicsEffect(None)
+
+        self.model = TopicTableModel(self.format_value, self)
+        self.proxy = QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setFilterKeyColumn(TOPIC)
+        self.proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.proxy.setSortRole(Qt.ItemDataRole.EditRole)
+        # Sort on header clicks only; re-sorting on every update would defeat the batching
+        self.proxy.setDynamicSortFilter(False)
+
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter topics...")
+        self.filter_edit.textChanged.connect(self.proxy.setFilterFixedString)
+
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(-1, Qt.SortOrder.AscendingOrder)  # arrival order until a header is clicked
+        self.table.setWordWrap(False)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().hide()
+        # Fixed row heights: the view never measures rows it doesn't show
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(20)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(TOPIC, QHeaderView.ResizeMode.Stretch)
+        for column in (VALUE, TIME, RATE):
+            header.setSectionResizeMode(column, QHeaderView.ResizeMode.Interactive)
+
+        self.content_layout.addWidget(self.filter_edit)
+        self.content_layout.addWidget(self.table, 1)
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.timeout.connect(self.model.flush)
+        self._flush_timer.start(FLUSH_INTERVAL)
+        self._rate_timer = QTimer(self)
+        self._rate_timer.timeout.connect(self.model.update_rates)
+        self._rate_timer.start(RATE_INTERVAL)
+
+    def connect_signals(self):
+        """Subscribe to the wildcard topic."""
+        if self.mqtt_client:
+            print(f"[DEBUG] TopicTableWidget subscribing to topic: {self.topic}")
+            self.listen(self.topic)
+
+    @timed_dispatch
+    def on_message_received(self, topic, message):
+        """Store the message; the table picks it up on the next flush"""
+        message = self.payload_for(topic, message)
+        if message is not None:
+            self.model.update(topic, message)
+
+    def payload_for(self, topic, message):
+        try:
+            return super().payload_for(topic, message)
+        except PayloadError:
+            return None  # rows without the json_field (or not JSON) keep their last value
+
+    def apply_config(self):
+        """Apply configuration to the widget."""
+        super().apply_config()
+        text_color = self.config.get('text_color', '#D9D9D9')
+        font_size = int(self.config.get('font_size', 12))
+        self.table.setStyleSheet(f"""
+            QTableView {{
+                background: transparent;
+                color: {text_color};
+                font-size: {font_size}px;
+                gridline-color: #333333;
+                border: none;
+            }}
+            QHeaderView::section {{
+                background-color: #2b2b2b;
+                color: {text_color};
+                border: none;
+                padding: 2px 4px;
+            }}
+        """)
+        self.table.viewport().update()
+
+    def get_value(self):
+        """Return the number of topics in the table"""
+        return str(len(self.model.store))
@@ -0,0 +1,95 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
+                             QTreeWidget, QTreeWidgetItem, QFileDialog, QMessageBox, QHeaderView)
+from PyQt6.QtCore import Qt
+from diagnostics.tracing import tracer
+
+# Milestones shown in the summary line, in critical-path order
+MILESTONES = [
+    ('MainWindow.__init__', 'Window built'),
+    ('startup.ready', 'Layout loaded'),
+    ('mqtt.on_connect', 'Connected'),
+    ('mqtt.first_message', 'First message'),
+    ('widget.first_value', 'First value shown'),
+]
+
+
+class TracePanel(QWidget):
+    """Debug page listing recorded trace spans, with Chrome trace export."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+
+        self.summary_label = QLabel()
+        self.summary_label.setWordWrap(True)
+        self.summary_label.setStyleSheet("color: #E0E0E0; font-weight: bold;")
+        layout.addWidget(self.summary_label)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["Event", "Start (ms)", "Duration (ms)", "Thread", "Details"])
+        self.tree.setRootIsDecorated(False)
+        self.tree.setSortingEnabled(True)
+        self.tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
+        layout.addWidget(self.tree, 1)
+
+        button_layout = QHBoxLayout()
+        refresh_btn = QPushButton("Refresh")
+        refresh_btn.clicked.connect(self.refresh)
+        export_btn = QPushButton("Export Chrome Trace...")
+        export_btn.clicked.connect(self.export_trace)
+        clear_btn = QPushButton("Clear")
+        clear_btn.clicked.connect(self.clear_trace)
+        button_layout.addWidget(refresh_btn)
+        button_layout.addWidget(export_btn)
+        button_layout.addWidget(clear_btn)
+        button_layout.addStretch()
+        layout.addLayout(button_layout)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+
+    def refresh(self):
+        rows = tracer.snapshot()
+        self.tree.setSortingEnabled(False)
+        self.tree.clear()
+        for row in rows:
+            item = QTreeWidgetItem()
+            item.setText(0, row['name'])
+            item.setData(1, Qt.ItemDataRole.DisplayRole, round(row['start_ms'], 2))
+            if row['phase'] == 'X':
+                item.setData(2, Qt.ItemDataRole.DisplayRole, round(row['duration_ms'], 2))
+            item.setText(3, str(row['thread']))
+            item.setText(4, ", ".join(f"{k}={v}" for k, v in row['args'].items()))
+            self.tree.addTopLevelItem(item)
+        self.tree.setSortingEnabled(True)
+        self.tree.sortItems(1, Qt.SortOrder.AscendingOrder)
+        self.summary_label.setText(self._summary(rows))
+
+    def _summary(self, rows):
+        first = {}
+        for row in rows:
+            end = row['start_ms'] + row['duration_ms']
+            if row['name'] not in first or end < first[row['name']]:
+                first[row['name']] = end
+        parts = [f"{label}: {first[name]:.0f} ms" for name, label in MILESTONES if name in first]
+        if not parts:
+            return "No trace events recorded yet."
+        return "  →  ".join(parts)
+
+    def export_trace(self):
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export Chrome Trace", "mqtt_dashboard_trace.json",
+                                                   "JSON Files (*.json)")
+        if not file_path:
+            return
+        try:
+            tracer.export_chrome_trace(file_path)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to export trace: {e}")
+
+    def clear_trace(self):
+        tracer.clear()
+        self.refresh()
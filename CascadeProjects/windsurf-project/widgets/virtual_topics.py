@@ -0,0 +1,330 @@
+"""
+Virtual topics: values computed from other topics by an expression.
+
+Defined by the 'virtual_topics' setting, a mapping of topic -> expression:
+
+    "virtual_topics": {
+        "virtual/net_power": "total_effekt - solar_effekt",
+        "virtual/room_avg": "avg(room/+/temp)",
+        "virtual/net_kw": "round(virtual/net_power / 1000, 2)"
+    }
+
+Expressions use arithmetic, comparisons, `x if cond else y` and the functions
+in FUNCTIONS. Topic names are written as is (`+` and `#` wildcards allowed
+as whole levels), or between backticks if they contain other characters
+(`` `sensor-1/temp` ``). A wildcard reference is the list of current values
+of all matching topics, for use with the aggregate functions. Virtual topics
+may reference each other.
+
+Each definition is compiled once; together they form a dependency graph. A
+worker thread receives incoming values, and only re-evaluates the virtual
+topics that depend on a changed value, in dependency order, propagating
+further only when a result actually changes. Results are published through
+a callback, which MQTTClient turns into an ordinary message_received signal,
+so widgets bind to a virtual topic exactly like to a broker topic.
+"""
+import ast
+import heapq
+import keyword
+import math
+import queue
+import re
+import threading
+
+from .payload_codecs import topic_matches
+
+
+def _flatten(args):
+    values = []
+    for arg in args:
+        if isinstance(arg, (list, tuple)):
+            values.extend(v for v in arg if v is not None)
+        elif arg is not None:
+            values.append(arg)
+    return values
+
+
+def _avg(*args):
+    values = _flatten(args)
+    return sum(values) / len(values) if values else None
+
+
+def _aggregate(function):
+    def wrapper(*args):
+        values = _flatten(args)
+        return function(values) if values else None
+    return wrapper
+
+
+FUNCTIONS = {
+    'avg': _avg,
+    'mean': _avg,
+    'sum': lambda *args: sum(_flatten(args)),
+    'min': _aggregate(min),
+    'max': _aggregate(max),
+    'count': lambda *args: len(_flatten(args)),
+    'abs': abs,
+    'round': round,
+    'sqrt': math.sqrt,
+}
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.IfExp, ast.Call,
+    ast.Name, ast.Load, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow, ast.USub, ast.UAdd,
+    ast.Not, ast.And, ast.Or, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+)
+
+# `quoted topic`, or a bare topic: levels separated by "/", where + and # are whole levels
+_TOPIC_TOKEN = re.compile(r"`([^`]+)`|(?<![\w.])((?:[A-Za-z_][\w.]*|[+#](?=/))(?:/(?:[\w.]+|\+|#))*)")
+_STRING_LITERAL = re.compile(r"""("[^"]*"|'[^']*')""")
+
+
+class ExpressionError(ValueError):
+    """Raised for expressions that can't be parsed or use something not allowed"""
+
+
+def compile_expression(expression):
+    """Compile an expression. Returns (code object, ((placeholder, topic pattern), ...))."""
+    refs = {}
+
+    def replace(match):
+        name = match.group(1) or match.group(2)
+        if match.group(1) is None and (name in FUNCTIONS or keyword.iskeyword(name) or name in ('True', 'False')):
+            return name
+        placeholder = refs.get(name)
+        if placeholder is None:
+            placeholder = refs[name] = f"_t{len(refs)}"
+        return placeholder
+
+    # Leave string literals alone (e.g. state == "ON")
+    parts = _STRING_LITERAL.split(expression)
+    source = "".join(part if i % 2 else _TOPIC_TOKEN.sub(replace, part) for i, part in enumerate(parts))
+    try:
+        tree = ast.parse(source.strip(), mode='eval')
+    except SyntaxError as e:
+        raise ExpressionError(f"Invalid expression '{expression}': {e.msg}")
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ExpressionError(f"'{type(node).__name__}' is not allowed in '{expression}'")
+        if isinstance(node, ast.Call) and not (isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS):
+            raise ExpressionError(f"Unknown function in '{expression}'")
+    code = compile(tree, f"<virtual topic: {expression}>", 'eval')
+    return code, tuple((placeholder, name) for name, placeholder in refs.items())
+
+
+def _is_wildcard(pattern):
+    return '+' in pattern.split('/') or '#' in pattern.split('/')
+
+
+def _as_value(value):
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return value.strip()
+    return value
+
+
+class VirtualTopic:
+    __slots__ = ('name', 'expression', 'code', 'refs', 'level')
+
+    def __init__(self, name, expression):
+        self.name = name
+        self.expression = expression
+        self.code, self.refs = compile_expression(expression)
+        self.level = 0
+
+
+class _Graph:
+    """Immutable compiled form of all definitions."""
+
+    def __init__(self, definitions):
+        self.topics = {}
+        self.errors = {}
+        for name, expression in definitions.items():
+            try:
+                self.topics[name] = VirtualTopic(name, expression)
+            except ExpressionError as e:
+                self.errors[name] = str(e)
+        self._assign_levels()
+        # Input pattern -> virtual topics reading it
+        self.exact = {}
+        self.wildcards = {}
+        for vt in self.topics.values():
+            for _, pattern in vt.refs:
+                target = self.wildcards if _is_wildcard(pattern) else self.exact
+                target.setdefault(pattern, []).append(vt)
+        self.inputs = {pattern for pattern in list(self.exact) + list(self.wildcards) if pattern not in self.topics}
+
+    def _assign_levels(self):
+        state = {}
+
+        def visit(vt):
+            if state.get(vt.name) == 'done':
+                return vt.level
+            if state.get(vt.name) == 'visiting':
+                raise ExpressionError(f"Circular reference through '{vt.name}'")
+            state[vt.name] = 'visiting'
+            vt.level = 1 + max((visit(self.topics[p]) for _, p in vt.refs if p in self.topics), default=0)
+            state[vt.name] = 'done'
+            return vt.level
+
+        for vt in list(self.topics.values()):
+            try:
+                visit(vt)
+            except ExpressionError as e:
+                self.errors[vt.name] = str(e)
+        for name in self.errors:
+            self.topics.pop(name, None)
+
+
+class VirtualTopicEngine:
+    def __init__(self, publish):
+        """publish(topic, value) is called on the worker thread for every changed result."""
+        self.publish = publish
+        self._graph = _Graph({})
+        self._queue = queue.Queue()
+        self._thread = None
+        # Worker-thread state
+        self._values = {}       # topic -> latest value (inputs and results)
+        self._dependents = {}   # real topic -> tuple of VirtualTopic (resolution cache)
+        self._members = {}      # wildcard pattern -> {topic: None}
+        self._failed = set()    # virtual topics whose last evaluation raised
+
+    @property
+    def active(self):
+        return bool(self._graph.topics)
+
+    def set_definitions(self, definitions):
+        """Compile definitions and swap them in. Returns {topic: error} for rejected ones."""
+        graph = _Graph(definitions or {})
+        for name, error in graph.errors.items():
+            print(f"[ERROR] Virtual topic {name}: {error}")
+        self._graph = graph
+        if graph.topics and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="virtual-topics", daemon=True)
+            self._thread.start()
+        self._queue.put(('graph', graph))
+        return graph.errors
+
+    def is_virtual(self, topic):
+        return topic in self._graph.topics
+
+    def input_patterns(self):
+        """Broker topics (possibly with wildcards) the definitions read from"""
+        return set(self._graph.inputs)
+
+    def reads_any(self, topic_filters):
+        """True if a definition reads from one of these subscribed topic filters"""
+        inputs = self._graph.inputs
+        return any(topic_filter in inputs for topic_filter in topic_filters)
+
+    def current(self, topic):
+        return self._values.get(topic)
+
+    def push(self, topic, value):
+        """Feed an incoming message; safe to call from any thread."""
+        if self._graph.topics:
+            self._queue.put(('value', topic, value))
+
+    def stop(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    # --- worker thread --------------------------------------------------
+
+    def _run(self):
+        graph = self._graph
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            # Coalesce everything that queued up while we were busy
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            updates = {}
+            for entry in batch:
+                if entry is None:
+                    return
+                if entry[0] == 'graph':
+                    graph = entry[1]
+                    self._dependents = {}
+                    self._members = {}
+                    self._failed = set()
+                    # Replay known inputs through the new graph, so results are recomputed
+                    known = {t: v for t, v in self._values.items() if t not in graph.topics}
+                    known.update(updates)
+                    updates = known
+                    self._values = {}
+                else:
+                    updates[entry[1]] = entry[2]
+            try:
+                self._apply(graph, updates)
+            except Exception as e:
+                print(f"[ERROR] Virtual topic evaluation failed: {e}")
+
+    def _dependents_of(self, graph, topic):
+        deps = self._dependents.get(topic)
+        if deps is None:
+            found = list(graph.exact.get(topic, ()))
+            for pattern, vts in graph.wildcards.items():
+                if topic_matches(pattern, topic):
+                    self._members.setdefault(pattern, {})[topic] = None
+                    found.extend(vts)
+            deps = self._dependents[topic] = tuple(found)
+        return deps
+
+    def _apply(self, graph, updates):
+        pending = {}
+        for topic, value in updates.items():
+            deps = self._dependents_of(graph, topic)
+            if not deps:
+                continue
+            value = _as_value(value)
+            if topic in self._values and self._values[topic] == value:
+                continue
+            self._values[topic] = value
+            for vt in deps:
+                pending[vt.name] = vt
+        heap = [(vt.level, name) for name, vt in pending.items()]
+        heapq.heapify(heap)
+        done = set()
+        while heap:
+            _, name = heapq.heappop(heap)
+            if name in done:
+                continue
+            done.add(name)
+            vt = graph.topics[name]
+            result = self._evaluate(vt)
+            if result is None or self._values.get(name) == result:
+                continue
+            self._values[name] = result
+            self.publish(name, result)
+            for dependent in self._dependents_of(graph, name):
+                heapq.heappush(heap, (dependent.level, dependent.name))
+
+    def _evaluate(self, vt):
+        namespace = {}
+        for placeholder, pattern in vt.refs:
+            members = self._members.get(pattern)
+            if members is not None or _is_wildcard(pattern):
+                namespace[placeholder] = [self._values[t] for t in (members or ()) if self._values.get(t) is not None]
+            else:
+                value = self._values.get(pattern)
+                if value is None:
+                    return None  # not all inputs have arrived yet
+                namespace[placeholder] = value
+        try:
+            result = eval(vt.code, {'__builtins__': {}, **FUNCTIONS}, namespace)
+        except Exception as e:
+            if vt.name not in self._failed:
+                self._failed.add(vt.name)
+                print(f"[ERROR] Virtual topic {vt.name} = {vt.expression}: {e}")
+            return None
+        self._failed.discard(vt.name)
+        return result
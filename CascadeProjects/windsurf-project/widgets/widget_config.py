@@ -0,0 +1,140 @@
+"""
+Typed, normalized view of a widget's config dict for the hot paths.
+
+The config itself stays a plain dict (or a layout style ChainMap, see
+layout_styles.py): it is what the customization dialog edits, themes and
+opacity write into, and the layout file stores, so JSON round-trips as
+before. What formatting and painting read on every message or paint is
+normalized from it once per apply_config() into a frozen, slotted
+dataclass, and read as attributes:
+
+- duplicate spellings are resolved ('bg_color' over 'background_color',
+  'individual_opacity' 0-1 over 'opacity' 0-100) into one rgba background;
+- values are converted to the field's type; a value that doesn't convert
+  is reported once here and replaced by the default, instead of failing
+  (or being re-parsed) on every message;
+- identical configs share one instance, so a page of similar gauges holds
+  one GaugeConfig. Keys that name a single widget (display_name, ...) and
+  the ones only apply_config reads (icons, alarms, aggregates) are not part
+  of it and are read from the dict as before.
+"""
+import weakref
+from dataclasses import dataclass, fields
+
+from PyQt6.QtGui import QColor
+
+# Identical configs -> one shared instance (dropped when no widget uses it)
+_instances = weakref.WeakValueDictionary()
+
+_BOOL_STRINGS = {'true': True, '1': True, 'yes': True, 'on': True,
+                 'false': False, '0': False, 'no': False, 'off': False}
+
+
+def _to_bool(raw):
+    """bool from JSON true/false, a number or a string like "false"; ValueError otherwise"""
+    if isinstance(raw, (bool, int, float)):
+        return bool(raw)
+    if isinstance(raw, str) and raw.strip().lower() in _BOOL_STRINGS:
+        return _BOOL_STRINGS[raw.strip().lower()]
+    raise ValueError(raw)
+
+
+@dataclass(frozen=True, slots=True, weakref_slot=True)
+class WidgetConfig:
+    """Settings every ResizableWidget reads while running."""
+    background: int = 0xFF1E1E1E  # rgba, opacity applied (computed, see _derived)
+    border_color: str = '#666666'
+    border_width: int = 2
+    border_radius: int = 6
+    text_color: str = '#D9D9D9'
+    font_size: int = 12
+    show_text: bool = True
+    json_field: str = ''
+    unit: str = ''
+    convert: bool = True  # False: conversion settings are invalid, values are shown unconverted
+    conversion_factor: float = 1.0
+    conversion_offset: float = 0.0
+    decimal_places: int = 1
+    warning_color: str = '#ffc107'
+    critical_color: str = '#dc3545'
+
+    @classmethod
+    def from_mapping(cls, config):
+        """The (shared) instance for a config dict"""
+        values = {}
+        derived = cls._derived(config)
+        for field in fields(cls):
+            name = field.name
+            if name in derived:
+                values[name] = derived[name]
+                continue
+            raw = config.get(name, field.default)
+            if raw is None or (raw == '' and field.type is not str):
+                values[name] = field.default
+                continue
+            try:
+                values[name] = _to_bool(raw) if field.type is bool else field.type(raw)
+            except (ValueError, TypeError):
+                print(f"[ERROR] Invalid {name} {raw!r} in widget config, using {field.default!r}")
+                values[name] = field.default
+        key = (cls,) + tuple(values.values())
+        instance = _instances.get(key)
+        if instance is None:
+            instance = _instances[key] = cls(**values)
+        return instance
+
+    @classmethod
+    def _derived(cls, config):
+        """Fields computed from more than one key"""
+        # Support both 'bg_color' (from widget customization) and 'background_color' (from themes)
+        background = QColor(config.get('bg_color', config.get('background_color', '#1e1e1e')))
+        # Support both 'opacity' (0-100) and 'individual_opacity' (0.0-1.0)
+        try:
+            opacity = float(config.get('opacity', 100))
+            individual_opacity = config.get('individual_opacity')
+            if individual_opacity is not None:
+                opacity = int(float(individual_opacity) * 100)
+        except (ValueError, TypeError):
+            print("[ERROR] Invalid opacity in widget config, using 100")
+            opacity = 100
+        background.setAlpha(max(0, min(255, int(opacity * 2.55))))
+        derived = {'background': background.rgba()}
+        try:
+            factor = float(config.get('conversion_factor', 1.0))
+            offset = float(config.get('conversion_offset', 0.0))
+            decimal_places = int(config.get('decimal_places', 1))
+            derived.update(convert=True, conversion_factor=factor, conversion_offset=offset, decimal_places=decimal_places)
+        except (ValueError, TypeError):
+            print("[ERROR] Invalid conversion settings in widget config, showing values unconverted")
+            derived.update(convert=False, conversion_factor=1.0, conversion_offset=0.0, decimal_places=1)
+        return derived
+
+
+@dataclass(frozen=True, slots=True)
+class LabelConfig(WidgetConfig):
+    font_size: int = 16
+    icon_position: str = 'left'
+
+
+@dataclass(frozen=True, slots=True)
+class GaugeConfig(WidgetConfig):
+    type: str = 'gauge'
+    kind: str = 'arc'  # 'arc', 'circular' or 'linear' (computed from type)
+    min_value: float = 0.0
+    max_value: float = 100.0
+    accent_color: str = '#0d6efd'
+
+    @classmethod
+    def _derived(cls, config):
+        derived = super(GaugeConfig, cls)._derived(config)
+        gauge_type = config.get('type', 'gauge')
+        derived['kind'] = 'circular' if gauge_type == 'gauge_circular' else 'linear' if gauge_type == 'gauge_linear' else 'arc'
+        return derived
+
+    def fraction(self, value):
+        """value's position between min_value and max_value (0-1), or None without a range"""
+        low, high = self.min_value, self.max_value
+        if high <= low:
+            return None
+        fraction = (value - low) / (high - low)
+        return 0.0 if fraction < 0.0 else 1.0 if fraction > 1.0 else fraction
@@ -5,6 +5,7 @@ from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTabWidget,
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QColor, QPixmap
 from .icon_picker import IconPickerDialog
+from .window_stats import AGGREGATES
 from config.themes import get_theme_list, get_theme_config
 from pathlib import Path
 
@@ -35,7 +36,7 @@ class WidgetCustomizationDialog(QDialog):
 
         self.tabs.addTab(self.general_tab, "General")
         self.tabs.addTab(self.appearance_tab, "Appearance")
-        if self.widget_type in ['gauge', 'label', 'slider', 'toggle', 'button']:
+        if self.widget_type in ['gauge', 'label', 'slider', 'toggle', 'button', 'topic_table']:
              self.tabs.addTab(self.data_tab, "Data & Units")
 
         button_layout = QHBoxLayout()
@@ -169,7 +170,26 @@ class WidgetCustomizationDialog(QDialog):
         self.unit = QLineEdit()
         layout.addRow("Unit:", self.unit)
         self.unit.textChanged.connect(self._emit_config_changed)
+        self.json_field = QLineEdit()
+        self.json_field.setPlaceholderText("e.g. ENERGY.Power (empty = whole payload)")
+        layout.addRow("JSON Field:", self.json_field)
+        self.json_field.textChanged.connect(self._emit_config_changed)
         
+        if self.widget_type in ['label', 'gauge', 'gauge_circular', 'gauge_linear', 'gauge_speedometer', 'gauge_voltage']:
+            # Show a statistic over a sliding window instead of the latest value
+            self.aggregate_combo = QComboBox()
+            self.aggregate_combo.addItem("Latest value", "")
+            labels = {'min': "Minimum", 'max': "Maximum", 'mean': "Mean", 'rate': "Rate of change (/s)"}
+            for aggregate in AGGREGATES:
+                self.aggregate_combo.addItem(labels.get(aggregate, f"{aggregate[1:]}th percentile"), aggregate)
+            self.aggregate_window_combo = QComboBox()
+            for text, seconds in (("1 min", 60), ("5 min", 300), ("15 min", 900), ("1 h", 3600), ("24 h", 86400)):
+                self.aggregate_window_combo.addItem(text, seconds)
+            layout.addRow("Show:", self.aggregate_combo)
+            layout.addRow("Window:", self.aggregate_window_combo)
+            self.aggregate_combo.currentIndexChanged.connect(self._emit_config_changed)
+            self.aggregate_window_combo.currentIndexChanged.connect(self._emit_config_changed)
+
         if self.widget_type in ['gauge', 'gauge_circular', 'gauge_linear', 'gauge_speedometer', 'gauge_voltage']:
             self.min_value_spin = QDoubleSpinBox()
             self.max_value_spin = QDoubleSpinBox()
@@ -271,6 +291,12 @@ class WidgetCustomizationDialog(QDialog):
 
         self.font_size_spin.setValue(self.config.get('font_size', 12))
         if hasattr(self, 'unit'): self.unit.setText(self.config.get('unit', ''))
+        if hasattr(self, 'json_field'): self.json_field.setText(self.config.get('json_field', ''))
+        if hasattr(self, 'aggregate_combo'):
+            index = self.aggregate_combo.findData(self.config.get('aggregate', ''))
+            if index != -1: self.aggregate_combo.setCurrentIndex(index)
+            index = self.aggregate_window_combo.findData(int(self.config.get('aggregate_window', 60)))
+            if index != -1: self.aggregate_window_combo.setCurrentIndex(index)
         if hasattr(self, 'min_value_spin'): self.min_value_spin.setValue(self.config.get('min_value', 0))
         if hasattr(self, 'max_value_spin'): self.max_value_spin.setValue(self.config.get('max_value', 100))
 
@@ -297,6 +323,10 @@ class WidgetCustomizationDialog(QDialog):
         self.config['theme_selector'] = self.theme_selector.currentData()
         self.config['font_size'] = self.font_size_spin.value()
         if hasattr(self, 'unit'): self.config['unit'] = self.unit.text()
+        if hasattr(self, 'json_field'): self.config['json_field'] = self.json_field.text().strip()
+        if hasattr(self, 'aggregate_combo'):
+            self.config['aggregate'] = self.aggregate_combo.currentData()
+            self.config['aggregate_window'] = self.aggregate_window_combo.currentData()
         if hasattr(self, 'min_value_spin'): self.config['min_value'] = self.min_value_spin.value()
         if hasattr(self, 'max_value_spin'): self.config['max_value'] = self.max_value_spin.value()
 
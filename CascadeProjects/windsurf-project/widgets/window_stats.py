@@ -0,0 +1,176 @@
+"""
+Sliding-window statistics over a topic's values, maintained incrementally.
+
+Every statistic is updated as samples enter and leave the window instead of
+being recomputed over it:
+
+    min / max   monotonic deques (each sample is pushed and popped once)
+    mean        running sum and count
+    rate        (newest - oldest) / elapsed, per second, from the sample deque
+    pNN         log-bucketed counts with ~1% relative error (DDSketch style);
+                the number of buckets depends on the value range, not on the
+                window length
+
+so adding a sample costs amortised O(1) whether the window is a minute or a day.
+"""
+import bisect
+import math
+import time
+from collections import deque
+
+AGGREGATES = ['min', 'max', 'mean', 'rate', 'p50', 'p90', 'p95', 'p99']
+
+# Relative accuracy of percentiles
+_GAMMA = 1.02
+_LOG_GAMMA = math.log(_GAMMA)
+_ZERO = 1e-9
+
+
+def _bucket(magnitude):
+    return int(math.ceil(math.log(magnitude) / _LOG_GAMMA))
+
+
+def _bucket_value(index):
+    # Midpoint of (gamma^(i-1), gamma^i]
+    return 2 * _GAMMA ** index / (_GAMMA + 1)
+
+
+class _LogHistogram:
+    """Counts per log bucket, separately for positive and negative values."""
+    __slots__ = ('counts', 'keys')
+
+    def __init__(self):
+        self.counts = {}
+        self.keys = []  # sorted bucket indexes with a non-zero count
+
+    def add(self, index):
+        count = self.counts.get(index, 0)
+        if not count:
+            bisect.insort(self.keys, index)
+        self.counts[index] = count + 1
+
+    def remove(self, index):
+        count = self.counts[index] - 1
+        if count:
+            self.counts[index] = count
+        else:
+            del self.counts[index]
+            del self.keys[bisect.bisect_left(self.keys, index)]
+
+
+class WindowedStats:
+    def __init__(self, window_seconds, clock=time.monotonic):
+        self.window = float(window_seconds)
+        self.clock = clock
+        self.samples = deque()    # (time, value), oldest first
+        self._mins = deque()      # increasing values: front is the window minimum
+        self._maxs = deque()      # decreasing values: front is the window maximum
+        self._sum = 0.0
+        self._positive = _LogHistogram()
+        self._negative = _LogHistogram()
+        self._zeros = 0
+
+    def __len__(self):
+        return len(self.samples)
+
+    def add(self, value, now=None):
+        """Add a sample. Raises ValueError (changing nothing) for values that aren't finite
+        numbers: inf/nan would stay in the sum, min/max and buckets for the whole window."""
+        value = float(value)
+        if not math.isfinite(value):
+            raise ValueError(f"Invalid payload: '{value}' is not a finite number")
+        now = self.clock() if now is None else now
+        if value > _ZERO:
+            histogram, index = self._positive, _bucket(value)
+        elif value < -_ZERO:
+            histogram, index = self._negative, _bucket(-value)
+        else:
+            histogram = index = None
+        self.samples.append((now, value))
+        self._sum += value
+        while self._mins and self._mins[-1][1] > value:
+            self._mins.pop()
+        self._mins.append((now, value))
+        while self._maxs and self._maxs[-1][1] < value:
+            self._maxs.pop()
+        self._maxs.append((now, value))
+        if histogram is None:
+            self._zeros += 1
+        else:
+            histogram.add(index)
+        self.expire(now)
+
+    def expire(self, now=None):
+        """Drop samples older than the window."""
+        now = self.clock() if now is None else now
+        cutoff = now - self.window
+        samples = self.samples
+        while samples and samples[0][0] < cutoff:
+            _, value = samples.popleft()
+            self._sum -= value
+            if value > _ZERO:
+                self._positive.remove(_bucket(value))
+            elif value < -_ZERO:
+                self._negative.remove(_bucket(-value))
+            else:
+                self._zeros -= 1
+        while self._mins and self._mins[0][0] < cutoff:
+            self._mins.popleft()
+        while self._maxs and self._maxs[0][0] < cutoff:
+            self._maxs.popleft()
+        if not samples:
+            self._sum = 0.0  # don't let rounding error accumulate across empty periods
+
+    @property
+    def min(self):
+        return self._mins[0][1] if self._mins else None
+
+    @property
+    def max(self):
+        return self._maxs[0][1] if self._maxs else None
+
+    @property
+    def mean(self):
+        return self._sum / len(self.samples) if self.samples else None
+
+    @property
+    def rate(self):
+        """Change per second between the oldest and newest sample in the window"""
+        if len(self.samples) < 2:
+            return None
+        (t0, v0), (t1, v1) = self.samples[0], self.samples[-1]
+        if t1 <= t0:
+            return None
+        return (v1 - v0) / (t1 - t0)
+
+    def percentile(self, p):
+        count = len(self.samples)
+        if not count:
+            return None
+        rank = p / 100.0 * (count - 1)
+        seen = 0
+        # Most negative first: negative buckets by descending magnitude
+        for index in reversed(self._negative.keys):
+            seen += self._negative.counts[index]
+            if seen > rank:
+                return -_bucket_value(index)
+        seen += self._zeros
+        if seen > rank:
+            return 0.0
+        for index in self._positive.keys:
+            seen += self._positive.counts[index]
+            if seen > rank:
+                return _bucket_value(index)
+        return self.max
+
+    def value(self, aggregate):
+        """The statistic named by aggregate (one of AGGREGATES), or None if not available yet"""
+        if aggregate in ('min', 'max', 'mean', 'rate'):
+            return getattr(self, aggregate)
+        if aggregate and aggregate[0] == 'p':
+            result = self.percentile(float(aggregate[1:]))
+            # Bucket midpoints can fall just outside the observed range
+            if result is not None:
+                result = min(max(result, self.min), self.max)
+            return result
+        raise ValueError(f"Unknown aggregate '{aggregate}'")
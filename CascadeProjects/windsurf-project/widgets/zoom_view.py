@@ -0,0 +1,184 @@
+"""
+Zoom view: the current page as a QGraphicsScene that can be zoomed and
+panned freely, so a layout of any size fits any screen.
+
+Each dashboard widget gets a TileItem that paints from the widget's
+canvas_state() (the same tuples the presentation canvas draws, see
+canvas.py); the widgets themselves stay on the hidden page and keep
+receiving messages. What a frame costs follows what is on screen:
+
+- the scene keeps its items in a BSP tree, so finding the items in the
+  exposed area (for painting) and in the viewport (for the state poll
+  every REFRESH_INTERVAL ms) doesn't walk the whole page;
+- every item has a device coordinate cache, so an item whose state didn't
+  change is blitted from its pixmap instead of repainted;
+- below DETAIL_LOD (the item's on-screen scale) a tile is drawn as a
+  block in its color with the value text, below BLOCK_LOD as the block
+  alone; an item is only invalidated when something it draws at the
+  current scale changed (zoomed far out, value changes cost nothing).
+
+Mouse wheel zooms around the cursor, dragging pans, double-click opens the
+normal view at that widget; 0 fits the page, Escape leaves the zoom view.
+"""
+from PyQt6.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsItem, QStyleOptionGraphicsItem
+from PyQt6.QtGui import QPainter, QColor, QFont
+from PyQt6.QtCore import Qt, QRectF, QTimer, pyqtSignal
+from .canvas import shared_painter
+from diagnostics.metrics import timed_paint
+
+REFRESH_INTERVAL = 100  # ms between state polls of the visible tiles
+DETAIL_LOD = 0.5        # full tile drawing at or above this scale
+BLOCK_LOD = 0.12        # below this, no text at all
+MIN_SCALE, MAX_SCALE = 0.02, 4.0
+ZOOM_STEP = 1.25        # per wheel notch
+
+
+class TileItem(QGraphicsItem):
+    def __init__(self, widget):
+        super().__init__()
+        self.widget = widget
+        self.rect = QRectF()
+        self.state = None
+        self.drawn = None  # the part of the state the current level of detail draws
+        self.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
+        self.sync_geometry()
+        self.refresh(1.0)
+
+    def sync_geometry(self):
+        x, y, width, height = self.widget.geometry().getRect()
+        if self.rect.width() != width or self.rect.height() != height:
+            self.prepareGeometryChange()
+            self.rect = QRectF(0, 0, width, height)
+        if self.pos().x() != x or self.pos().y() != y:
+            self.setPos(x, y)
+
+    def refresh(self, scale):
+        """Repaint if what the tile shows at this scale changed"""
+        state = self.state = self.widget.canvas_state()
+        if scale >= DETAIL_LOD:
+            drawn = state
+        else:
+            # background, kind, color, text color (and the text if it is drawn)
+            drawn = (state[0], state[2], state[6], state[7], state[4] if scale >= BLOCK_LOD else None)
+        if drawn != self.drawn:
+            self.drawn = drawn
+            self.update()
+
+    def boundingRect(self):
+        return self.rect
+
+    def paint(self, painter, option, widget=None):
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        if lod >= DETAIL_LOD:
+            shared_painter().paint(painter, [(self.rect.getRect(), self.state)])
+            return
+        # Far out: a block in the tile's color (the gauge color, or the background for text tiles)
+        background, radius, kind, title, text, fraction, color, text_color, font_size = self.state
+        gap = min(2 / lod, self.rect.width() / 4)  # about two screen pixels between neighbouring blocks
+        block = self.rect.adjusted(gap, gap, -gap, -gap)
+        painter.fillRect(block, shared_painter().color(background if kind == 'text' else color))
+        if lod >= BLOCK_LOD and text:
+            font = QFont()
+            # As large as the block allows (bold digits are about 0.6 em wide)
+            font.setPixelSize(max(1, int(min(block.height() * 0.4, block.width() / (0.65 * len(text))))))
+            font.setBold(True)
+            painter.setFont(font)
+            painter.setPen(shared_painter().color(text_color))
+            painter.drawText(block, Qt.AlignmentFlag.AlignCenter, text)
+
+
+class ZoomView(QGraphicsView):
+    widget_activated = pyqtSignal(object)  # double-clicked tile's widget
+    closed = pyqtSignal()
+
+    def __init__(self, widgets, parent=None):
+        super().__init__(parent)
+        self.widget_type = 'zoom_view'  # metrics kind for timed_paint
+        self.widgets = widgets          # the page's widget list (shared, so additions show up)
+        self.items_by_widget = {}
+        self.setScene(QGraphicsScene(self))
+        self.scene().setItemIndexMethod(QGraphicsScene.ItemIndexMethod.BspTreeIndex)
+        self.setRenderHint(QPainter.RenderHint.Antialiasing)
+        self.setDragMode(QGraphicsView.DragMode.ScrollHandDrag)
+        self.setTransformationAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
+        self.setBackgroundBrush(QColor("#111111"))
+        self.sync_items()
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(REFRESH_INTERVAL)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def sync_items(self):
+        """Add and remove tiles to match the page's widgets"""
+        current = set(self.widgets)
+        for widget in list(self.items_by_widget):
+            if widget not in current:
+                self.scene().removeItem(self.items_by_widget.pop(widget))
+        for widget in self.widgets:
+            if widget and widget not in self.items_by_widget:
+                item = self.items_by_widget[widget] = TileItem(widget)
+                self.scene().addItem(item)
+        # Some room around the page for panning past the edge
+        bounds = self.scene().itemsBoundingRect()
+        margin = max(bounds.width(), bounds.height()) * 0.1 + 50
+        self.scene().setSceneRect(bounds.adjusted(-margin, -margin, margin, margin))
+
+    def refresh(self):
+        """Poll the tiles in the viewport; other tiles catch up when they scroll into view"""
+        if len(self.items_by_widget) != len(self.widgets):
+            self.sync_items()
+        visible = self.mapToScene(self.viewport().rect()).boundingRect()
+        scale = self.transform().m11()
+        for item in self.scene().items(visible, Qt.ItemSelectionMode.IntersectsItemBoundingRect):
+            item.sync_geometry()
+            item.refresh(scale)
+
+    def fit(self):
+        bounds = self.scene().itemsBoundingRect()
+        if bounds.isEmpty():
+            return
+        self.fitInView(bounds.adjusted(-20, -20, 20, 20), Qt.AspectRatioMode.KeepAspectRatio)
+
+    def zoom(self, factor):
+        scale = self.transform().m11()
+        factor = max(MIN_SCALE / scale, min(MAX_SCALE / scale, factor))
+        self.scale(factor, factor)
+
+    def wheelEvent(self, event):
+        steps = event.angleDelta().y() / 120
+        if steps:
+            self.zoom(ZOOM_STEP ** steps)
+        event.accept()
+
+    def keyPressEvent(self, event):
+        key = event.key()
+        if key == Qt.Key.Key_0:
+            self.fit()
+        elif key in (Qt.Key.Key_Plus, Qt.Key.Key_Equal):
+            self.zoom(ZOOM_STEP)
+        elif key == Qt.Key.Key_Minus:
+            self.zoom(1 / ZOOM_STEP)
+        elif key == Qt.Key.Key_Escape:
+            self.closed.emit()
+        else:
+            super().keyPressEvent(event)
+
+    def mouseDoubleClickEvent(self, event):
+        item = self.itemAt(event.position().toPoint())
+        if isinstance(item, TileItem):
+            self.widget_activated.emit(item.widget)
+        else:
+            super().mouseDoubleClickEvent(event)
+
+    @timed_paint
+    def paintEvent(self, event):
+        super().paintEvent(event)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.refresh_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.refresh_timer.stop()